@@ -0,0 +1 @@
+"""Benchmarks for py-model, run them from the repository root, e.g. `python -m benchmarks.bench_jobs`."""
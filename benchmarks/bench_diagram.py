@@ -0,0 +1,58 @@
+"""Time laying out and rendering SVG class diagrams of growing inheritance hierarchies, with and without the cache."""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from py_model.parsing import Attribute, Attributes, Class
+from py_model.parsing.type_hints import Integer, String
+from py_model.writing.graphs.diagram_writer import SvgWriter
+
+
+def generate_hierarchy(classes: int, seed: int = 0) -> list[Class]:
+    """A forest of classes, most of them inherit from a random earlier class and some from a second one as well."""
+    rng = random.Random(seed)
+    hierarchy = []
+    for index in range(classes):
+        bases = []
+        if (index > 0) and (rng.random() < 0.9):
+            bases.append(f"Model{rng.randrange(max(0, index - 50), index)}")
+            if rng.random() < 0.1:
+                bases.append(f"Model{rng.randrange(index)}")
+        attributes = [
+            Attribute(name=f"attribute_{attr}", dtype=String() if attr % 2 else Integer())
+            for attr in range(rng.randrange(6))
+        ]
+        hierarchy.append(
+            Class(
+                name=f"Model{index}",
+                is_dataclass=True,
+                inherits_from=sorted(set(bases)),
+                attributes=Attributes(attributes=attributes),
+            )
+        )
+    return hierarchy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="*", default=[100, 300, 1000, 3000], help="Numbers of classes.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        writer = SvgWriter()
+        writer.cache_directory = os.path.join(directory, "cache")
+
+        for size in args.sizes:
+            hierarchy = generate_hierarchy(size)
+            for name in ["layout", "cached"]:
+                start = time.perf_counter()
+                output = writer.get_string(blocks=hierarchy)
+                elapsed = time.perf_counter() - start
+                print(f"classes={size:<6} {name:<7} time={elapsed:7.3f}s output={len(output) / 1024**2:6.1f}MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Compare generating the output from the IR (--from-ir) with parsing the files, with and without the parse cache."""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.corpus import write_corpus
+from py_model.cache import ParseCache
+from py_model.ir import IrWriter, iter_ir
+from py_model.navigation import get_filepath_set
+from py_model.processing import parse_files
+
+
+def measure(function, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=1000, help="Number of files in the synthetic corpus.")
+    parser.add_argument("--classes", type=int, default=10, help="Number of classes per file.")
+    parser.add_argument("--repeats", type=int, default=3, help="Number of measured runs of every variant.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        model_dir = os.path.join(directory, "models")
+        write_corpus(model_dir, files=args.files, classes_per_file=args.classes)
+        filepaths = get_filepath_set(dirs=[model_dir])
+        cache = ParseCache(directory=os.path.join(directory, "cache"))
+        ir_file = os.path.join(directory, "models.jsonl")
+
+        classes = parse_files(filepaths)
+        IrWriter().write_file(classes, file_path=ir_file)
+        parse_files(filepaths, cache=cache)
+
+        def load_ir():
+            with open(ir_file) as file:
+                for _ in iter_ir(file):
+                    pass
+
+        parse_time = measure(lambda: parse_files(filepaths), repeats=args.repeats)
+        cache_time = measure(lambda: parse_files(filepaths, cache=cache), repeats=args.repeats)
+        ir_time = measure(load_ir, repeats=args.repeats)
+        emit_time = measure(lambda: IrWriter().write_file(classes, file_path=ir_file), repeats=args.repeats)
+
+        print(f"{len(classes)} classes, IR of {os.path.getsize(ir_file) / 1e6:.1f} MB")
+        print(f"      parse files: {parse_time:.3f}s")
+        print(f"parse with cache: {cache_time:.3f}s")
+        print(f"         load IR: {ir_time:.3f}s ({parse_time / ir_time:.1f}x faster than parsing)")
+        print(f"        write IR: {emit_time:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Show how parsing scales with the number of worker processes (`--jobs`)."""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.corpus import write_corpus
+from py_model.processing import parse_files
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=2000, help="Number of files in the synthetic corpus.")
+    parser.add_argument("--classes", type=int, default=10, help="Number of classes per file.")
+    parser.add_argument("--max-jobs", type=int, default=os.cpu_count() or 1, help="Largest number of jobs to time.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        filepaths = write_corpus(directory, files=args.files, classes_per_file=args.classes)
+
+        baseline = None
+        jobs = 1
+        while jobs <= args.max_jobs:
+            start = time.perf_counter()
+            classes = parse_files(filepaths, jobs=jobs)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"jobs={jobs:<3} classes={len(classes):<7} time={elapsed:7.3f}s speedup={baseline / elapsed:5.2f}x")
+            jobs *= 2
+
+
+if __name__ == "__main__":
+    main()
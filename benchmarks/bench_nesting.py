@@ -0,0 +1,44 @@
+"""Compare the single pass class extraction with walking every class definition on deeply nested model files."""
+
+import argparse
+import ast
+import os
+import tempfile
+import time
+
+from benchmarks.corpus import write_corpus
+from py_model.navigation import read_source
+from py_model.parsing import Class
+from py_model.processing import parse_file
+
+
+def parse_file_walk(filepath: str) -> list[Class]:
+    """The former implementation: build every ClassDef found by ast.walk, nested ones are built again."""
+    tree = ast.parse(read_source(filepath), filename=filepath)
+    return [Class.from_ast(node) for node in ast.walk(tree) if isinstance(node, ast.ClassDef)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=50, help="Number of files in the synthetic corpus.")
+    parser.add_argument("--classes", type=int, default=5, help="Number of outermost classes per file.")
+    parser.add_argument("--depths", type=int, nargs="*", default=[0, 2, 5, 10, 20], help="Nesting depths to time.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for depth in args.depths:
+            filepaths = write_corpus(
+                os.path.join(directory, f"depth_{depth}"),
+                files=args.files,
+                classes_per_file=args.classes,
+                nesting=depth,
+            )
+            for name, parse in [("walk", parse_file_walk), ("single pass", parse_file)]:
+                start = time.perf_counter()
+                built = sum(len(parse(filepath)) for filepath in filepaths)
+                elapsed = time.perf_counter() - start
+                print(f"depth={depth:<3} {name:<12} classes={built:<7} time={elapsed:7.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Compare emitting a large model by string concatenation with streaming it through the writers."""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.corpus import write_corpus
+from py_model.processing import parse_files
+from py_model.writing import SupportedTypes
+
+
+def concatenate(class_instances, output_file):
+    """The former implementation: build the whole output as one string."""
+    result = ""
+    for class_instance in class_instances:
+        result += class_instance.get_string(supported_type=SupportedTypes.ts)
+    with open(output_file, "wt") as file:
+        file.write(result)
+
+
+def stream(class_instances, output_file):
+    SupportedTypes.ts.writer.write_file(blocks=class_instances, file_path=output_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--classes", type=int, default=100_000, help="Number of classes to emit.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # parse a small corpus and repeat the classes, emitting does not care about duplicates
+        filepaths = write_corpus(os.path.join(directory, "models"), files=100, classes_per_file=10)
+        parsed = parse_files(filepaths)
+        class_instances = (parsed * (args.classes // len(parsed) + 1))[: args.classes]
+        output_file = os.path.join(directory, "models.ts")
+
+        for name, emit in [("concatenate", concatenate), ("stream", stream)]:
+            start = time.perf_counter()
+            emit(class_instances, output_file)
+            elapsed = time.perf_counter() - start
+
+            # measure memory in a second run, tracing slows down the emission considerably
+            tracemalloc.start()
+            emit(class_instances, output_file)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            size = os.path.getsize(output_file) / 1024**2
+            print(f"{name:<12} time={elapsed:7.3f}s peak={peak / 1024**2:8.1f}MiB output={size:.1f}MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Time parsing with and without reading ahead, on a file system with a simulated latency per read (e.g. NFS)."""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.corpus import write_corpus
+from py_model import navigation
+from py_model.processing import parse_modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=500, help="Number of files in the synthetic corpus.")
+    parser.add_argument("--latency", type=float, default=0.005, help="Simulated seconds per read.")
+    parser.add_argument("--threads", type=int, nargs="*", default=[0, 1, 4, 8, 16], help="Read threads to compare.")
+    parser.add_argument("--read-ahead", type=int, default=64, help="Maximum number of files read ahead.")
+    args = parser.parse_args()
+
+    read_source = navigation.read_source
+
+    def slow_read_source(filepath: str) -> bytes:
+        time.sleep(args.latency)
+        return read_source(filepath)
+
+    navigation.read_source = slow_read_source
+
+    with tempfile.TemporaryDirectory() as directory:
+        filepaths = write_corpus(os.path.join(directory, "models"), files=args.files)
+        print(f"{args.files} files, {args.latency * 1000:.1f}ms latency per read")
+        for threads in args.threads:
+            start = time.perf_counter()
+            parse_modules(filepaths, read_threads=threads, read_ahead=args.read_ahead)
+            print(f"{threads:>3} read threads: {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Compare the latency of a cold command line run with a request to a running `py-model serve`."""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.corpus import write_corpus
+from py_model.client import send_request
+
+
+def measure(command: list[str], repeats: int) -> list[float]:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, capture_output=True)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=1000, help="Number of files in the synthetic corpus.")
+    parser.add_argument("--repeats", type=int, default=5, help="Number of measured runs of every variant.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        model_dir = os.path.join(directory, "models")
+        write_corpus(model_dir, files=args.files)
+        output_file = os.path.join(directory, "models.ts")
+        socket_path = os.path.join(directory, "py_model.sock")
+        cli = [sys.executable, "-m", "py_model", "--dirs", model_dir, "--output", output_file]
+
+        cold = measure([*cli, "--no-cache"], repeats=args.repeats)
+        cached = measure([*cli, "--cache-dir", os.path.join(directory, "cache")], repeats=args.repeats)
+
+        server = subprocess.Popen(
+            [sys.executable, "-m", "py_model", "serve", "--dirs", model_dir, "--socket", socket_path, "--no-cache"]
+        )
+        try:
+            start = time.perf_counter()
+            while not os.path.exists(socket_path):
+                time.sleep(0.001)
+            print(f"server start (parses all files): {time.perf_counter() - start:.3f}s")
+
+            client = measure([*cli, "--connect", socket_path], repeats=args.repeats)
+            round_trips = []
+            for _ in range(args.repeats):
+                start = time.perf_counter()
+                send_request(socket_path, {"output": [output_file]})
+                round_trips.append(time.perf_counter() - start)
+        finally:
+            send_request(socket_path, {"command": "stop"})
+            server.wait()
+
+    for name, times in [
+        ("cold run (--no-cache)", cold),
+        ("run with parse cache", cached),
+        ("client run (--connect)", client),
+        ("round trip (in process)", round_trips),
+    ]:
+        print(f"{name:>24}: median {statistics.median(times):.3f}s, min {min(times):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
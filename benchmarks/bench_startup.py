@@ -0,0 +1,44 @@
+"""Measure the import time of the command line interface, i.e. the time until e.g. --help can answer."""
+
+import argparse
+import subprocess
+import sys
+
+
+def get_import_times(stderr: str) -> dict[str, int]:
+    """Cumulative import times in microseconds per module from the output of `python -X importtime`."""
+    times = {}
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, module = line.split("|")
+            if cumulative.strip().isdigit():
+                times[module.strip()] = int(cumulative)
+    return times
+
+
+def measure(module: str) -> int:
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True
+    )
+    return get_import_times(process.stderr)[module]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh interpreters per module.")
+    parser.add_argument(
+        "--modules",
+        nargs="*",
+        default=["py_model.__main__", "py_model.processing"],
+        help="Modules to import, each in a fresh interpreter.",
+    )
+    args = parser.parse_args()
+
+    for module in args.modules:
+        times = sorted(measure(module) for _ in range(args.runs))
+        # the best run is the least disturbed by other processes
+        print(f"{module:<24} best {times[0] / 1000:6.1f}ms  median {times[len(times) // 2] / 1000:6.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Peak memory of writing TypeScript with and without --stream for growing corpora."""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.corpus import write_corpus
+
+
+def run(arguments: list[str]) -> tuple[float, float]:
+    """Run py-model in a fresh process, returns its wall time in seconds and its peak RSS in MiB."""
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-m", "py_model", *arguments])
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        raise RuntimeError(f"py-model failed with exit code {process.returncode}.")
+    # ru_maxrss is in KiB on Linux
+    return time.perf_counter() - start, usage.ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, nargs="*", default=[500, 2000, 8000], help="Corpus sizes to compare.")
+    parser.add_argument("--classes-per-file", type=int, default=5, help="Classes in every file.")
+    args = parser.parse_args()
+
+    for files in args.files:
+        with tempfile.TemporaryDirectory() as directory:
+            write_corpus(os.path.join(directory, "models"), files=files, classes_per_file=args.classes_per_file)
+            arguments = ["--dirs", os.path.join(directory, "models"), "--no-cache"]
+            output = ["--output", os.path.join(directory, "model.ts")]
+            regular_time, regular_rss = run([*arguments, *output])
+            stream_time, stream_rss = run([*arguments, "--stream", *output])
+            print(
+                f"{files:>6} files: regular {regular_rss:7.1f} MiB {regular_time:6.2f}s, "
+                f"streamed {stream_rss:7.1f} MiB {stream_time:6.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Measure the savings of interning type hints: retained memory and time for parsing and emitting a corpus."""
+
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.corpus import write_corpus
+from py_model.parsing.type_hints import TypeHint, basic_types
+from py_model.processing import parse_files
+from py_model.writing import SupportedTypes
+
+
+class NoRegistry(dict):
+    """Registry that never stores anything, i.e. every type hint is a new instance like before interning."""
+
+    def get(self, key, default=None):
+        return default
+
+    def setdefault(self, key, default=None):
+        return default
+
+
+def run(filepaths: list[str]) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    class_instances = parse_files(filepaths)
+    parse_time = time.perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    type_hints = sum(isinstance(obj, TypeHint) for obj in gc.get_objects())
+
+    start = time.perf_counter()
+    for class_instance in class_instances:
+        class_instance.get_string(supported_type=SupportedTypes.ts)
+    emit_time = time.perf_counter() - start
+
+    return {"parse": parse_time, "emit": emit_time, "retained": retained, "type_hints": type_hints}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=300, help="Number of files in the synthetic corpus.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        filepaths = write_corpus(directory, files=args.files, classes_per_file=10, attributes=20)
+
+        for name, registry in [("plain", NoRegistry()), ("interned", basic_types.REGISTRY)]:
+            basic_types.REGISTRY = registry
+            result = run(filepaths)
+            print(
+                f"{name:<9} type hints={result['type_hints']:<8} retained={result['retained'] / 1024**2:7.1f}MiB "
+                f"parse={result['parse']:6.3f}s emit={result['emit']:6.3f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
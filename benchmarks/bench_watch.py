@@ -0,0 +1,56 @@
+"""Measure the latency of watch mode, i.e. the time from saving a file until the output is written."""
+
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from benchmarks.corpus import generate_class, write_corpus
+from py_model.watch import Watcher
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=1000, help="Number of files in the synthetic corpus.")
+    parser.add_argument("--saves", type=int, default=10, help="Number of saves to measure.")
+    parser.add_argument("--interval", type=float, default=0.05, help="Polling interval of the watcher.")
+    parser.add_argument("--debounce", type=float, default=0.05, help="Debounce time of the watcher.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        model_dir = os.path.join(directory, "models")
+        filepaths = write_corpus(model_dir, files=args.files)
+        output_file = os.path.join(directory, "models.ts")
+
+        watcher = Watcher(dirs=[model_dir], output_files=[output_file], interval=args.interval, debounce=args.debounce)
+        stop_event = threading.Event()
+        thread = threading.Thread(target=watcher.run, args=(stop_event,))
+
+        start = time.perf_counter()
+        thread.start()
+        while not os.path.exists(output_file):
+            time.sleep(0.001)
+        print(f"initial build: {time.perf_counter() - start:.3f}s")
+
+        latencies = []
+        for save in range(args.saves):
+            last_written = os.stat(output_file).st_mtime_ns
+            with open(filepaths[save % len(filepaths)], "a") as file:
+                file.write("\n\n" + generate_class(index=args.files * 1000 + save, attributes=5))
+
+            start = time.perf_counter()
+            while os.stat(output_file).st_mtime_ns == last_written:
+                time.sleep(0.001)
+            latencies.append(time.perf_counter() - start)
+
+        stop_event.set()
+        thread.join()
+
+    print(f"save to output: median {statistics.median(latencies):.3f}s, max {max(latencies):.3f}s")
+    print(f"(includes up to {args.interval}s polling interval and {args.debounce}s debounce)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import os
+
+SIMPLE_ANNOTATIONS = ["int", "str", "float", "bool"]
+GENERIC_ANNOTATIONS = [*SIMPLE_ANNOTATIONS, "list[str]", "dict[str, int]", "tuple[int, str]"]
+ANNOTATIONS = [*GENERIC_ANNOTATIONS, "str | None"]
+
+# every level of annotation complexity above one wraps the annotation into one of these, unions are only added on the
+# outermost level since unions within subscripts are not supported yet
+WRAPPERS = ["list[{}]", "dict[str, {}]", "tuple[int, {}]", "set[{}]"]
+
+
+def generate_annotation(seed: int, complexity: int = 1) -> str:
+    """Annotation of the given complexity: 0 are simple types only, 1 includes generics, every further level wraps it."""
+    if complexity <= 0:
+        return SIMPLE_ANNOTATIONS[seed % len(SIMPLE_ANNOTATIONS)]
+
+    if complexity == 1:
+        return ANNOTATIONS[seed % len(ANNOTATIONS)]
+
+    annotation = GENERIC_ANNOTATIONS[seed % len(GENERIC_ANNOTATIONS)]
+    for level in range(complexity - 1):
+        annotation = WRAPPERS[(seed + level) % len(WRAPPERS)].format(annotation)
+    return f"{annotation} | None" if seed % 2 else annotation
+
+
+def generate_class(
+    index: int, attributes: int, nesting: int = 0, indent: str = "", is_dataclass: bool = True, complexity: int = 1
+) -> str:
+    """Source code of a single class with the given number of annotated attributes and one method.
+
+    Dataclasses annotate their attributes in the class body, regular classes in their constructor. With nesting > 0
+    the class contains a nested class, which again contains a nested class and so on.
+    """
+    annotations = [generate_annotation(seed=index + attr, complexity=complexity) for attr in range(attributes)]
+    if is_dataclass:
+        lines = [f"{indent}@dataclass", f"{indent}class Model{index}:"]
+        for attr, annotation in enumerate(annotations):
+            lines.append(f"{indent}    attribute_{attr}: {annotation}")
+    else:
+        parameters = "".join(f", attribute_{attr}: {annotation}" for attr, annotation in enumerate(annotations))
+        lines = [f"{indent}class Model{index}:", f"{indent}    def __init__(self{parameters}):"]
+        for attr, annotation in enumerate(annotations):
+            lines.append(f"{indent}        self.attribute_{attr}: {annotation} = attribute_{attr}")
+        if not annotations:
+            lines.append(f"{indent}        pass")
+    lines.append("")
+    lines.append(f"{indent}    def method_{index}(self, value: int, names: list[str]) -> dict[str, int]:")
+    lines.append(f"{indent}        return {{name: value for name in names}}")
+    if nesting > 0:
+        lines.append("")
+        lines.append(
+            generate_class(
+                index=index,
+                attributes=attributes,
+                nesting=nesting - 1,
+                indent=indent + "    ",
+                is_dataclass=is_dataclass,
+                complexity=complexity,
+            )
+        )
+    return "\n".join(lines) + "\n"
+
+
+def write_corpus(
+    directory: str,
+    files: int = 100,
+    classes_per_file: int = 10,
+    attributes: int = 10,
+    nesting: int = 0,
+    dataclass_ratio: float = 1.0,
+    complexity: int = 1,
+) -> list[str]:
+    """Write a synthetic corpus of model files into directory and return the file paths.
+
+    The classes are spread evenly: with a dataclass_ratio of 0.25 every fourth class is a dataclass.
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    filepaths = []
+    for file_index in range(files):
+        classes = []
+        for class_index in range(classes_per_file):
+            index = file_index * classes_per_file + class_index
+            classes.append(
+                generate_class(
+                    index=index,
+                    attributes=attributes,
+                    nesting=nesting,
+                    is_dataclass=int((index + 1) * dataclass_ratio) > int(index * dataclass_ratio),
+                    complexity=complexity,
+                )
+            )
+        filepath = os.path.join(directory, f"models_{file_index}.py")
+        with open(filepath, "w") as file:
+            file.write("from dataclasses import dataclass\n\n\n" + "\n\n".join(classes))
+        filepaths.append(filepath)
+
+    return filepaths
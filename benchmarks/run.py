@@ -0,0 +1,150 @@
+"""Time every phase of py-model on a synthetic corpus and store the results as JSON to compare them across commits.
+
+The phases are timed separately: discovery (finding the files), parsing (reading and parsing the files into ASTs),
+building (creating the models from the class definitions) and emission (rendering the models per output format).
+"""
+
+import argparse
+import copy
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+from benchmarks.corpus import write_corpus
+from py_model.navigation import get_class_definitions, get_filepath_set, read_source
+from py_model.parsing import Class
+from py_model.writing import SupportedTypes
+
+DEFAULT_OUTPUT = "benchmark.json"
+
+
+def get_commit() -> str | None:
+    """Commit of the working directory, None outside of a git repository."""
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def time_phase(phase: Callable, repeat: int, setup: Callable | None = None):
+    """Best time of repeat runs of phase and the result of the last one.
+
+    If given, setup is called untimed before every run and its result is passed to phase.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        arguments = () if setup is None else (setup(),)
+        start = time.perf_counter()
+        result = phase(*arguments)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def build(definitions: list[tuple[str, object]]) -> list[Class]:
+    classes = []
+    for qualname, class_def in definitions:
+        class_instance = Class.from_ast(class_def, qualname=qualname)
+        classes.append(class_instance)
+        classes.extend(class_instance.iter_classes())
+    return classes
+
+
+def run(directory: str, repeat: int) -> dict:
+    timings = {}
+
+    timings["discovery"], filepaths = time_phase(lambda: sorted(get_filepath_set(dirs=[directory])), repeat=repeat)
+    timings["parsing"], definitions = time_phase(
+        lambda: [
+            definition
+            for filepath in filepaths
+            for definition in get_class_definitions(filepath, source=read_source(filepath))
+        ],
+        repeat=repeat,
+    )
+    # building changes the definitions (e.g. Class.get_attributes removes __init__), hence every run gets a copy
+    timings["building"], classes = time_phase(build, repeat=repeat, setup=lambda: copy.deepcopy(definitions))
+    for supported_type in SupportedTypes:
+        writer = supported_type.writer
+        if writer.binary:
+            # binary outputs (e.g. png) can only be written to a file and may need an external program
+            try:
+                writer.check()
+            except RuntimeError as error:
+                print(f"skipping emission_{supported_type.name}: {error}")
+                continue
+            file_path = os.path.join(directory, f"benchmark.{supported_type.name}")
+            timings[f"emission_{supported_type.name}"], _ = time_phase(
+                lambda: writer.write_file(classes, file_path=file_path), repeat=repeat
+            )
+        else:
+            timings[f"emission_{supported_type.name}"], _ = time_phase(
+                lambda: writer.get_string(blocks=classes), repeat=repeat
+            )
+
+    return {"phases": timings, "files": len(filepaths), "classes": len(classes)}
+
+
+def compare(results: dict, baseline_file: str) -> None:
+    with open(baseline_file) as file:
+        baseline = json.load(file)
+
+    print(f"compared to {baseline.get('commit') or baseline_file}:")
+    if baseline.get("corpus") != results["corpus"]:
+        print("warning: the corpus differs from the one of the baseline")
+    for phase, elapsed in results["phases"].items():
+        before = baseline["phases"].get(phase)
+        if before:
+            print(f"{phase:<16} {before:8.3f}s -> {elapsed:8.3f}s ({(elapsed - before) / before:+7.1%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=500, help="Number of files in the synthetic corpus.")
+    parser.add_argument("--classes", type=int, default=10, help="Number of outermost classes per file.")
+    parser.add_argument("--attributes", type=int, default=10, help="Number of attributes per class.")
+    parser.add_argument("--nesting", type=int, default=0, help="Depth of nested classes within every class.")
+    parser.add_argument("--dataclass-ratio", type=float, default=0.5, help="Share of dataclasses among the classes.")
+    parser.add_argument("--complexity", type=int, default=1, help="Nesting depth of the annotations.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs per phase, the best one is reported.")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSON file to write the results to.")
+    parser.add_argument("--compare", help="JSON file of an earlier run to compare the results with.")
+    args = parser.parse_args()
+
+    corpus = {
+        "files": args.files,
+        "classes_per_file": args.classes,
+        "attributes": args.attributes,
+        "nesting": args.nesting,
+        "dataclass_ratio": args.dataclass_ratio,
+        "complexity": args.complexity,
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        write_corpus(os.path.join(directory, "models"), **corpus)
+        results = run(os.path.join(directory, "models"), repeat=args.repeat)
+
+    results = {
+        "commit": get_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "corpus": corpus,
+        **results,
+    }
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+
+    for phase, elapsed in results["phases"].items():
+        print(f"{phase:<16} {elapsed:8.3f}s")
+    print(f"files={results['files']} classes={results['classes']}, results written to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,15 @@
 import os
+import sys
 
 from py_model.logging import get_logger
-from py_model.navigation import get_classes, get_filepath_set
-from py_model.parser import parser
-from py_model.parsing import Class
-from py_model.writing import SupportedTypes
+from py_model.parser import parser, serve_parser
 
 
-def main():
-    args = parser.parse_args()
+def main(argv: list[str] | None = None):
+    if argv is None:
+        argv = sys.argv[1:]
+    serving = argv[:1] == ["serve"]
+    args = serve_parser.parse_args(argv[1:]) if serving else parser.parse_args(argv)
     # convert args to a dictionary
     args_dict = vars(args)
 
@@ -18,43 +19,249 @@ def main():
     else:
         logger = get_logger(__name__, level="WARNING")
 
+    if args_dict.get("connect"):
+        # the server holds the parsed model already, the client only needs the standard library
+        from py_model.client import CLIENT_OPTIONS, REQUEST_OPTIONS, ServerUnavailableError, send_request
+
+        # the server answers with the model and settings it was started with, other options would be ignored
+        unsupported = [
+            f"--{name.replace('_', '-')}"
+            for name, value in args_dict.items()
+            if (name not in REQUEST_OPTIONS + CLIENT_OPTIONS) and (value != parser.get_default(name))
+        ]
+        if unsupported:
+            parser.error(f"{', '.join(unsupported)} not supported with --connect.")
+
+        request = {
+            "command": "generate",
+            "output": [os.path.abspath(output_file) for output_file in args_dict["output"]],
+            "parallel_output": args_dict["parallel_output"],
+            "dirs": None if args_dict["dirs"] is None else [os.path.abspath(path) for path in args_dict["dirs"]],
+            "files": None if args_dict["files"] is None else [os.path.abspath(path) for path in args_dict["files"]],
+        }
+        try:
+            response = send_request(args_dict["connect"], request)
+        except ServerUnavailableError as error:
+            logger.info(f"{error} Generating the output without the server.")
+        else:
+            logger.info(f"Server answered in {response['seconds']:.3f}s.")
+            if "text" in response:
+                sys.stdout.write(response["text"])
+            return
+
+    # import the parsing and writing modules only now, such that e.g. --help returns right away
+    from py_model.cache import ParseCache
+    from py_model.diagnostics import Diagnostics
+    from py_model.discovery import FileDiscovery
+    from py_model.navigation import get_filepath_set
+    from py_model.processing import (
+        iter_modules,
+        parse_modules,
+        prepare_output_files,
+        prepare_split_output,
+        prepare_stream_outputs,
+        stream_outputs,
+        write_outputs,
+        write_split_output,
+    )
+    from py_model.profiling import Profiler, profile_phase
+    from py_model.symbols import SymbolTable
+
+    cache = ParseCache(directory=args_dict["cache_dir"])
+    if args_dict.get("clear_cache"):
+        cache.clear()
+        if (args_dict.get("dirs") is None) and (args_dict.get("files") is None):
+            # only clearing the cache was requested
+            return
+    if args_dict["no_cache"]:
+        cache = None
+
+    discovery = FileDiscovery(
+        include=args_dict["include"],
+        exclude=args_dict["exclude"],
+        use_ignore_files=not args_dict["no_ignore"],
+        # files without classes can still be part of the import graph, e.g. packages re-exporting classes
+        prefilter=args_dict["prefilter"] and not args_dict.get("entry"),
+    )
+
+    if serving:
+        from py_model.serve import Server
+
+        server = Server(
+            socket_path=args_dict["socket"],
+            dirs=args_dict.get("dirs"),
+            files=args_dict.get("files"),
+            cache=cache,
+            discovery=discovery,
+            idle_timeout=args_dict["idle_timeout"],
+            jobs=args_dict["jobs"],
+        )
+        server.run()
+        return
+
+    # obtain desired output types, no output files print to stdout
+    output_files = args_dict["output"]
+    prepare_output_files(output_files, cache_directory=None if cache is None else cache.directory)
+    split_type = prepare_split_output(args_dict["split_type"]) if args_dict["split_output"] else None
+    if args_dict["from_ir"]:
+        # the classes are read from the IR instead of parsing the files
+        incompatible = ["split_output", "emit_ir", "watch", "root", "entry", "since"]
+        if any(args_dict[name] for name in incompatible):
+            raise ValueError(
+                "--from-ir can not be combined with --split-output, --emit-ir, --watch, --root, --entry or --since."
+            )
+    if args_dict["watch"]:
+        # watch mode writes the model of all watched files to the output files
+        incompatible = ["split_output", "emit_ir", "root", "entry", "since"]
+        if any(args_dict[name] for name in incompatible):
+            raise ValueError("--watch can not be combined with --split-output, --emit-ir, --root, --entry or --since.")
+    if args_dict["root"] and args_dict["since"]:
+        raise ValueError("--root can not be combined with --since.")
+    if args_dict["stream"]:
+        incompatible = ["split_output", "root", "since", "from_ir", "watch"]
+        if any(args_dict[name] for name in incompatible):
+            raise ValueError("--stream can not be combined with --split-output, --root, --since, --from-ir or --watch.")
+        prepare_stream_outputs(output_files)
+
+    profiler = None
+    if args_dict["profile"]:
+        if args_dict["watch"]:
+            logger.warning("Profiling is not supported in watch mode.")
+        else:
+            profiler = Profiler(stats_file=args_dict["profile_stats"], slowest_files=args_dict["profile_top"])
+            profiler.start()
+
+    if args_dict["watch"]:
+        from py_model.watch import Watcher
+
+        watcher = Watcher(
+            dirs=args_dict.get("dirs"),
+            files=args_dict.get("files"),
+            output_files=output_files,
+            cache=cache,
+            discovery=discovery,
+            interval=args_dict["watch_interval"],
+            debounce=args_dict["debounce"],
+            parallel_output=args_dict["parallel_output"],
+            max_warnings=args_dict["max_warnings"],
+            jobs=args_dict["jobs"],
+        )
+        watcher.run()
+        return
+
+    if args_dict["from_ir"]:
+        from py_model.ir import iter_ir
+        from py_model.writing import SupportedTypes
+
+        # the classes were parsed before, a single output is streamed from the IR without holding all classes
+        with open(args_dict["from_ir"]) as file, profile_phase(profiler, "emission"):
+            imports: dict = {}
+            class_instances = iter_ir(file, imports=imports)
+            symbols = None
+            streamed = all(SupportedTypes.from_path(output_file).writer.supports_stream for output_file in output_files)
+            if (len(output_files) > 1) or not streamed:
+                # e.g. diagrams need all classes at once, their references are resolved through the imports of the IR
+                class_instances = list(class_instances)
+                symbols = SymbolTable.from_classes(class_instances, imports=imports)
+            write_outputs(
+                class_instances, output_files=output_files, parallel=args_dict["parallel_output"], symbols=symbols
+            )
+
+        if profiler is not None:
+            profiler.stop()
+            profiler.write_report(args_dict["profile"])
+        return
+
     # get the file paths
-    filepaths = get_filepath_set(dirs=args_dict.get("dirs"), files=args_dict.get("files"))
+    with profile_phase(profiler, "discovery"):
+        filepaths = get_filepath_set(dirs=args_dict.get("dirs"), files=args_dict.get("files"), discovery=discovery)
+        if args_dict["entry"]:
+            from py_model.import_graph import find_reachable_files
 
-    class_instances: list[Class] = list()
+            reachable = find_reachable_files(args_dict["entry"], filepaths=filepaths, roots=args_dict.get("dirs") or [])
+            discovery.stats.unreachable_files = len(filepaths) - len(reachable)
+            filepaths = reachable
+    logger.info(str(discovery.stats))
 
-    for filepath in sorted(filepaths):
-        classes = get_classes(filepath)
+    if args_dict["stream"]:
+        # every file is parsed, written and dropped before the next one, hence the memory does not grow with the files
+        if args_dict["jobs"] != 1:
+            logger.info("Streaming parses in a single process, --jobs is ignored.")
+        diagnostics = Diagnostics()
 
-        # create class instances
-        for cls in classes:
-            class_instance = Class.from_ast(cls)
-            class_instances.append(class_instance)
+        def iter_streamed_classes():
+            for module in iter_modules(
+                filepaths, cache=cache, read_threads=args_dict["read_threads"], read_ahead=args_dict["read_ahead"]
+            ):
+                diagnostics.extend(module.diagnostics)
+                yield from module.classes
 
-    # create the result string
-    result = ""
-    # obtain desired output type
-    output_file = args_dict.get("output")
+        with profile_phase(profiler, "streaming"):
+            count = stream_outputs(iter_streamed_classes(), output_files=output_files, ir_file=args_dict["emit_ir"])
+        logger.info(f"Streamed {count} classes of {len(filepaths)} files.")
 
-    if (output_file is None) or (output_file == parser.get_default("output")):
-        # print to stdout
-        for class_instance in class_instances:
-            result += str(class_instances)
+        diagnostics.report(max_warnings=args_dict["max_warnings"])
+        if args_dict["warnings_json"]:
+            diagnostics.write_json(args_dict["warnings_json"])
+        if profiler is not None:
+            profiler.stop()
+            profiler.write_report(args_dict["profile"])
+        return
 
-        print(result)
-    else:
-        _, ext = os.path.splitext(output_file)
-        if ext == ".dot":
-            supported_dtype = SupportedTypes.dot
-        elif ext == ".ts":
-            supported_dtype = SupportedTypes.ts
-
-        for class_instance in class_instances:
-            result += class_instance.get_string(supported_type=supported_dtype)
-
-        # write file
-        with open(output_file, "wt") as f:
-            f.write(result)
+    # parse the files and create the class instances, the order follows the sorted file paths
+    with profile_phase(profiler, "parsing"):
+        if args_dict["root"]:
+            from py_model.reachability import ReachableModels
+
+            reachable = ReachableModels(filepaths, jobs=args_dict["jobs"], cache=cache)
+            modules = reachable.select(roots=args_dict["root"])
+        elif args_dict["since"]:
+            from py_model.snapshot import parse_modules_since
+
+            snapshot_dir = args_dict["snapshot_dir"] or args_dict["cache_dir"]
+            modules = parse_modules_since(
+                filepaths, ref=args_dict["since"], snapshot_dir=snapshot_dir, jobs=args_dict["jobs"], cache=cache
+            )
+        else:
+            modules = parse_modules(
+                filepaths,
+                jobs=args_dict["jobs"],
+                cache=cache,
+                profiler=profiler,
+                read_threads=args_dict["read_threads"],
+                read_ahead=args_dict["read_ahead"],
+            )
+        class_instances = [cls for module in modules for cls in module.classes]
+
+    # link base classes and type hints to the parsed classes
+    with profile_phase(profiler, "resolving"):
+        symbols = SymbolTable(modules)
+        symbols.resolve_all()
+    symbols.report_unresolved()
+
+    # one summary of the warnings of all files, including cached ones
+    diagnostics = Diagnostics()
+    for module in modules:
+        diagnostics.extend(module.diagnostics)
+    diagnostics.report(max_warnings=args_dict["max_warnings"])
+    if args_dict["warnings_json"]:
+        diagnostics.write_json(args_dict["warnings_json"])
+
+    with profile_phase(profiler, "emission"):
+        if args_dict["emit_ir"]:
+            from py_model.ir import IrWriter
+
+            IrWriter().write_file(class_instances, file_path=args_dict["emit_ir"], symbols=symbols)
+        if output_files or ((split_type is None) and not args_dict["emit_ir"]):
+            write_outputs(
+                class_instances, output_files=output_files, parallel=args_dict["parallel_output"], symbols=symbols
+            )
+        if split_type is not None:
+            write_split_output(modules, symbols=symbols, directory=args_dict["split_output"], supported_type=split_type)
+
+    if profiler is not None:
+        profiler.stop()
+        profiler.write_report(args_dict["profile"])
 
 
 if __name__ == "__main__":
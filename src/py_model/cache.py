@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import re
+from typing import TYPE_CHECKING
+
+from py_model.defaults import DEFAULT_CACHE_DIR
+
+if TYPE_CHECKING:
+    from py_model.parsing import Module
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024  # bytes
+
+# bump whenever the pickled models change in a way older entries can not be loaded anymore, or the same source is
+# parsed into different models
+CACHE_FORMAT_VERSION = 6
+CACHE_SUFFIX = ".pickle"
+# entries written by put (keys are sha256 digests), including temporary files left behind by interrupted runs
+ENTRY_PATTERN = re.compile(r"[0-9a-f]{64}" + re.escape(CACHE_SUFFIX) + r"(\.\d+\.tmp)?")
+
+
+def get_version() -> str:
+    """Version of the installed py-model package, part of every cache key."""
+    # importlib.metadata is slow to import, only import it when the cache is used
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("py-model")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+class ParseCache:
+    """On-disk cache of the parsed module of a file.
+
+    Every entry is keyed by the path, the content hash of the file and the py-model version, hence changing any of
+    them results in a cache miss. The modification time of an entry is updated on every hit, which is used to evict
+    the least recently used entries once the cache grows beyond max_size.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+        # hash the constant part of the keys only once
+        self._salt = f"{get_version()}:{CACHE_FORMAT_VERSION}".encode()
+
+    def get_key(self, filepath: str, source: bytes) -> str:
+        digest = hashlib.sha256(self._salt)
+        digest.update(os.path.abspath(filepath).encode())
+        digest.update(b"\0")
+        digest.update(source)
+        return digest.hexdigest()
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    def get(self, key: str) -> Module | None:
+        path = self._get_path(key)
+        try:
+            with open(path, "rb") as file:
+                module = pickle.load(file)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception:  # pylint: disable=broad-exception-caught
+            # corrupt or incompatible entry, treat it as a miss and drop it
+            logger.info(f"Removing unreadable cache entry {path}.")
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        # mark entry as recently used
+        os.utime(path)
+        self.hits += 1
+        return module
+
+    def put(self, key: str, module: Module) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._get_path(key)
+
+        # write to a temporary file first so concurrent runs never read half written entries
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            pickle.dump(module, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the cache fits into max_size."""
+        try:
+            entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith(CACHE_SUFFIX)]
+        except FileNotFoundError:
+            return
+
+        stats = [(entry.stat(), entry.path) for entry in entries]
+        total_size = sum(stat.st_size for stat, _ in stats)
+        if total_size <= self.max_size:
+            return
+
+        # oldest first
+        stats.sort(key=lambda item: item[0].st_mtime)
+        for stat, path in stats:
+            if total_size <= self.max_size:
+                break
+            self._remove(path)
+            total_size -= stat.st_size
+        logger.info(f"Evicted cache entries, cache size is now {total_size} bytes.")
+
+    def clear(self) -> None:
+        """Remove all entries, the directory and other files in it (e.g. snapshots or layouts) are kept."""
+        try:
+            entries = [entry for entry in os.scandir(self.directory) if ENTRY_PATTERN.fullmatch(entry.name)]
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            self._remove(entry.path)
+        logger.info(f"Cleared {len(entries)} entries of cache {self.directory}.")
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
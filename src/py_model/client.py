@@ -0,0 +1,46 @@
+"""Client of `py-model serve`, it only imports the standard library such that a request returns right away."""
+
+import json
+import socket
+
+# seconds to wait for the answer of the server, generating the output of a large code base may take a while
+RESPONSE_TIMEOUT = 300.0
+# options of the command line a request is made of, the server can not apply any other option
+REQUEST_OPTIONS = ("output", "parallel_output", "dirs", "files")
+# options that only concern the client itself
+CLIENT_OPTIONS = ("connect", "verbose")
+
+
+class ServerUnavailableError(ConnectionError):
+    """No server listens on the socket."""
+
+
+class ServerError(RuntimeError):
+    """The server could not process the request."""
+
+
+def send_request(socket_path: str, request: dict, timeout: float = RESPONSE_TIMEOUT) -> dict:
+    """Send a request to the server listening on socket_path and return its response.
+
+    Requests and responses are single lines of JSON, the server closes the connection after the response.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise ServerUnavailableError("Unix sockets are not supported on this platform.")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.settimeout(timeout)
+        try:
+            connection.connect(socket_path)
+        except (FileNotFoundError, ConnectionRefusedError) as error:
+            raise ServerUnavailableError(f"No server listens on {socket_path}.") from error
+
+        connection.sendall(json.dumps(request).encode() + b"\n")
+        with connection.makefile("rb") as stream:
+            line = stream.readline()
+
+    if not line:
+        raise ServerError("The server closed the connection without a response.")
+    response = json.loads(line)
+    if not response.get("ok"):
+        raise ServerError(response.get("error", "Unknown error."))
+    return response
@@ -0,0 +1,10 @@
+"""Defaults of the command line options, this module must not import anything such that --help stays fast."""
+
+DEFAULT_CACHE_DIR = ".py_model_cache"
+DEFAULT_MAX_WARNINGS = 20
+DEFAULT_PROFILE_FILE = "py_model_profile.json"
+DEFAULT_SLOWEST_FILES = 10
+DEFAULT_READ_THREADS = 4
+DEFAULT_READ_AHEAD = 64
+DEFAULT_SOCKET = ".py_model.sock"
+DEFAULT_IDLE_TIMEOUT = 600.0
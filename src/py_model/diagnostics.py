@@ -0,0 +1,127 @@
+import ast
+import json
+import logging
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from py_model.defaults import DEFAULT_MAX_WARNINGS
+
+logger = logging.getLogger(__name__)
+
+# categories of the diagnostics
+CUSTOM_CLASS = "custom-class"
+MISSING_INIT = "missing-init"
+
+
+class Diagnostic:
+    """A single warning, the message is only formatted (message % args) when it is shown."""
+
+    __slots__ = ("category", "message", "args", "filepath", "line")
+
+    def __init__(
+        self, category: str, message: str, args: tuple = (), filepath: str | None = None, line: int | None = None
+    ) -> None:
+        self.category = category
+        self.message = message
+        self.args = args
+        self.filepath = filepath
+        self.line = line
+
+    @property
+    def key(self) -> tuple:
+        """Diagnostics with the same key are duplicates, even if they were reported at different locations."""
+        return self.category, self.message, self.args
+
+    def format(self) -> str:
+        return self.message % self.args if self.args else self.message
+
+    @property
+    def location(self) -> str:
+        if self.line is None:
+            return self.filepath or "<unknown>"
+        return f"{self.filepath or '<unknown>'}:{self.line}"
+
+
+class Diagnostics:
+    """Collects the diagnostics of a run and reports them once as a summary with counts of duplicates."""
+
+    def __init__(self, filepath: str | None = None) -> None:
+        self.filepath = filepath  # location of diagnostics reported without a file
+        self.records: list[Diagnostic] = []
+
+    def add(self, category: str, message: str, *args, node: ast.AST | None = None) -> None:
+        line = getattr(node, "lineno", None)
+        self.records.append(
+            Diagnostic(category=category, message=message, args=args, filepath=self.filepath, line=line)
+        )
+
+    def extend(self, records: Iterable[Diagnostic]) -> None:
+        self.records.extend(records)
+
+    def group(self) -> list[tuple[Diagnostic, list[Diagnostic]]]:
+        """Group the duplicates, the most frequent diagnostics first."""
+        groups: dict[tuple, list[Diagnostic]] = {}
+        for record in self.records:
+            groups.setdefault(record.key, []).append(record)
+        return sorted(((records[0], records) for records in groups.values()), key=lambda group: -len(group[1]))
+
+    def get_counts(self) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for record in self.records:
+            counts[record.category] = counts.get(record.category, 0) + 1
+        return counts
+
+    def report(self, max_warnings: int = DEFAULT_MAX_WARNINGS) -> None:
+        """Log a summary: the max_warnings most frequent distinct warnings and the total per category."""
+        if not self.records:
+            return
+
+        groups = self.group()
+        for first, records in groups[:max_warnings]:
+            count = f" ({len(records)}x)" if len(records) > 1 else ""
+            logger.warning(f"{first.format()}{count} [{first.category}] first at {first.location}")
+        if len(groups) > max_warnings:
+            logger.warning(f"... and {len(groups) - max_warnings} more distinct warnings.")
+
+        counts = ", ".join(f"{category}: {count}" for category, count in sorted(self.get_counts().items()))
+        logger.warning(f"{len(self.records)} warnings ({counts}).")
+
+    def to_json(self) -> list[dict]:
+        return [
+            {
+                "category": first.category,
+                "message": first.format(),
+                "count": len(records),
+                "locations": [record.location for record in records],
+            }
+            for first, records in self.group()
+        ]
+
+    def write_json(self, filepath: str) -> None:
+        with open(filepath, "w") as file:
+            json.dump(self.to_json(), file, indent=2)
+
+
+# collector of the file that is currently parsed
+_active: ContextVar[Diagnostics | None] = ContextVar("diagnostics", default=None)
+
+
+@contextmanager
+def collect(filepath: str | None = None) -> Iterator[Diagnostics]:
+    """Collect the diagnostics reported within the context instead of logging them."""
+    diagnostics = Diagnostics(filepath=filepath)
+    token = _active.set(diagnostics)
+    try:
+        yield diagnostics
+    finally:
+        _active.reset(token)
+
+
+def report(category: str, message: str, *args, node: ast.AST | None = None) -> None:
+    """Report a diagnostic to the active collector, outside of collect it is logged right away."""
+    diagnostics = _active.get()
+    if diagnostics is None:
+        logger.warning(message, *args)
+    else:
+        diagnostics.add(category, message, *args, node=node)
@@ -0,0 +1,253 @@
+import fnmatch
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+# directories that never contain model files, hidden directories (e.g. .git, .venv) are skipped as well
+DEFAULT_EXCLUDED_DIRS = frozenset(["__pycache__", "node_modules", "venv", "site-packages", "build", "dist"])
+IGNORE_FILE = ".gitignore"
+
+# cheap check on the raw bytes, a file without it can not define a class
+CLASS_KEYWORD = b"class"
+
+
+@dataclass
+class DiscoveryStats:
+    directories: int = 0
+    pruned_directories: int = 0
+    files: int = 0
+    ignored_files: int = 0
+    excluded_files: int = 0
+    prefiltered_files: int = 0
+    unreachable_files: int = 0  # not imported by the entry modules, see find_reachable_files
+
+    def __str__(self) -> str:
+        text = (
+            f"Discovered {self.files} files in {self.directories} directories "
+            f"(pruned directories: {self.pruned_directories}, ignored files: {self.ignored_files}, "
+            f"excluded files: {self.excluded_files}, files without classes: {self.prefiltered_files})."
+        )
+        if self.unreachable_files:
+            text += (
+                f" Skipped {self.unreachable_files} of {self.files} files not imported by the entry modules, "
+                f"parsing {self.files - self.unreachable_files}."
+            )
+        return text
+
+
+@dataclass
+class IgnoreRule:
+    """A single line of a .gitignore file."""
+
+    base: str  # directory of the ignore file, the pattern is relative to it
+    regex: re.Pattern
+    negated: bool
+    directory_only: bool
+    anchored: bool
+
+    @classmethod
+    def from_line(cls, line: str, base: str) -> "IgnoreRule | None":
+        line = line.rstrip("\n").rstrip()
+        if (not line) or line.startswith("#"):
+            return None
+
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+
+        directory_only = line.endswith("/")
+        line = line.rstrip("/")
+
+        # patterns with a slash (other than a trailing one) are relative to the ignore file, others match any name
+        anchored = "/" in line
+        line = line.lstrip("/")
+
+        return cls(
+            base=base,
+            regex=translate_pattern(line),
+            negated=negated,
+            directory_only=directory_only,
+            anchored=anchored,
+        )
+
+    def matches(self, abs_path: str, name: str, is_dir: bool) -> bool:
+        if self.directory_only and not is_dir:
+            return False
+        if self.anchored:
+            if not abs_path.startswith(self.base + os.sep):
+                return False
+            return self.regex.match(abs_path[len(self.base) + 1 :]) is not None
+        return self.regex.match(name) is not None
+
+
+def translate_pattern(pattern: str) -> re.Pattern:
+    """Translate a .gitignore pattern into a regex, unlike fnmatch a single star does not match a slash."""
+    regex = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            regex.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            regex.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            regex.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            regex.append("[^/]")
+            i += 1
+        elif (pattern[i] == "[") and ((end := pattern.find("]", i + 1)) != -1):
+            characters = pattern[i + 1 : end].replace("\\", "\\\\")
+            if characters.startswith("!"):
+                characters = "^" + characters[1:]
+            regex.append(f"[{characters}]")
+            i = end + 1
+        else:
+            regex.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(regex) + r"\Z")
+
+
+def read_ignore_file(directory: str) -> list[IgnoreRule]:
+    try:
+        with open(os.path.join(directory, IGNORE_FILE), "r", errors="ignore") as file:
+            lines = file.readlines()
+    except OSError:
+        return []
+
+    rules = [IgnoreRule.from_line(line, base=os.path.abspath(directory)) for line in lines]
+    return [rule for rule in rules if rule is not None]
+
+
+def is_ignored(rules: list[IgnoreRule], abs_path: str, name: str, is_dir: bool) -> bool:
+    # the last matching rule decides, like in git
+    ignored = False
+    for rule in rules:
+        if rule.matches(abs_path, name, is_dir):
+            ignored = not rule.negated
+    return ignored
+
+
+def matches_any(patterns: list[str], path: str, name: str) -> bool:
+    return any(fnmatch.fnmatch(path, pattern) or fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+
+@dataclass
+class FileDiscovery:
+    """Finds the python files in the given directories with os.scandir.
+
+    Directories are pruned as early as possible: hidden and well known non-model directories, directories ignored by a
+    .gitignore file and directories matching an exclude glob are never entered. Globs are matched against the path as
+    well as the name of a file or directory. If prefilter is set, files not containing the class keyword are skipped.
+    """
+
+    include: list[str] = field(default_factory=list)
+    exclude: list[str] = field(default_factory=list)
+    use_ignore_files: bool = True
+    prefilter: bool = False
+    stats: DiscoveryStats = field(default_factory=DiscoveryStats)
+
+    def find(self, dirs: list[str] | None = None, files: list[str] | None = None) -> set[str]:
+        """Get the set of file paths to search for model classes."""
+        if (dirs is None) and (files is None):
+            raise ValueError("No directories or files provided.")
+
+        self.stats = DiscoveryStats()
+
+        # declare set to store file paths
+        filepaths = set()
+
+        # add files, given files are always considered
+        if files is not None:
+            for file in files:
+                if not os.path.exists(file):
+                    raise FileNotFoundError(f"File not found: {file}")
+                if file.endswith(".py"):
+                    if self._keep_file(file):
+                        filepaths.add(file)
+                else:
+                    logger.warning(f"File is not a python file: {file}")
+
+        # add directories
+        if dirs is not None:
+            for directory in dirs:
+                rules = self._get_parent_rules(directory) if self.use_ignore_files else []
+                self._scan(directory, rules=rules, filepaths=filepaths)
+
+        # check if any files were found
+        if len(filepaths) == 0:
+            raise ValueError("No files found in provided dirs and files.")
+
+        return filepaths
+
+    def _scan(self, directory: str, rules: list[IgnoreRule], filepaths: set[str]) -> None:
+        self.stats.directories += 1
+        if self.use_ignore_files:
+            rules = rules + read_ignore_file(directory)
+        abs_directory = os.path.abspath(directory)
+
+        subdirectories = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if self._prune_directory(entry, os.path.join(abs_directory, entry.name), rules):
+                        self.stats.pruned_directories += 1
+                    else:
+                        subdirectories.append(entry.path)
+                elif entry.name.endswith(".py") and entry.is_file():
+                    if is_ignored(rules, os.path.join(abs_directory, entry.name), entry.name, is_dir=False):
+                        self.stats.ignored_files += 1
+                    elif self._keep_file(entry.path):
+                        filepaths.add(entry.path)
+
+        for subdirectory in subdirectories:
+            self._scan(subdirectory, rules=rules, filepaths=filepaths)
+
+    def _prune_directory(self, entry: os.DirEntry, abs_path: str, rules: list[IgnoreRule]) -> bool:
+        if self.use_ignore_files and (entry.name.startswith(".") or entry.name in DEFAULT_EXCLUDED_DIRS):
+            return True
+        if matches_any(self.exclude, entry.path, entry.name):
+            return True
+        return is_ignored(rules, abs_path, entry.name, is_dir=True)
+
+    def _keep_file(self, filepath: str) -> bool:
+        name = os.path.basename(filepath)
+        if (self.include and not matches_any(self.include, filepath, name)) or matches_any(
+            self.exclude, filepath, name
+        ):
+            self.stats.excluded_files += 1
+            return False
+
+        if self.prefilter:
+            with open(filepath, "rb") as file:
+                if CLASS_KEYWORD not in file.read():
+                    self.stats.prefiltered_files += 1
+                    return False
+
+        self.stats.files += 1
+        return True
+
+    @staticmethod
+    def _get_parent_rules(directory: str) -> list[IgnoreRule]:
+        """Rules of the ignore files above directory, up to the root of the git repository (if there is one)."""
+        parents = []
+        current = os.path.abspath(directory)
+        while True:
+            parent = os.path.dirname(current)
+            if (parent == current) or os.path.exists(os.path.join(current, ".git")):
+                break
+            current = parent
+            parents.append(current)
+
+        if not os.path.exists(os.path.join(current, ".git")):
+            # not within a git repository, ignore files above the directory do not apply
+            return []
+
+        rules = []
+        for parent in reversed(parents):
+            rules.extend(read_ignore_file(parent))
+        return rules
@@ -0,0 +1,42 @@
+"""Queries of the local git repository, only the .git directory is read and no remote is contacted."""
+
+import os
+import subprocess
+
+
+class GitError(RuntimeError):
+    """A git command failed, e.g. because the directory is not part of a repository or the ref is unknown."""
+
+
+def run_git(*args: str, cwd: str | None = None) -> str:
+    try:
+        result = subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True)
+    except FileNotFoundError as error:
+        raise GitError("git is not installed.") from error
+    except subprocess.CalledProcessError as error:
+        raise GitError(error.stderr.strip() or f"git {args[0]} failed.") from error
+    return result.stdout
+
+
+def get_toplevel(cwd: str | None = None) -> str:
+    """Root directory of the repository containing cwd."""
+    return run_git("rev-parse", "--show-toplevel", cwd=cwd).strip()
+
+
+def resolve_ref(ref: str, cwd: str | None = None) -> str:
+    """Hash of the commit a ref (branch, tag, HEAD~2, ...) points to."""
+    try:
+        return run_git("rev-parse", "--verify", f"{ref}^{{commit}}", cwd=cwd).strip()
+    except GitError as error:
+        raise GitError(f"Unknown git ref {ref}: {error}") from error
+
+
+def get_changed_files(ref: str, cwd: str | None = None) -> set[str]:
+    """Real paths of the .py files that differ between ref and the working tree.
+
+    Added, modified and deleted files are included, staged or not, as well as untracked files not ignored by git.
+    """
+    toplevel = get_toplevel(cwd=cwd)
+    changed = run_git("diff", "--name-only", "--no-renames", "-z", ref, "--", "*.py", cwd=toplevel)
+    untracked = run_git("ls-files", "--others", "--exclude-standard", "-z", "--", "*.py", cwd=toplevel)
+    return {os.path.realpath(os.path.join(toplevel, path)) for path in (changed + untracked).split("\0") if path}
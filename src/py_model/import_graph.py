@@ -0,0 +1,125 @@
+import ast
+import logging
+import os
+import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+
+from py_model.navigation import get_module_name, read_source
+
+logger = logging.getLogger(__name__)
+
+# import statements found by a text search, parenthesized and backslash continued ones included
+IMPORT_PATTERN = re.compile(
+    rb"^[ \t]*(?:from[ \t]+[\w. \t]+import[ \t]*(?:\([^)]*\)|(?:[^\n]*\\\n)*[^\n]*)|import[ \t]+(?:[^\n]*\\\n)*[^\n]*)",
+    re.MULTILINE,
+)
+
+
+def scan_imports(source: bytes) -> Iterator[ast.Import | ast.ImportFrom]:
+    """Yield the import statements of a source without parsing all of it.
+
+    Only the statements found by a text search are parsed, matches that are no import (e.g. a line of a docstring
+    starting with `import`) are skipped. Imports within strings may be yielded, which only results in following an
+    unnecessary import.
+    """
+    for match in IMPORT_PATTERN.finditer(source):
+        try:
+            tree = ast.parse(match.group().strip())
+        except (SyntaxError, ValueError):
+            continue
+        for node in tree.body:
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                yield node
+
+
+def iter_imported_modules(node: ast.Import | ast.ImportFrom, package: str) -> Iterator[str]:
+    """Yield the absolute names of all modules an import may execute, e.g. a, a.b and a.b.C for `from a.b import C`.
+
+    The imported names of `from` imports are yielded as well, since they may be modules instead of classes.
+    """
+    if isinstance(node, ast.Import):
+        names = [alias.name for alias in node.names]
+    else:
+        base = node.module or ""
+        if node.level > 0:
+            parts = package.split(".") if package else []
+            parts = parts[: len(parts) - node.level + 1]
+            base = ".".join(part for part in [*parts, base] if part)
+        names = [f"{base}.{alias.name}" if base else alias.name for alias in node.names if alias.name != "*"]
+        if base:
+            names.append(base)
+
+    for name in names:
+        parts = name.split(".")
+        for index in range(1, len(parts) + 1):
+            yield ".".join(parts[:index])
+
+
+def get_module_index(filepaths: Iterable[str], roots: list[str]) -> dict[str, str]:
+    """Files by the dotted module names they can be imported by.
+
+    A file gets the name relative to each source root it is part of (like an entry of sys.path) as well as the name
+    derived from the packages it is part of, see get_module_name.
+    """
+    real_roots = [os.path.realpath(root) for root in roots]
+    index = {}
+    for filepath in sorted(filepaths):
+        index.setdefault(get_module_name(filepath), filepath)
+        real_path = os.path.realpath(filepath)
+        for root in real_roots:
+            if os.path.commonpath([root, real_path]) != root:
+                continue
+            parts = os.path.relpath(real_path, root).removesuffix(".py").split(os.sep)
+            if parts[-1] == "__init__":
+                parts.pop()
+            if parts:
+                index.setdefault(".".join(parts), filepath)
+    return index
+
+
+def find_reachable_files(entries: list[str], filepaths: Iterable[str], roots: list[str]) -> set[str]:
+    """Files of the modules the entry modules import, directly or indirectly, including the entries themselves.
+
+    Only the import statements of the files are parsed, imports of modules outside of filepaths (e.g. of the standard
+    library) are not followed.
+
+    Args:
+        entries (list[str]): dotted names of the entry modules, e.g. models.api
+        filepaths (Iterable[str]): files that can be imported, e.g. found by a directory walk of the roots
+        roots (list[str]): source roots the dotted names are relative to, e.g. the src directory
+
+    Returns:
+        set[str]: paths of the reachable files
+    """
+    index = get_module_index(filepaths, roots=roots)
+    # relative imports are resolved against the longest name of a file, which includes most of its packages
+    modules: dict[str, str] = {}
+    for name, filepath in index.items():
+        if len(name) > len(modules.get(filepath, "")):
+            modules[filepath] = name
+
+    reachable: set[str] = set()
+    queue: deque[str] = deque()
+    for entry in entries:
+        if (filepath := index.get(entry)) is None:
+            raise ValueError(f"Entry module {entry} was not found in {', '.join(roots)}.")
+        queue.append(filepath)
+
+    while queue:
+        filepath = queue.popleft()
+        if filepath in reachable:
+            continue
+        reachable.add(filepath)
+
+        name = modules[filepath]
+        package = name if filepath.endswith("__init__.py") else name.rpartition(".")[0]
+        # importing a module executes the __init__.py of all its packages
+        imported = [package.rpartition(".")[0] if filepath.endswith("__init__.py") else package]
+        for node in scan_imports(read_source(filepath)):
+            imported.extend(iter_imported_modules(node, package=package))
+        for module in imported:
+            if module and ((target := index.get(module)) is not None) and (target not in reachable):
+                queue.append(target)
+
+    return reachable
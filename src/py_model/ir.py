@@ -0,0 +1,246 @@
+"""Intermediate representation (IR) of the parsed classes as JSON Lines.
+
+The IR decouples parsing from emission: the classes are parsed once and written with --emit-ir, any number of outputs
+can then be generated from it with --from-ir, without parsing the files again. It is written and read one line at a
+time, hence a model never has to be held in memory as a single JSON document.
+
+Format (version 2):
+    The first line is the header `{"format": "py-model-ir", "version": 2}`. Then every module with imports has a line
+    mapping the names it imports to the absolute names they refer to, relative imports are resolved already:
+
+        {"module": "shop.staff", "imports": {"Human": "shop.people.Person"}, "star_imports": ["shop.roles"]}
+
+    Resolving the names of the classes through these imports gives the same edges as resolving them while parsing
+    (e.g. a base class imported with an alias). Imports are only known if the IR is written after parsing all files,
+    with --stream the IR has no import lines and names are resolved within their module or as unique class names.
+    Every following line is one class:
+
+        {
+            "name": "Developer",
+            "qualname": "Developer",
+            "module": "models.person",
+            "is_dataclass": false,
+            "inherits_from": ["Person"],
+            "attributes": [{"name": "languages", "type": {"list": "str"}}],
+            "functions": [{"name": "brag", "parameters": [], "returns": "str"}]
+        }
+
+    Nested classes are lines of their own, identified by their qualname (e.g. Outer.Inner). The module is null if it
+    is not known. Type hints are nested JSON values:
+        - "none", "bool", "int", "float", "str" and "undefined" (no annotation) for the basic types
+        - {"class": "models.Person"} for custom classes, the name as written in the annotation
+        - {"list": T}, {"set": T}, {"dict": [K, V]}, {"tuple": [T, ...]} for containers, with null instead of the
+          arguments for bare containers (e.g. `list`)
+        - {"union": [T, T, ...]} for unions
+
+    Readers reject files of a newer version, fields added within a version are ignored by older readers. Version 1
+    files are read as files without import lines.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING, Any, TextIO
+
+from py_model.parsing import Attribute, Attributes, Class, Function, Import, Parameter
+from py_model.parsing.type_hints import (
+    Boolean,
+    CustomClass,
+    Dict,
+    Float,
+    Integer,
+    List,
+    NoneType,
+    Set,
+    String,
+    Tuple,
+    TypeHint,
+    Undefined,
+    Union,
+)
+from py_model.writing import Writer
+
+if TYPE_CHECKING:
+    from py_model.parsing import BuildingBlock
+    from py_model.symbols import SymbolTable
+
+IR_FORMAT = "py-model-ir"
+IR_VERSION = 2
+
+BASIC_TYPES: dict[type[TypeHint], str] = {
+    NoneType: "none",
+    Boolean: "bool",
+    Integer: "int",
+    Float: "float",
+    String: "str",
+    Undefined: "undefined",
+}
+BASIC_TYPES_BY_NAME = {name: type_hint for type_hint, name in BASIC_TYPES.items()}
+CONTAINERS: dict[type[TypeHint], str] = {List: "list", Set: "set", Dict: "dict", Tuple: "tuple", Union: "union"}
+CONTAINERS_BY_NAME = {name: type_hint for type_hint, name in CONTAINERS.items()}
+
+
+def encode_type_hint(type_hint: TypeHint) -> Any:
+    if (name := BASIC_TYPES.get(type(type_hint))) is not None:
+        return name
+    if isinstance(type_hint, CustomClass):
+        return {"class": type_hint.name}
+
+    name = CONTAINERS[type(type_hint)]
+    (arguments,) = type_hint.get_arguments()
+    if arguments is None:
+        return {name: None}
+    if isinstance(arguments, tuple):
+        return {name: [encode_type_hint(argument) for argument in arguments]}
+    return {name: encode_type_hint(arguments)}
+
+
+def decode_type_hint(value: Any, decoded: dict[str, TypeHint] | None = None) -> TypeHint:
+    """Create the type hint of an IR value.
+
+    Type hints are interned, hence decoding a value that was decoded before returns the same instance. Passing the
+    same decoded dictionary for all values of a file skips creating them again, which dominates loading otherwise.
+    """
+    if isinstance(value, str):
+        try:
+            return BASIC_TYPES_BY_NAME[value]()
+        except KeyError as error:
+            raise ValueError(f"Unknown type hint {value!r} in IR.") from error
+
+    if decoded is None:
+        return create_type_hint(value)
+    key = repr(value)
+    if (type_hint := decoded.get(key)) is None:
+        type_hint = decoded[key] = create_type_hint(value, decoded)
+    return type_hint
+
+
+def create_type_hint(value: dict, decoded: dict[str, TypeHint] | None = None) -> TypeHint:
+    ((name, arguments),) = value.items()
+    if name == "class":
+        return CustomClass(arguments)
+    try:
+        container = CONTAINERS_BY_NAME[name]
+    except KeyError as error:
+        raise ValueError(f"Unknown type hint {name!r} in IR.") from error
+    if arguments is None:
+        return container()
+    if isinstance(arguments, list):
+        return container([decode_type_hint(argument, decoded) for argument in arguments])
+    return container(decode_type_hint(arguments, decoded))
+
+
+def encode_class(cls: Class) -> dict:
+    return {
+        "name": cls.name,
+        "qualname": cls.qualname,
+        "module": cls.module,
+        "is_dataclass": cls.is_dataclass,
+        "inherits_from": cls.inherits_from,
+        "attributes": [
+            {"name": attribute.name, "type": encode_type_hint(attribute.dtype)} for attribute in cls.attributes
+        ],
+        "functions": [
+            {
+                "name": func.name,
+                "parameters": [
+                    {"name": parameter.name, "type": encode_type_hint(parameter.dtype)} for parameter in func.parameters
+                ],
+                "returns": encode_type_hint(func.return_type),
+            }
+            for func in cls.functions
+        ],
+    }
+
+
+def decode_class(value: dict, decoded: dict[str, TypeHint] | None = None) -> Class:
+    attributes = Attributes(
+        Attribute(name=attribute["name"], dtype=decode_type_hint(attribute["type"], decoded))
+        for attribute in value["attributes"]
+    )
+    functions = [
+        Function(
+            name=func["name"],
+            parameters=[
+                Parameter(name=parameter["name"], dtype=decode_type_hint(parameter["type"], decoded))
+                for parameter in func["parameters"]
+            ],
+            return_type=decode_type_hint(func["returns"], decoded),
+        )
+        for func in value["functions"]
+    ]
+    return Class(
+        name=value["name"],
+        qualname=value["qualname"],
+        module=value["module"],
+        is_dataclass=value["is_dataclass"],
+        inherits_from=value["inherits_from"],
+        attributes=attributes,
+        functions=functions,
+    )
+
+
+def encode_imports(symbols: SymbolTable) -> Iterator[dict]:
+    """The imports of every module of the symbol table, see SymbolTable.aliases and SymbolTable.star_imports."""
+    for module in sorted(symbols.modules):
+        aliases = symbols.aliases.get(module, {})
+        star_imports = symbols.star_imports.get(module, [])
+        if aliases or star_imports:
+            yield {"module": module, "imports": aliases, "star_imports": star_imports}
+
+
+def decode_imports(value: dict) -> list[Import]:
+    """Imports of the absolute names of an import line, their targets equal the ones of the parsed imports."""
+    imports = [Import(alias=alias, module=target) for alias, target in value["imports"].items()]
+    imports.extend(Import(alias="*", module=target, name="*") for target in value.get("star_imports", []))
+    return imports
+
+
+class IrWriter(Writer):
+    """Writes the classes as IR, one line per class."""
+
+    supports_stream = True
+
+    def header(self) -> Iterable[str]:
+        yield json.dumps({"format": IR_FORMAT, "version": IR_VERSION}) + "\n"
+
+    def render(self, block: BuildingBlock) -> Iterator[str]:
+        yield json.dumps(encode_class(block), separators=(",", ":"), ensure_ascii=False)
+        yield "\n"
+
+    def write(self, blocks: Iterable[BuildingBlock], stream: TextIO, symbols: SymbolTable | None = None) -> None:
+        """Write the blocks, preceded by the imports of the modules of symbols if given."""
+        stream.writelines(self.header())
+        if symbols is not None:
+            for value in encode_imports(symbols):
+                stream.write(json.dumps(value, separators=(",", ":"), ensure_ascii=False))
+                stream.write("\n")
+        for block in blocks:
+            stream.writelines(self.render(block))
+
+
+def iter_ir(stream: TextIO, imports: dict[str, list[Import]] | None = None) -> Iterator[Class]:
+    """Read the classes of an IR stream one line at a time.
+
+    The imports of the modules are added to imports if given. They precede the classes, hence they are complete once
+    the first class was read.
+    """
+    header = json.loads(stream.readline() or "null")
+    if not isinstance(header, dict) or (header.get("format") != IR_FORMAT):
+        raise ValueError("The file is not a py-model IR file.")
+    if header.get("version", 0) > IR_VERSION:
+        raise ValueError(
+            f"IR version {header['version']} is not supported by this py-model version (up to {IR_VERSION})."
+        )
+
+    decoded: dict[str, TypeHint] = {}
+    for line in stream:
+        if not line.strip():
+            continue
+        value = json.loads(line)
+        if "imports" in value:
+            if imports is not None:
+                imports[value["module"]] = decode_imports(value)
+        else:
+            yield decode_class(value, decoded)
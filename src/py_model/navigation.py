@@ -1,50 +1,167 @@
 import ast
+import logging
 import os
-from ast import ClassDef
+from ast import AsyncFunctionDef, ClassDef, FunctionDef
+from collections import deque
+from collections.abc import Iterable, Iterator
+from functools import cache
 
-from py_model.logging import get_logger
+from py_model.defaults import DEFAULT_READ_AHEAD, DEFAULT_READ_THREADS
+from py_model.discovery import CLASS_KEYWORD, FileDiscovery
 
-logger = get_logger(__name__)
+logger = logging.getLogger(__name__)
 
+IMPORT_KEYWORD = b"import"
 
-def get_filepath_set(dirs: list[str] | None = None, files: list[str] | None = None) -> set[str]:
-    """Get the set of file paths to search for model classes."""
-    if (dirs is None) and (files is None):
-        raise ValueError("No directories or files provided.")
+# statements with a body that may contain class definitions
+COMPOUND_STATEMENTS = (
+    ast.If,
+    ast.For,
+    ast.AsyncFor,
+    ast.While,
+    ast.With,
+    ast.AsyncWith,
+    ast.Try,
+    ast.TryStar,
+    ast.Match,
+)
 
-    # declare set to store file paths
-    filepaths = set()
 
-    # add files
-    if files is not None:
-        for file in files:
-            if not os.path.exists(file):
-                raise FileNotFoundError(f"File not found: {file}")
-            if file.endswith(".py"):
-                filepaths.add(file)
-            else:
-                logger.warning(f"File is not a python file: {file}")
+def get_filepath_set(
+    dirs: list[str] | None = None, files: list[str] | None = None, discovery: FileDiscovery | None = None
+) -> set[str]:
+    """Get the set of file paths to search for model classes, see FileDiscovery for the available options."""
+    if discovery is None:
+        discovery = FileDiscovery()
+    return discovery.find(dirs=dirs, files=files)
 
-    # add directories
-    if dirs is not None:
-        for directory in dirs:
-            for root, _, filenames in os.walk(directory):
-                for filename in filenames:
-                    if filename.endswith(".py"):
-                        filepaths.add(os.path.join(root, filename))
 
-    # check if any files were found
-    if len(filepaths) == 0:
-        raise ValueError("No files found in provided dirs and files.")
+def read_source(filepath: str) -> bytes:
+    """Read the raw bytes of a file, ast.parse decodes them according to the encoding declaration of the file."""
+    with open(filepath, "rb") as file:
+        return file.read()
 
-    return filepaths
 
+def iter_sources(
+    filepaths: Iterable[str], threads: int = DEFAULT_READ_THREADS, read_ahead: int = DEFAULT_READ_AHEAD
+) -> Iterator[tuple[str, bytes]]:
+    """Yield the paths and raw bytes of files in order, reading the next files with threads in the meantime.
 
-def get_classes(filepath: str) -> list[ClassDef]:
-    with open(filepath, "r") as file:
-        tree = ast.parse(file.read(), filename=filepath)
+    On slow (e.g. network) file systems most of the time is spent waiting for reads, which then overlap with
+    processing the files already read. At most read_ahead files are read but not yet yielded, which bounds the memory.
+    With no threads the files are read one after another.
+    """
+    filepaths = iter(filepaths)
+    if (threads <= 0) or (read_ahead <= 0):
+        for filepath in filepaths:
+            yield filepath, read_source(filepath)
+        return
 
-    # get all class definitions
-    nodes = [node for node in ast.walk(tree) if isinstance(node, ast.ClassDef)]
+    # threads are only needed here, concurrent.futures is slow to import
+    from concurrent.futures import ThreadPoolExecutor
 
-    return nodes
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="read-ahead") as executor:
+        pending = deque(
+            (filepath, executor.submit(read_source, filepath)) for _, filepath in zip(range(read_ahead), filepaths)
+        )
+        while pending:
+            filepath, future = pending.popleft()
+            if (next_filepath := next(filepaths, None)) is not None:
+                pending.append((next_filepath, executor.submit(read_source, next_filepath)))
+            yield filepath, future.result()
+
+
+def iter_statements(body: list[ast.stmt]) -> Iterator[ast.stmt]:
+    """Yield the statements of a body in order, including those nested in compound statements (e.g. if or try).
+
+    Function and class definitions are not descended into and neither are expressions, since they can never contain a
+    class definition or an import of the body's scope.
+    """
+    for node in body:
+        if isinstance(node, COMPOUND_STATEMENTS):
+            for field in ("body", "orelse", "finalbody"):
+                yield from iter_statements(getattr(node, field, []))
+            for handler in getattr(node, "handlers", []):
+                yield from iter_statements(handler.body)
+            for case in getattr(node, "cases", []):
+                yield from iter_statements(case.body)
+        else:
+            yield node
+
+
+def iter_definitions(body: list[ast.stmt]) -> Iterator[ClassDef | FunctionDef | AsyncFunctionDef]:
+    """Yield the class and function definitions (async ones included) of a body in order, see iter_statements."""
+    for node in iter_statements(body):
+        if isinstance(node, (ClassDef, FunctionDef, AsyncFunctionDef)):
+            yield node
+
+
+def iter_imports(body: list[ast.stmt]) -> Iterator[ast.Import | ast.ImportFrom]:
+    """Yield the imports of a body in order, including conditional ones like `if TYPE_CHECKING:`."""
+    for node in iter_statements(body):
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            yield node
+
+
+def iter_class_definitions(body: list[ast.stmt], prefix: str = "") -> Iterator[tuple[str, ClassDef]]:
+    """Yield the qualified name and definition of all outermost classes of a module body.
+
+    Classes nested in those are not yielded, they are built together with their enclosing class. Classes defined
+    within module level functions are yielded with the qualified name Python would give them, e.g. `f.<locals>.A`.
+    """
+    for node in iter_definitions(body):
+        if isinstance(node, ClassDef):
+            yield prefix + node.name, node
+        else:
+            yield from iter_class_definitions(node.body, prefix=f"{prefix}{node.name}.<locals>.")
+
+
+def parse_source(filepath: str, source: bytes | None = None) -> ast.Module | None:
+    """Parse a file, returns None if it neither defines a class nor imports anything."""
+    if source is None:
+        source = read_source(filepath)
+
+    if (CLASS_KEYWORD not in source) and (IMPORT_KEYWORD not in source):
+        # no need to parse a file that is irrelevant for the model
+        return None
+
+    return ast.parse(source, filename=filepath)
+
+
+def get_class_definitions(filepath: str, source: bytes | None = None) -> list[tuple[str, ClassDef]]:
+    """Get the qualified names and definitions of the outermost classes of a file."""
+    tree = parse_source(filepath, source=source)
+    if tree is None:
+        return []
+
+    return list(iter_class_definitions(tree.body))
+
+
+def get_classes(filepath: str, source: bytes | None = None) -> list[ClassDef]:
+    """Get the definitions of the outermost classes of a file, nested classes are part of their enclosing class."""
+    return [class_def for _, class_def in get_class_definitions(filepath, source=source)]
+
+
+@cache
+def get_package(directory: str) -> str:
+    """Dotted name of the package a directory represents, empty if it is not a package (has no __init__.py)."""
+    if not os.path.isfile(os.path.join(directory, "__init__.py")):
+        return ""
+
+    parent = os.path.dirname(directory)
+    name = os.path.basename(directory)
+    if parent == directory:
+        return name
+    parent_package = get_package(parent)
+    return f"{parent_package}.{name}" if parent_package else name
+
+
+def get_module_name(filepath: str) -> str:
+    """Dotted module name of a file, derived from the packages (directories with an __init__.py) it is part of."""
+    directory, filename = os.path.split(os.path.abspath(filepath))
+    package = get_package(directory)
+    stem = filename.removesuffix(".py")
+
+    if stem == "__init__":
+        return package or os.path.basename(directory)
+    return f"{package}.{stem}" if package else stem
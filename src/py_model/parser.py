@@ -1,14 +1,155 @@
 import argparse
 
+from py_model.defaults import (
+    DEFAULT_CACHE_DIR,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_MAX_WARNINGS,
+    DEFAULT_PROFILE_FILE,
+    DEFAULT_READ_AHEAD,
+    DEFAULT_READ_THREADS,
+    DEFAULT_SLOWEST_FILES,
+    DEFAULT_SOCKET,
+)
+
+# arguments shared by py-model and py-model serve
+common_parser = argparse.ArgumentParser(add_help=False)
+common_parser.add_argument("--dirs", "-d", nargs="*", type=str, help="Directories to search for model files.")
+common_parser.add_argument("--files", "-f", nargs="*", type=str, help="Files to search for model files.")
+common_parser.add_argument(
+    "--include", nargs="*", default=[], help="Only consider files whose path or name matches one of these globs."
+)
+common_parser.add_argument(
+    "--exclude", nargs="*", default=[], help="Skip files and directories whose path or name matches one of these globs."
+)
+common_parser.add_argument(
+    "--no-ignore",
+    action="store_true",
+    help="Also search hidden and well known non-model directories as well as files ignored by .gitignore files.",
+)
+common_parser.add_argument(
+    "--prefilter", action="store_true", help="Skip files not containing the class keyword during the file search."
+)
+common_parser.add_argument(
+    "--jobs", "-j", type=int, default=1, help="Number of processes used for parsing, 0 uses all available cores."
+)
+common_parser.add_argument("--cache-dir", type=str, default=DEFAULT_CACHE_DIR, help="Directory of the parse cache.")
+common_parser.add_argument(
+    "--no-cache", action="store_true", help="Parse all files without reading or writing the cache."
+)
+common_parser.add_argument(
+    "--verbose", "-v", action="store_true", help="Increase verbosity of the output."
+)  # TODO: actually implement this
+
 # setup argument parser
-parser = argparse.ArgumentParser(description="Argument parser for for the py-model package.")
+parser = argparse.ArgumentParser(description="Argument parser for for the py-model package.", parents=[common_parser])
 
 # add arguments
-parser.add_argument("--dirs", "-d", nargs="*", type=str, help="Directories to search for model files.")
-parser.add_argument("--files", "-f", nargs="*", type=str, help="Files to search for model files.")
 parser.add_argument(
-    "--output", "-o", type=str, default="", help="Output path of the result, if none specified it prints to stdout."
+    "--output",
+    "-o",
+    nargs="*",
+    default=[],
+    help="Output paths of the result, the files are written from the same model. If none specified it prints to stdout.",
 )
 parser.add_argument(
-    "--verbose", "-v", action="store_true", help="Increase verbosity of the output."
-)  # TODO: actually implement this
+    "--split-output",
+    type=str,
+    help="Directory to write one file per module into, with imports between them. Unchanged files are not rewritten.",
+)
+parser.add_argument(
+    "--split-type", type=str, default="ts", help="Output type of the files of --split-output. Defaults to ts."
+)
+parser.add_argument("--emit-ir", type=str, help="Write the parsed classes to this file as JSON Lines, see --from-ir.")
+parser.add_argument(
+    "--from-ir",
+    type=str,
+    help="Generate the output from classes written with --emit-ir before instead of parsing files.",
+)
+parser.add_argument(
+    "--stream",
+    action="store_true",
+    help="Write the classes of every file right after parsing it instead of holding all classes in memory. Only "
+    "for outputs that render every class on its own (stdout, .ts, --emit-ir), base classes are not resolved.",
+)
+parser.add_argument(
+    "--parallel-output", action="store_true", help="Write the output files concurrently, one thread per file."
+)
+parser.add_argument(
+    "--read-threads",
+    type=int,
+    default=DEFAULT_READ_THREADS,
+    help="Threads reading the next files while parsing, helps on slow or network file systems. 0 reads one by one.",
+)
+parser.add_argument(
+    "--read-ahead",
+    type=int,
+    default=DEFAULT_READ_AHEAD,
+    help="Maximum number of files read ahead of parsing, limits the memory used for buffered files.",
+)
+parser.add_argument("--clear-cache", action="store_true", help="Remove all entries of the parse cache before running.")
+parser.add_argument(
+    "--entry",
+    action="append",
+    help="Dotted name of an entry module (relative to --dirs), only the modules it imports are parsed."
+    " Can be given several times.",
+)
+parser.add_argument(
+    "--root",
+    action="append",
+    help="Only output the classes reachable from this class through bases and type hints, can be given several times."
+    " Files are only parsed if they may define a needed class.",
+)
+parser.add_argument(
+    "--since",
+    type=str,
+    help="Only parse the files changed since this git ref, all others are taken from the snapshot of the ref.",
+)
+parser.add_argument(
+    "--snapshot-dir",
+    type=str,
+    help="Directory of the per commit snapshots of the model written by --since runs, defaults to the cache dir.",
+)
+parser.add_argument("--watch", "-w", action="store_true", help="Regenerate the output whenever a file changes.")
+parser.add_argument(
+    "--watch-interval", type=float, default=0.5, help="Seconds between two checks for changes in watch mode."
+)
+parser.add_argument(
+    "--debounce", type=float, default=0.2, help="Seconds without further changes before regenerating in watch mode."
+)
+parser.add_argument(
+    "--max-warnings",
+    type=int,
+    default=DEFAULT_MAX_WARNINGS,
+    help="Number of distinct warnings shown in the summary at the end, the totals per category are always shown.",
+)
+parser.add_argument("--warnings-json", type=str, help="Write all warnings with their counts and locations as JSON.")
+parser.add_argument(
+    "--profile",
+    nargs="?",
+    const=DEFAULT_PROFILE_FILE,
+    help="Measure wall time, CPU time and peak memory of every phase and file and write them as JSON to this file.",
+)
+parser.add_argument(
+    "--profile-top", type=int, default=DEFAULT_SLOWEST_FILES, help="Number of slowest files listed in the profile."
+)
+parser.add_argument("--profile-stats", type=str, help="Additionally dump cProfile stats of the run to this file.")
+parser.add_argument(
+    "--connect",
+    nargs="?",
+    const=DEFAULT_SOCKET,
+    help="Let the server started by `py-model serve` on this socket write the output, runs locally if none listens.",
+)
+
+# py-model serve
+serve_parser = argparse.ArgumentParser(
+    prog="py-model serve",
+    description="Keep the parsed model in memory and write the output on request of `py-model --connect`.",
+    parents=[common_parser],
+)
+serve_parser.add_argument("--socket", type=str, default=DEFAULT_SOCKET, help="Path of the Unix socket to listen on.")
+serve_parser.add_argument(
+    "--idle-timeout",
+    type=float,
+    default=DEFAULT_IDLE_TIMEOUT,
+    help="Seconds without a request after which the server shuts down.",
+)
@@ -4,6 +4,7 @@ from .attribute import Attribute
 from .attributes import Attributes
 from .parameter import Parameter
 from .container_classes import Class, Function
+from .module import Import, Module
 
 __all__ = [
     "BuildingBlock",
@@ -13,4 +14,6 @@ __all__ = [
     "Parameter",
     "TypeHintableValue",
     "Class",
+    "Import",
+    "Module",
 ]
@@ -11,6 +11,8 @@ from .typehintablevalue import TypeHintableValue
 
 
 class Attribute(TypeHintableValue):
+    __slots__ = ()
+
     def __str__(self) -> str:
         return indicate_access_level(super().__str__())
 
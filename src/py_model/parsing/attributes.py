@@ -1,24 +1,32 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import logging
+from collections.abc import Iterable, Iterator
 from typing import Literal
 
-from py_model.logging import get_logger
-
 from .attribute import Attribute
 
-logger = get_logger(__name__)
+logger = logging.getLogger(__name__)
 
 
-@dataclass
 class Attributes:
-    attributes: list[Attribute]
+    """Attributes of a class in insertion order, indexed by their name for constant time lookups."""
+
+    __slots__ = ("_index",)
+
+    def __init__(self, attributes: Iterable[Attribute] = ()) -> None:
+        self._index: dict[str, Attribute] = {}
+        self.add_attributes(attributes=attributes)
+
+    @property
+    def attributes(self) -> list[Attribute]:
+        return list(self._index.values())
+
+    def get(self, name: str) -> Attribute | None:
+        return self._index.get(name)
 
     def contains_attribute(self, attribute: Attribute) -> Attribute | Literal[False]:
-        for attr in self.attributes:
-            if attr.name == attribute.name:
-                return attr
-        return False
+        return self._index.get(attribute.name, False)
 
     def add_attribute(self, new_attr: Attribute) -> None:
         # check if attribute is already in list
@@ -31,14 +39,23 @@ class Attributes:
                 logger.info(f"Adding type hint {new_attr.dtype} to attribute '{new_attr.name}'.")
                 old_attr.dtype = new_attr.dtype
         else:
-            self.attributes.append(new_attr)
+            self._index[new_attr.name] = new_attr
 
-    def add_attributes(self, attributes: list[Attribute]) -> None:
+    def add_attributes(self, attributes: Iterable[Attribute]) -> None:
         for attribute in attributes:
             self.add_attribute(new_attr=attribute)
 
+    def __iter__(self) -> Iterator[Attribute]:
+        return iter(self._index.values())
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._index
+
     def __str__(self) -> str:
-        return ", ".join([str(attr) for attr in self.attributes])
+        return ", ".join([str(attr) for attr in self])
 
     def __repr__(self) -> str:
         return self.__str__()
@@ -46,4 +63,4 @@ class Attributes:
     def __eq__(self, other):
         if not isinstance(other, self.__class__):
             return NotImplemented
-        return vars(self) == vars(other)
+        return self.attributes == other.attributes
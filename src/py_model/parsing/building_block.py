@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 
 from py_model.writing import SupportedTypes
 
@@ -7,6 +8,8 @@ class BuildingBlock(ABC):
     """Lists all supported types and provides a method to get the string representation
     of the object in the desired format"""
 
+    __slots__ = ()
+
     @abstractmethod
     def typescript(self) -> str:
         pass
@@ -15,8 +18,16 @@ class BuildingBlock(ABC):
     def dot(self) -> str:
         pass
 
+    def iter_typescript(self) -> Iterator[str]:
+        """Yield the TypeScript representation in chunks, override it for large building blocks."""
+        yield self.typescript()
+
+    def iter_dot(self) -> Iterator[str]:
+        """Yield the DOT representation in chunks, override it for large building blocks."""
+        yield self.dot()
+
+    def iter_string(self, supported_type: SupportedTypes) -> Iterator[str]:
+        return supported_type.writer.render(self)
+
     def get_string(self, supported_type: SupportedTypes) -> str:
-        if supported_type == SupportedTypes.ts:
-            return self.typescript()
-        elif supported_type == SupportedTypes.dot:
-            return self.dot()
+        return "".join(self.iter_string(supported_type=supported_type))
@@ -1,49 +1,77 @@
 from __future__ import annotations
 
 import ast
+import logging
+import sys
+from collections.abc import Iterator
 
-from py_model.logging import get_logger
+from py_model.diagnostics import MISSING_INIT, report
+from py_model.navigation import iter_definitions
 from py_model.parsing import BuildingBlock
-from py_model.utils import determine_is_dataclass, handle_type_annotation, indicate_access_level
+from py_model.utils import (
+    determine_is_dataclass,
+    escape_dot_id,
+    escape_dot_record,
+    get_dotted_name,
+    handle_type_annotation,
+    indicate_access_level,
+)
 from py_model.visitors import OuterAssignVisitor
 from py_model.writing import SupportedTypes
 
 from . import Attribute, Attributes, Parameter
 from .type_hints.basic_types import NoneType, TypeHint, Undefined
 
-logger = get_logger(__name__)
+logger = logging.getLogger(__name__)
 
 
 class Instance(BuildingBlock):
     """Parent of Function and Class"""
 
+    __slots__ = ("functions", "classes")
+
     def __init__(self, functions: list[Function] = [], classes: list[Class] = []) -> None:
         # set those when walking the body
         self.functions: list[Function] = functions
         self.classes: list[Class] = classes
 
+    def get_state(self) -> dict:
+        """Values of all slots, i.e. the public attributes of the instance."""
+        return {name: getattr(self, name) for cls in type(self).__mro__ for name in getattr(cls, "__slots__", ())}
+
     def __eq__(self, other):
         if not isinstance(other, self.__class__):
             return NotImplemented
-        return vars(self) == vars(other)
+        return self.get_state() == other.get_state()
 
     def __repr__(self) -> str:
         return self.__str__()
 
+    def iter_classes(self) -> Iterator[Class]:
+        """Yield all classes nested in this instance (also within its functions) top-down, each exactly once."""
+        for func in self.functions:
+            yield from func.iter_classes()
+        for nested_class in self.classes:
+            yield nested_class
+            yield from nested_class.iter_classes()
+
     @classmethod
-    def get_functions_and_classes(cls, body) -> tuple[list[Function], list[Class]]:
+    def get_functions_and_classes(cls, body, prefix: str = "") -> tuple[list[Function], list[Class]]:
+        """Build the functions and classes defined in a body, prefix is the qualified name of the enclosing scope."""
         functions = []
         classes = []
-        for body_item in body:
-            if isinstance(body_item, ast.FunctionDef):
-                functions.append(Function.from_ast(body_item))
-            elif isinstance(body_item, ast.ClassDef):
-                classes.append(Class.from_ast(body_item))
+        for body_item in iter_definitions(body):
+            if isinstance(body_item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                functions.append(Function.from_ast(body_item, qualname=prefix + body_item.name))
+            else:
+                classes.append(Class.from_ast(body_item, qualname=prefix + body_item.name))
 
         return functions, classes
 
 
 class Function(Instance):
+    __slots__ = ("name", "parameters", "return_type")
+
     def __init__(
         self,
         name: str,
@@ -52,20 +80,21 @@ class Function(Instance):
         functions: list[Function] = [],
         classes: list[Class] = [],
     ) -> None:
-        self.name = name
+        self.name = sys.intern(name)
         self.parameters: list[Parameter] = parameters
         self.return_type: TypeHint = return_type
         self.functions: list[Function] = functions
         self.classes: list[Class] = classes
 
     @classmethod
-    def from_ast(cls, fun: ast.FunctionDef):
+    def from_ast(cls, fun: ast.FunctionDef | ast.AsyncFunctionDef, qualname: str | None = None):
         name = fun.name
+        qualname = qualname or name
         parameters = cls.get_parameters(fun.args.args)
         return_type = cls.get_return_type(fun.returns)
 
         # generate lists of functions and classes
-        functions, classes = cls.get_functions_and_classes(fun.body)
+        functions, classes = cls.get_functions_and_classes(fun.body, prefix=f"{qualname}.<locals>.")
 
         return cls(name=name, parameters=parameters, return_type=return_type, functions=functions, classes=classes)
 
@@ -114,6 +143,8 @@ class Function(Instance):
 class Class(Instance):
     """Represents a class in the data model."""
 
+    __slots__ = ("name", "qualname", "module", "is_dataclass", "inherits_from", "attributes")
+
     def __init__(
         self,
         name: str,
@@ -122,24 +153,31 @@ class Class(Instance):
         attributes: Attributes,
         functions: list[Function] = [],
         classes: list[Class] = [],
+        qualname: str | None = None,
+        module: str | None = None,
     ) -> None:
-        self.name = name
+        self.name = sys.intern(name)
+        self.qualname: str = sys.intern(qualname or name)  # e.g. Outer.Inner for nested classes
+        self.module: str | None = module  # dotted name of the module, set once the file is known
         self.is_dataclass: bool = is_dataclass
-        self.inherits_from: list[str] = inherits_from
+        self.inherits_from: list[str] = [sys.intern(base) for base in inherits_from]
         self.attributes: Attributes = attributes
         self.functions: list[Function] = functions
         self.classes: list[Class] = classes
 
     @classmethod
-    def from_ast(cls, class_def: ast.ClassDef) -> Class:
+    def from_ast(cls, class_def: ast.ClassDef, qualname: str | None = None) -> Class:
+        """Build a class including all its nested classes, qualname defaults to the name of the class."""
         name = class_def.name
+        qualname = qualname or name
         is_dataclass = determine_is_dataclass(class_def=class_def)
         inherits_from = cls.get_inheritance(class_def=class_def)
         attributes, body = cls.get_attributes(class_def=class_def, is_dataclass=is_dataclass)
-        functions, classes = Instance.get_functions_and_classes(body)
+        functions, classes = Instance.get_functions_and_classes(body, prefix=f"{qualname}.")
 
         return Class(
             name=name,
+            qualname=qualname,
             is_dataclass=is_dataclass,
             inherits_from=inherits_from,
             attributes=attributes,
@@ -151,9 +189,9 @@ class Class(Instance):
     def get_inheritance(cls, class_def: ast.ClassDef) -> list[str]:
         inherits_from = []
         for base in class_def.bases:
-            if isinstance(base, ast.Name):
-                inherits_from.append(base.id)
-        # TODO: how are we going to handle import issues like renaming: import x as y?
+            # names like models.Base are kept dotted, the symbol table resolves them including import aliases
+            if name := get_dotted_name(base):
+                inherits_from.append(name)
         return inherits_from
 
     @classmethod
@@ -193,7 +231,7 @@ class Class(Instance):
                         break
 
             if init_method is None:
-                logger.error(f"Class {class_def.name} does not have an __init__ method.")
+                report(MISSING_INIT, "Class %s does not have an __init__ method.", class_def.name, node=class_def)
                 return attributes, body
 
             general_assign_visitor = OuterAssignVisitor(class_name=class_def.name)
@@ -217,27 +255,40 @@ class Class(Instance):
         return f"{name}: \n {inheritance}; \n {attributes}; \n {functions}"
 
     def typescript(self) -> str:
-        string_repr = f"interface {self.name} "
+        return "".join(self.iter_typescript())
 
-        if len(self.inherits_from) >= 1:
-            string_repr += "extends "
-            for inheritance in self.inherits_from:
-                string_repr += f"{inheritance}, "
+    def iter_typescript(self, export: bool = False) -> Iterator[str]:
+        yield f"export interface {self.name} " if export else f"interface {self.name} "
 
-            # remove last character (the comma)
-            string_repr = string_repr[:-2]
+        if len(self.inherits_from) >= 1:
+            # TypeScript interfaces are not namespaced, hence only the last part of dotted names is used
+            yield f"extends {', '.join(base.rpartition('.')[2] for base in self.inherits_from)} "
 
-        string_repr += "{ \n"
+        yield "{ \n"
 
-        for attribute in self.attributes.attributes:
-            string_repr += f"{attribute.get_string(supported_type=SupportedTypes.ts)}; \n"
+        for attribute in self.attributes:
+            yield f"{attribute.get_string(supported_type=SupportedTypes.ts)}; \n"
 
         for func in self.functions:
-            string_repr += f"{func.get_string(supported_type=SupportedTypes.ts)} \n"
+            yield f"{func.get_string(supported_type=SupportedTypes.ts)} \n"
 
-        string_repr += "}\n"
+        yield "}\n"
 
-        return string_repr
+    @property
+    def full_name(self) -> str:
+        """Module qualified name, e.g. models.person.Person, the qualname as long as the module is unknown."""
+        return f"{self.module}.{self.qualname}" if self.module else self.qualname
 
     def dot(self) -> str:
-        return self.__str__()
+        return "".join(self.iter_dot())
+
+    def iter_dot(self) -> Iterator[str]:
+        """Yield a record node with the name, the attributes and the functions, edges are added by the DotWriter."""
+        header = f"«dataclass» {self.name}" if self.is_dataclass else self.name
+        yield f'{escape_dot_id(self.full_name)} [label="{{{escape_dot_record(header)}|'
+        for attribute in self.attributes:
+            yield f"{escape_dot_record(str(attribute))}\\l"
+        yield "|"
+        for func in self.functions:
+            yield f"{escape_dot_record(func.dot())}\\l"
+        yield '}"];\n'
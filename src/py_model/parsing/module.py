@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import ast
+import sys
+
+from py_model.diagnostics import Diagnostic
+
+from .container_classes import Class
+
+
+class Import:
+    """A name bound by an import statement, e.g. `from ..a import B as C` binds C to B of module a (level 2)."""
+
+    __slots__ = ("alias", "module", "name", "level")
+
+    def __init__(self, alias: str, module: str, name: str | None = None, level: int = 0) -> None:
+        self.alias = sys.intern(alias)
+        self.module = sys.intern(module)
+        self.name = None if name is None else sys.intern(name)
+        self.level = level
+
+    @classmethod
+    def from_ast(cls, node: ast.Import | ast.ImportFrom) -> list[Import]:
+        imports = []
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    # import a.b as c: binds c to a.b
+                    imports.append(cls(alias=alias.asname, module=alias.name))
+                else:
+                    # import a.b: binds a
+                    top_level = alias.name.split(".")[0]
+                    imports.append(cls(alias=top_level, module=top_level))
+        else:
+            for alias in node.names:
+                imports.append(
+                    cls(alias=alias.asname or alias.name, module=node.module or "", name=alias.name, level=node.level)
+                )
+        return imports
+
+    def get_target(self, importing_package: str) -> str:
+        """Absolute dotted name the alias refers to, relative imports are resolved against importing_package."""
+        module = self.module
+        if self.level > 0:
+            parts = importing_package.split(".") if importing_package else []
+            parts = parts[: len(parts) - self.level + 1]
+            module = ".".join(part for part in [*parts, self.module] if part)
+
+        if self.name is None:
+            return module
+        return f"{module}.{self.name}" if module else self.name
+
+    def __eq__(self, other):
+        if not isinstance(other, Import):
+            return NotImplemented
+        return (self.alias, self.module, self.name, self.level) == (other.alias, other.module, other.name, other.level)
+
+    def __repr__(self) -> str:
+        return f"Import(alias={self.alias!r}, module={self.module!r}, name={self.name!r}, level={self.level})"
+
+
+class Module:
+    """The classes and imports of a single file."""
+
+    __slots__ = ("name", "filepath", "is_package", "classes", "imports", "diagnostics")
+
+    def __init__(
+        self,
+        filepath: str,
+        classes: list[Class],
+        imports: list[Import],
+        name: str | None = None,
+        diagnostics: list[Diagnostic] | None = None,
+    ) -> None:
+        self.filepath = filepath
+        self.is_package = filepath.endswith("__init__.py")
+        self.classes = classes
+        self.imports = imports
+        # warnings of parsing the file, stored with the module such that cached and parallel runs report them as well
+        self.diagnostics = diagnostics or []
+        self.name = ""
+        if name is not None:
+            self.set_name(name)
+
+    def set_name(self, name: str) -> None:
+        """Set the dotted module name, also on all classes of the module."""
+        self.name = sys.intern(name)
+        for cls in self.classes:
+            cls.module = self.name
+
+    @property
+    def package(self) -> str:
+        """Package relative imports of this module are resolved against."""
+        if self.is_package:
+            return self.name
+        return self.name.rpartition(".")[0]
+
+    def __repr__(self) -> str:
+        return f"Module(name={self.name!r}, classes={[cls.qualname for cls in self.classes]})"
@@ -2,4 +2,4 @@ from .typehintablevalue import TypeHintableValue
 
 
 class Parameter(TypeHintableValue):
-    pass
+    __slots__ = ()
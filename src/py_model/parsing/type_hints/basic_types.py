@@ -1,15 +1,92 @@
 from __future__ import annotations
 
+import sys
+import weakref
+from abc import ABCMeta
+from collections.abc import Iterator
 from typing import Any
 
 from py_model.parsing import BuildingBlock
+from py_model.writing import SupportedTypes
 
+# all type hints in use, keyed by their structure. A type hint is dropped once nothing refers to it anymore, such that
+# streaming many files does not accumulate the type hints of classes written long ago. Keys with the id of a nested
+# type hint stay valid, since a registered type hint keeps its arguments alive.
+REGISTRY: weakref.WeakValueDictionary[tuple, TypeHint] = weakref.WeakValueDictionary()
+
+
+def get_key(value: Any) -> Any:
+    """Part of the registry key for a constructor argument, nested type hints are interned already (identity)."""
+    if isinstance(value, TypeHint):
+        return id(value)
+    elif isinstance(value, (list, tuple)):
+        return tuple(get_key(item) for item in value)
+    return value
+
+
+class InternedMeta(ABCMeta):
+    """Creates every type hint only once per structure: equal type hints are the very same immutable instance.
+
+    Type hints without arguments are looked up before creating them at all, others are created and replaced by the
+    registered instance if one with the same structure exists.
+    """
+
+    def __call__(cls, *args, **kwargs):
+        if not (args or kwargs):
+            if (instance := REGISTRY.get((cls,))) is not None:
+                return instance
+
+        instance = super().__call__(*args, **kwargs)
+        key = (cls, *get_key(instance.get_arguments()))
+        if (registered := REGISTRY.get(key)) is not None:
+            return registered
+
+        object.__setattr__(instance, "_renderings", {})
+        object.__setattr__(instance, "_frozen", True)
+        return REGISTRY.setdefault(key, instance)
+
+
+class TypeHint(BuildingBlock, metaclass=InternedMeta):
+    __slots__ = ("_renderings", "_frozen", "__weakref__")
+
+    def get_arguments(self) -> tuple:
+        """Arguments to create an equal type hint, used for interning, equality and pickling."""
+        return ()
+
+    def iter_custom_classes(self) -> Iterator[CustomClass]:
+        """Yield all custom classes this type hint consists of, e.g. A and B for `list[A] | B`."""
+        for argument in self.get_arguments():
+            for type_hint in argument if isinstance(argument, tuple) else (argument,):
+                if isinstance(type_hint, TypeHint):
+                    yield from type_hint.iter_custom_classes()
+
+    def get_string(self, supported_type: SupportedTypes) -> str:
+        # type hints are immutable, hence the rendering can be memoized per supported type
+        try:
+            return self._renderings[supported_type]
+        except KeyError:
+            rendering = super().get_string(supported_type=supported_type)
+            self._renderings[supported_type] = rendering
+            return rendering
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if getattr(self, "_frozen", False):
+            raise AttributeError(f"{self.__class__.__name__} is immutable.")
+        super().__setattr__(name, value)
+
+    def __reduce__(self):
+        # recreate through the constructor, such that unpickled type hints are interned as well
+        return (self.__class__, self.get_arguments())
 
-class TypeHint(BuildingBlock):
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, TypeHint):
             return NotImplemented
-        return self.__class__ is other.__class__
+        return (self is other) or (
+            (self.__class__ is other.__class__) and (self.get_arguments() == other.get_arguments())
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.__class__, self.get_arguments()))
 
     def __repr__(self) -> str:
         # for debugging
@@ -23,19 +100,28 @@ class TypeHint(BuildingBlock):
 
 
 class CustomClass(TypeHint):
+    __slots__ = ("name",)
+
     def __init__(self, name: str) -> None:
-        self.name = name
+        self.name = sys.intern(name)
+
+    def get_arguments(self) -> tuple:
+        return (self.name,)
+
+    def iter_custom_classes(self) -> Iterator[CustomClass]:
+        yield self
 
     def __str__(self) -> str:
         return self.name
 
-    def __eq__(self, other: Any):
-        if not isinstance(other, CustomClass):
-            return NotImplemented
-        return self.name == other.name
+    def typescript(self) -> str:
+        # TypeScript interfaces are not namespaced, hence only the last part of dotted names is used
+        return self.name.rpartition(".")[2]
 
 
 class Undefined(TypeHint):
+    __slots__ = ()
+
     def __str__(self) -> str:
         return ""
 
@@ -44,6 +130,8 @@ class Undefined(TypeHint):
 
 
 class NoneType(TypeHint):
+    __slots__ = ()
+
     def __str__(self) -> str:
         return "None"
 
@@ -52,6 +140,8 @@ class NoneType(TypeHint):
 
 
 class Boolean(TypeHint):
+    __slots__ = ()
+
     def __str__(self) -> str:
         return "bool"
 
@@ -60,6 +150,8 @@ class Boolean(TypeHint):
 
 
 class Integer(TypeHint):
+    __slots__ = ()
+
     def __str__(self) -> str:
         return "int"
 
@@ -68,6 +160,8 @@ class Integer(TypeHint):
 
 
 class Float(TypeHint):
+    __slots__ = ()
+
     def __str__(self) -> str:
         return "float"
 
@@ -76,5 +170,7 @@ class Float(TypeHint):
 
 
 class String(TypeHint):
+    __slots__ = ()
+
     def __str__(self) -> str:
         return "string"
@@ -1,4 +1,5 @@
 from py_model.parsing import BuildingBlock
+from py_model.writing import SupportedTypes
 
 from .basic_types import TypeHint
 
@@ -6,8 +7,10 @@ from .basic_types import TypeHint
 class SingleContainer(TypeHint, BuildingBlock):
     """A container that can hold a single dtype"""
 
+    __slots__ = ("dtype",)
+
     def __init__(self, dtype: list[TypeHint] | TypeHint | None = None) -> None:
-        if isinstance(dtype, list):
+        if isinstance(dtype, (list, tuple)):
             if len(dtype) != 1:
                 raise ValueError("SingleContainer must have exactly one type hint (or None)")
             else:
@@ -15,6 +18,9 @@ class SingleContainer(TypeHint, BuildingBlock):
         else:
             self.dtype = dtype
 
+    def get_arguments(self) -> tuple:
+        return (self.dtype,)
+
     def __str__(self) -> str:
         container = self.__class__.__name__.lower()
         if self.dtype is None:
@@ -26,11 +32,16 @@ class SingleContainer(TypeHint, BuildingBlock):
 class DoubleContainer(TypeHint, BuildingBlock):
     """ "can excatlly hold two dtypes"""
 
+    __slots__ = ("dtypes",)
+
     def __init__(self, dtypes: list[TypeHint] | None = None) -> None:
         if (dtypes is not None) and (len(dtypes) != 2):
             raise ValueError("DoubleContainer must have exactly two type hints (or None)")
 
-        self.dtypes = dtypes
+        self.dtypes = None if dtypes is None else tuple(dtypes)
+
+    def get_arguments(self) -> tuple:
+        return (self.dtypes,)
 
     def __str__(self) -> str:
         container = self.__class__.__name__.lower()
@@ -43,8 +54,13 @@ class DoubleContainer(TypeHint, BuildingBlock):
 class MultipleContainer(TypeHint, BuildingBlock):
     """Can hold many dtypes"""
 
+    __slots__ = ("dtypes",)
+
     def __init__(self, dtypes: list[TypeHint] | None = None) -> None:
-        self.dtypes = dtypes
+        self.dtypes = None if dtypes is None else tuple(dtypes)
+
+    def get_arguments(self) -> tuple:
+        return (self.dtypes,)
 
     def __str__(self) -> str:
         container = self.__class__.__name__.lower()
@@ -55,45 +71,59 @@ class MultipleContainer(TypeHint, BuildingBlock):
 
 
 class Tuple(MultipleContainer):
+    __slots__ = ()
+
     def typescript(self) -> str:
         if self.dtypes is None:
             raise ValueError("Tuple must have at least one type hint for conversion to Typescript.")
         else:
-            return f"[{', '.join(dtype.typescript() for dtype in self.dtypes)}]"
+            return f"[{', '.join(dtype.get_string(supported_type=SupportedTypes.ts) for dtype in self.dtypes)}]"
 
 
 class List(SingleContainer):
+    __slots__ = ()
+
     def typescript(self) -> str:
         if self.dtype is None:
             raise ValueError("List must have at least one type hint for conversion to Typescript.")
         else:
-            return f"Array<{self.dtype.typescript()}>"
+            return f"Array<{self.dtype.get_string(supported_type=SupportedTypes.ts)}>"
 
 
 class Dict(DoubleContainer):
+    __slots__ = ()
+
     def typescript(self) -> str:
         if self.dtypes is None:
             raise ValueError("Dict must have type hints for conversion to Typescript.")
         else:
-            return f"Map<{self.dtypes[0].typescript()}, {self.dtypes[1].typescript()}>"
+            key, value = (dtype.get_string(supported_type=SupportedTypes.ts) for dtype in self.dtypes)
+            return f"Map<{key}, {value}>"
 
 
 class Set(SingleContainer):
+    __slots__ = ()
+
     def typescript(self) -> str:
         if self.dtype is None:
             raise ValueError("Set must have type hints for conversion to Typescript.")
         else:
-            return f"Set<{self.dtype.typescript()}>"
+            return f"Set<{self.dtype.get_string(supported_type=SupportedTypes.ts)}>"
 
 
 class Union(TypeHint):
     """A class that represents a union of data types."""
 
+    __slots__ = ("dtypes",)
+
     def __init__(self, dtypes: list[TypeHint]) -> None:
         if (dtypes is None) or (len(dtypes) < 2):
             raise ValueError("Union must have at least two type hints.")
 
-        self.dtypes = dtypes
+        self.dtypes = tuple(dtypes)
+
+    def get_arguments(self) -> tuple:
+        return (self.dtypes,)
 
     def __str__(self) -> str:
         return f"{' | '.join(str(dtype) for dtype in self.dtypes)}"
@@ -1,3 +1,5 @@
+import sys
+
 from py_model.parsing import BuildingBlock
 from py_model.writing import SupportedTypes
 
@@ -7,8 +9,10 @@ from .type_hints.basic_types import TypeHint, Undefined
 class TypeHintableValue(BuildingBlock):
     """A class that can be used to represent a value that has a type hint, like an attribute or a parameter."""
 
+    __slots__ = ("name", "dtype")
+
     def __init__(self, name: str, dtype: TypeHint) -> None:
-        self.name = name
+        self.name = sys.intern(name)
         self.dtype = dtype
 
     def dot(self) -> str:
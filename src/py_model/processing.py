@@ -0,0 +1,418 @@
+import hashlib
+import io
+import json
+import logging
+import os
+import posixpath
+import sys
+from ast import Module as AstModule
+from collections.abc import Iterable, Iterator
+from contextlib import ExitStack
+
+from py_model.cache import ParseCache
+from py_model.defaults import DEFAULT_READ_AHEAD, DEFAULT_READ_THREADS
+from py_model.diagnostics import collect
+from py_model.navigation import (
+    get_module_name,
+    iter_class_definitions,
+    iter_imports,
+    iter_sources,
+    parse_source,
+    read_source,
+)
+from py_model.parsing import Class, Import, Module
+from py_model.profiling import Profiler
+from py_model.symbols import SymbolTable
+from py_model.writing import SupportedTypes, TextWriter, Writer
+from py_model.writing.writer import BUFFER_SIZE
+
+logger = logging.getLogger(__name__)
+
+# hashes of the files of a split output, to skip unchanged files and to remove files of deleted modules
+MANIFEST_FILE = ".py_model_manifest.json"
+
+
+def parse_module(filepath: str, source: bytes | None = None) -> Module:
+    """Parse a single file and build the models of its imports and all its classes, including nested ones.
+
+    The returned module does not reference the ast anymore, hence it is cheap to pickle and can be sent back from a
+    worker process or stored in the cache as it is. The module name depends on the location of the file rather than
+    its content, it is set by parse_modules.
+    """
+    return build_module(filepath, tree=parse_source(filepath, source=source))
+
+
+def build_module(filepath: str, tree: AstModule | None) -> Module:
+    """Build the models of the imports and classes of a parsed file, see parse_module."""
+    if tree is None:
+        return Module(filepath=filepath, classes=[], imports=[])
+
+    class_instances = []
+    with collect(filepath) as diagnostics:
+        for qualname, class_def in iter_class_definitions(tree.body):
+            class_instance = Class.from_ast(class_def, qualname=qualname)
+            # nested classes are built together with their enclosing class, list them right after it
+            class_instances.append(class_instance)
+            class_instances.extend(class_instance.iter_classes())
+
+    imports = [imported for node in iter_imports(tree.body) for imported in Import.from_ast(node)]
+
+    return Module(filepath=filepath, classes=class_instances, imports=imports, diagnostics=diagnostics.records)
+
+
+def parse_file(filepath: str, source: bytes | None = None) -> list[Class]:
+    """Parse a single file and build the models of all its classes, including nested ones."""
+    return parse_module(filepath, source=source).classes
+
+
+def parse_module_profiled(filepath: str, source: bytes | None, profiler: Profiler) -> Module:
+    """Parse a single file like parse_module, measuring reading, parsing and building the models separately."""
+    with profiler.file(filepath) as measurement:
+        with profiler.step(measurement, "read"):
+            if source is None:
+                source = read_source(filepath)
+        with profiler.step(measurement, "parse"):
+            tree = parse_source(filepath, source=source)
+        with profiler.step(measurement, "build"):
+            return build_module(filepath, tree=tree)
+
+
+def get_number_of_jobs(jobs: int) -> int:
+    """Resolve the requested number of jobs, where 0 (or less) means all available cores."""
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def parse_modules(
+    filepaths: Iterable[str],
+    jobs: int = 1,
+    cache: ParseCache | None = None,
+    profiler: Profiler | None = None,
+    read_threads: int = DEFAULT_READ_THREADS,
+    read_ahead: int = DEFAULT_READ_AHEAD,
+) -> list[Module]:
+    """Parse the given files and return their modules in the order of the sorted file paths.
+
+    Args:
+        filepaths (Iterable[str]): paths of the files to parse
+        jobs (int, optional): number of worker processes, 0 uses all available cores. Defaults to 1.
+        cache (ParseCache | None, optional): cache to skip parsing of unchanged files. Defaults to None.
+        profiler (Profiler | None, optional): measures every parsed file, files are then parsed in this process.
+            Defaults to None.
+        read_threads (int, optional): threads reading the next files while this process parses, see iter_sources.
+            Worker processes read their files themselves. Defaults to DEFAULT_READ_THREADS.
+        read_ahead (int, optional): maximum number of files read but not parsed yet. Defaults to DEFAULT_READ_AHEAD.
+
+    Returns:
+        list[Module]: modules of all files, deterministic regardless of the number of jobs
+    """
+    filepaths = sorted(filepaths)
+    results: dict[str, Module] = {}
+
+    # look up the files in the cache, only the misses have to be parsed
+    keys: dict[str, str] = {}
+    sources: dict[str, bytes] = {}
+    if cache is not None:
+        for filepath, source in iter_sources(filepaths, threads=read_threads, read_ahead=read_ahead):
+            key = cache.get_key(filepath, source)
+            module = cache.get(key)
+            if module is None:
+                keys[filepath] = key
+                sources[filepath] = source
+            else:
+                results[filepath] = module
+        logger.info(f"Parse cache: {cache.hits} hits, {cache.misses} misses.")
+
+    missing = [filepath for filepath in filepaths if filepath not in results]
+    jobs = min(get_number_of_jobs(jobs), len(missing))
+
+    if profiler is not None:
+        if jobs > 1:
+            logger.info("Parsing in a single process to measure every file.")
+        for filepath in missing:
+            results[filepath] = parse_module_profiled(filepath, source=sources.get(filepath), profiler=profiler)
+    elif jobs <= 1:
+        # the cache misses were read for their keys already, otherwise the files are read ahead while parsing
+        if cache is not None:
+            loaded = ((filepath, sources[filepath]) for filepath in missing)
+        else:
+            loaded = iter_sources(missing, threads=read_threads, read_ahead=read_ahead)
+        for filepath, source in loaded:
+            results[filepath] = parse_module(filepath, source=source)
+    else:
+        # hand out several files per task to keep the pickling overhead low, executor.map keeps the order
+        chunksize = max(1, len(missing) // (jobs * 4))
+        logger.info(f"Parsing {len(missing)} files with {jobs} processes (chunksize {chunksize}).")
+
+        # multiprocessing is slow to import, only import it when it is needed
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for filepath, module in zip(missing, executor.map(parse_module, missing, chunksize=chunksize)):
+                results[filepath] = module
+
+    if cache is not None:
+        for filepath in missing:
+            cache.put(keys[filepath], results[filepath])
+        cache.evict()
+
+    modules = []
+    for filepath in filepaths:
+        module = results[filepath]
+        module.filepath = filepath
+        module.set_name(get_module_name(filepath))
+        modules.append(module)
+
+    return modules
+
+
+def iter_modules(
+    filepaths: Iterable[str],
+    cache: ParseCache | None = None,
+    read_threads: int = DEFAULT_READ_THREADS,
+    read_ahead: int = DEFAULT_READ_AHEAD,
+) -> Iterator[Module]:
+    """Parse the given files one after another and yield their modules in the order of the sorted file paths.
+
+    Unlike parse_modules, a module is yielded as soon as its file is parsed and no reference to it is kept, hence the
+    memory does not grow with the number of files if the caller drops the modules as well.
+    """
+    for filepath, source in iter_sources(sorted(filepaths), threads=read_threads, read_ahead=read_ahead):
+        module = None
+        if cache is not None:
+            key = cache.get_key(filepath, source)
+            module = cache.get(key)
+        if module is None:
+            module = parse_module(filepath, source=source)
+            if cache is not None:
+                cache.put(key, module)
+
+        module.filepath = filepath
+        module.set_name(get_module_name(filepath))
+        yield module
+
+    if cache is not None:
+        logger.info(f"Parse cache: {cache.hits} hits, {cache.misses} misses.")
+        cache.evict()
+
+
+def parse_files(filepaths: Iterable[str], jobs: int = 1, cache: ParseCache | None = None) -> list[Class]:
+    """Parse the given files and return their classes in the order of the sorted file paths, see parse_modules."""
+    return [cls for module in parse_modules(filepaths, jobs=jobs, cache=cache) for cls in module.classes]
+
+
+def write_output(
+    class_instances: Iterable[Class], output_file: str | None = None, symbols: SymbolTable | None = None
+) -> None:
+    """Write the classes in the format given by the extension of output_file, print them if no file is given.
+
+    The symbol table resolves the references between the classes, e.g. for the edges of graphs.
+    """
+    if output_file is None:
+        TextWriter().write(blocks=class_instances, stream=sys.stdout)
+    else:
+        supported_type = SupportedTypes.from_path(output_file)
+        supported_type.writer.write_file(blocks=class_instances, file_path=output_file, symbols=symbols)
+
+
+def prepare_output_files(output_files: list[str], cache_directory: str | None = None) -> None:
+    """Check the output files and set up their writers, such that unsupported or repeated ones fail before parsing.
+
+    Writers that can reuse work of earlier runs store it within cache_directory, if given.
+    """
+    for output_file in output_files:
+        writer = SupportedTypes.from_path(output_file).writer
+        writer.check()
+        writer.cache_directory = cache_directory
+    if len(set(output_files)) != len(output_files):
+        raise ValueError(f"Output files are given more than once: {output_files}")
+
+
+def write_outputs(
+    class_instances: Iterable[Class],
+    output_files: list[str],
+    parallel: bool = False,
+    symbols: SymbolTable | None = None,
+) -> None:
+    """Write the same classes to every output file, print them if no file is given.
+
+    Args:
+        class_instances (Iterable[Class]): classes to write, iterated once per output file, hence an iterator can
+            only be passed for a single output file
+        output_files (list[str]): output files, their extension determines the format
+        parallel (bool, optional): write the files concurrently with one thread per file. Defaults to False.
+        symbols (SymbolTable | None, optional): symbol table of the parsed modules, resolves the references between
+            the classes including imported names. Writers build one of the written classes if None. Defaults to None.
+    """
+    if not output_files:
+        write_output(class_instances)
+    elif parallel and (len(output_files) > 1):
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=len(output_files)) as executor:
+            futures = [
+                executor.submit(write_output, class_instances, output_file, symbols) for output_file in output_files
+            ]
+            for future in futures:
+                # re-raise the first error of a writer
+                future.result()
+    else:
+        for output_file in output_files:
+            write_output(class_instances, output_file=output_file, symbols=symbols)
+
+
+def prepare_stream_outputs(output_files: list[str]) -> None:
+    """Check that the output files can be streamed, i.e. their writers need no other classes to render a class."""
+    for output_file in output_files:
+        supported_type = SupportedTypes.from_path(output_file)
+        if not supported_type.writer.supports_stream:
+            raise ValueError(f"Output type {supported_type.name} needs all classes at once and can not be streamed.")
+
+
+def stream_outputs(class_instances: Iterable[Class], output_files: list[str], ir_file: str | None = None) -> int:
+    """Write every class to all output files as soon as it is available, print them if no file is given.
+
+    Unlike write_outputs, the classes are iterated only once and no class is kept after it was written, see
+    prepare_stream_outputs for the supported output files.
+
+    Args:
+        class_instances (Iterable[Class]): classes to write, e.g. of modules yielded by iter_modules
+        output_files (list[str]): output files, their extension determines the format
+        ir_file (str | None, optional): also write the classes as IR to this file, see py_model.ir. Defaults to None.
+
+    Returns:
+        int: number of written classes
+    """
+    with ExitStack() as stack:
+        targets: list[tuple[Writer, object]] = []
+        for output_file in output_files:
+            file = stack.enter_context(open(output_file, "w", buffering=BUFFER_SIZE))
+            targets.append((SupportedTypes.from_path(output_file).writer, file))
+        if ir_file is not None:
+            from py_model.ir import IrWriter
+
+            targets.append((IrWriter(), stack.enter_context(open(ir_file, "w", buffering=BUFFER_SIZE))))
+        if not targets:
+            targets.append((TextWriter(), sys.stdout))
+
+        for writer, stream in targets:
+            stream.writelines(writer.header())
+        count = 0
+        for cls in class_instances:
+            for writer, stream in targets:
+                stream.writelines(writer.render(cls))
+            count += 1
+        for writer, stream in targets:
+            stream.writelines(writer.footer())
+
+    return count
+
+
+def prepare_split_output(output_type: str) -> SupportedTypes:
+    """Get the type of a split output, such that an unsupported one fails before parsing."""
+    try:
+        supported_type = SupportedTypes[output_type.removeprefix(".")]
+    except KeyError as error:
+        raise ValueError(f"Unsupported output file type: {output_type}") from error
+    if not supported_type.writer.supports_split:
+        raise ValueError(f"Output type {supported_type.name} can not be split into one file per module.")
+    return supported_type
+
+
+def get_split_path(module_name: str, supported_type: SupportedTypes) -> str:
+    """Path of the file of a module within a split output, e.g. models/person.ts for models.person."""
+    return f"{module_name.replace('.', '/')}.{supported_type.name}"
+
+
+def get_module_imports(module: Module, symbols: SymbolTable) -> dict[str, list[tuple[str, str]]]:
+    """Classes of other modules the classes of module refer to, see Writer.write_module.
+
+    The names are written as in the source, hence a class imported under an alias is imported under that alias.
+    """
+    directory = posixpath.dirname(module.name.replace(".", "/")) or "."
+    imports: dict[str, set[tuple[str, str]]] = {}
+    for cls in module.classes:
+        for name in symbols.iter_references(cls):
+            target = symbols.resolve(name, module=module.name)
+            if (target is None) or (target.module == module.name):
+                continue
+            path = posixpath.relpath(target.module.replace(".", "/"), directory)
+            if not path.startswith("."):
+                path = f"./{path}"
+            imports.setdefault(path, set()).add((target.name, name.rpartition(".")[2]))
+    return {path: sorted(names) for path, names in sorted(imports.items())}
+
+
+def write_split_output(
+    modules: list[Module],
+    symbols: SymbolTable,
+    directory: str,
+    supported_type: SupportedTypes,
+    parallel: bool = True,
+) -> int:
+    """Write one file per module into directory, including the imports of the classes of other modules.
+
+    Files whose content hash did not change since the previous run are not written again and keep their modification
+    time, files of modules that do not exist anymore are removed.
+
+    Args:
+        modules (list[Module]): modules to write, modules without classes do not get a file
+        symbols (SymbolTable): resolves the classes referred to by the classes of the modules
+        directory (str): root directory of the split output
+        supported_type (SupportedTypes): type of the files, see prepare_split_output
+        parallel (bool, optional): render and write the files concurrently. Defaults to True.
+
+    Returns:
+        int: number of written files
+    """
+    writer = supported_type.writer
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    try:
+        with open(manifest_path) as file:
+            previous: dict[str, str] = json.load(file)
+    except (OSError, ValueError):
+        previous = {}
+
+    def emit(module: Module) -> tuple[str, str, bool]:
+        split_path = get_split_path(module.name, supported_type)
+        stream = io.StringIO()
+        writer.write_module(blocks=module.classes, imports=get_module_imports(module, symbols), stream=stream)
+        content = stream.getvalue().encode()
+        digest = hashlib.sha256(content).hexdigest()
+
+        path = os.path.join(directory, split_path)
+        if (previous.get(split_path) == digest) and os.path.exists(path):
+            return split_path, digest, False
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(content)
+        os.replace(tmp_path, path)
+        return split_path, digest, True
+
+    modules = [module for module in modules if module.classes]
+    if parallel and (len(modules) > 1):
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor() as executor:
+            results = list(executor.map(emit, modules))
+    else:
+        results = [emit(module) for module in modules]
+
+    manifest = {split_path: digest for split_path, digest, _ in results}
+    stale = sorted(previous.keys() - manifest.keys())
+    for split_path in stale:
+        try:
+            os.remove(os.path.join(directory, split_path))
+        except FileNotFoundError:
+            pass
+
+    os.makedirs(directory, exist_ok=True)
+    with open(manifest_path, "w") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+
+    written = sum(changed for _, _, changed in results)
+    logger.info(f"Split output: wrote {written} of {len(results)} files, removed {len(stale)} stale files.")
+    return written
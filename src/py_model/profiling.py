@@ -0,0 +1,131 @@
+import cProfile
+import json
+import logging
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+
+from py_model.defaults import DEFAULT_SLOWEST_FILES
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Measurement:
+    wall: float = 0.0  # seconds
+    cpu: float = 0.0  # seconds of this process
+    peak_memory: int = 0  # bytes traced by tracemalloc
+
+
+@dataclass
+class FileMeasurement(Measurement):
+    path: str = ""
+    # wall time of the steps of parsing a file, e.g. read, parse and build
+    steps: dict[str, float] = field(default_factory=dict)
+
+
+class Profiler:
+    """Records wall time, CPU time and peak memory of the phases of a run and of every parsed file.
+
+    Memory is traced with tracemalloc, which slows down the run noticeably, hence profiles are only comparable with
+    other profiles. If stats_file is given, the whole run is additionally profiled with cProfile and the stats are
+    dumped there (open them with pstats or snakeviz).
+    """
+
+    def __init__(self, stats_file: str | None = None, slowest_files: int = DEFAULT_SLOWEST_FILES) -> None:
+        self.stats_file = stats_file
+        self.slowest_files = slowest_files
+        self.phases: dict[str, Measurement] = {}
+        self.files: list[FileMeasurement] = []
+        self._nested_peak = 0
+        self._profile = cProfile.Profile() if stats_file else None
+
+    def start(self) -> None:
+        tracemalloc.start()
+        if self._profile is not None:
+            self._profile.enable()
+
+    def stop(self) -> None:
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile.dump_stats(self.stats_file)
+            logger.info(f"Wrote cProfile stats to {self.stats_file}.")
+        tracemalloc.stop()
+
+    @contextmanager
+    def _measure(self, measurement: Measurement) -> Iterator[Measurement]:
+        tracemalloc.reset_peak()
+        self._nested_peak = 0
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield measurement
+        finally:
+            measurement.wall += time.perf_counter() - wall
+            measurement.cpu += time.process_time() - cpu
+            peak = max(tracemalloc.get_traced_memory()[1], self._nested_peak)
+            measurement.peak_memory = max(measurement.peak_memory, peak)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[Measurement]:
+        """Measure a phase of the run, measuring the same phase again adds up the times."""
+        with self._measure(self.phases.setdefault(name, Measurement())) as measurement:
+            yield measurement
+
+    @contextmanager
+    def file(self, path: str) -> Iterator[FileMeasurement]:
+        """Measure parsing a single file, must be used within a phase."""
+        outer_peak = max(tracemalloc.get_traced_memory()[1], self._nested_peak)
+        measurement = FileMeasurement(path=path)
+        try:
+            with self._measure(measurement):
+                yield measurement
+        finally:
+            self.files.append(measurement)
+            # resetting the peak for the file must not hide the peak of the enclosing phase
+            self._nested_peak = max(outer_peak, measurement.peak_memory)
+
+    @staticmethod
+    @contextmanager
+    def step(measurement: FileMeasurement, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            measurement.steps[name] = measurement.steps.get(name, 0.0) + time.perf_counter() - start
+
+    def get_report(self) -> dict:
+        steps: dict[str, float] = {}
+        for measurement in self.files:
+            for name, elapsed in measurement.steps.items():
+                steps[name] = steps.get(name, 0.0) + elapsed
+
+        slowest = sorted(self.files, key=lambda measurement: measurement.wall, reverse=True)[: self.slowest_files]
+        return {
+            "phases": {name: asdict(measurement) for name, measurement in self.phases.items()},
+            "steps": steps,
+            "slowest_files": [asdict(measurement) for measurement in slowest],
+            "files": [asdict(measurement) for measurement in self.files],
+        }
+
+    def write_report(self, report_file: str) -> None:
+        report = self.get_report()
+        with open(report_file, "w") as file:
+            json.dump(report, file, indent=2)
+
+        for name, measurement in report["phases"].items():
+            logger.info(
+                f"Phase {name}: wall {measurement['wall']:.3f}s, cpu {measurement['cpu']:.3f}s, "
+                f"peak memory {measurement['peak_memory'] / 1024**2:.1f}MiB"
+            )
+        for measurement in report["slowest_files"]:
+            logger.info(f"Slow file {measurement['path']}: {measurement['wall']:.3f}s")
+        logger.info(f"Wrote profile to {report_file}.")
+
+
+def profile_phase(profiler: Profiler | None, name: str) -> AbstractContextManager:
+    """Measure a phase if a profiler is given, otherwise do nothing."""
+    if profiler is None:
+        return nullcontext()
+    return profiler.phase(name)
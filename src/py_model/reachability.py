@@ -0,0 +1,130 @@
+import logging
+import re
+from collections import deque
+from collections.abc import Iterable
+
+from py_model.cache import ParseCache
+from py_model.navigation import get_module_name, read_source
+from py_model.parsing import Class, Module
+from py_model.processing import parse_modules
+from py_model.symbols import SymbolTable
+
+logger = logging.getLogger(__name__)
+
+# class definitions found by a text search, may include some in strings or comments, which only costs a parse
+CLASS_PATTERN = re.compile(rb"^[ \t]*class[ \t]+(\w+)", re.MULTILINE)
+
+
+def index_class_names(filepaths: Iterable[str]) -> dict[str, list[str]]:
+    """Files by the names of the classes they may define, found without parsing them."""
+    files_by_class: dict[str, list[str]] = {}
+    for filepath in filepaths:
+        for name in set(CLASS_PATTERN.findall(read_source(filepath))):
+            files_by_class.setdefault(name.decode(), []).append(filepath)
+    return files_by_class
+
+
+class ReachableModels:
+    """Parses only the files needed for the classes reachable from some root classes.
+
+    A class is reachable if it is a root or referred to by a reachable class through its bases or the custom classes
+    of its attributes, parameters and return types. Before a name is resolved, the files that may define it are
+    parsed: the files defining a class of that name (found by a text search) and the modules it is imported from.
+    Hence the names are resolved exactly as if all files were parsed.
+    """
+
+    def __init__(self, filepaths: Iterable[str], jobs: int = 1, cache: ParseCache | None = None) -> None:
+        self.filepaths = sorted(filepaths)
+        self.jobs = jobs
+        self.cache = cache
+
+        self.files_by_class = index_class_names(self.filepaths)
+        self.files_by_module = {get_module_name(filepath): filepath for filepath in self.filepaths}
+        self.symbols = SymbolTable([])
+        self.parsed: dict[str, Module] = {}
+
+    def load(self, filepaths: Iterable[str]) -> None:
+        missing = sorted(set(filepaths) - self.parsed.keys())
+        if not missing:
+            return
+        for module in parse_modules(missing, jobs=self.jobs, cache=self.cache):
+            self.parsed[module.filepath] = module
+            self.symbols.add_module(module)
+
+    def get_candidate_files(self, name: str, module: str | None) -> set[str]:
+        """Files that may define the class a name written in module refers to."""
+        candidates = set(self.files_by_class.get(name.rpartition(".")[2], []))
+
+        importing_module = self.symbols.modules.get(module or "")
+        if importing_module is not None:
+            head = name.partition(".")[0]
+            for imported in importing_module.imports:
+                if imported.alias not in (head, "*"):
+                    continue
+                # the imported class and every package on its way, which may re-export it
+                target = imported.get_target(importing_package=importing_module.package).removesuffix(".*")
+                candidates.update(self.files_by_class.get(target.rpartition(".")[2], []))
+                parts = target.split(".")
+                for index in range(1, len(parts) + 1):
+                    if (filepath := self.files_by_module.get(".".join(parts[:index]))) is not None:
+                        candidates.add(filepath)
+        return candidates
+
+    def resolve(self, name: str, module: str | None) -> Class | None:
+        self.load(self.get_candidate_files(name, module))
+        return self.symbols.resolve(name, module=module)
+
+    def find_root(self, root: str) -> list[Class]:
+        """Classes a root refers to, either by their name, qualified name or module qualified name."""
+        self.load(self.files_by_class.get(root.rpartition(".")[2], []))
+        return [
+            cls
+            for module in self.parsed.values()
+            for cls in module.classes
+            if root in (cls.name, cls.qualname, cls.full_name)
+        ]
+
+    def select(self, roots: list[str]) -> list[Module]:
+        """Modules with only the classes reachable from the roots, in the order of the sorted file paths.
+
+        Modules without reachable classes are left out.
+        """
+        reachable: dict[int, Class] = {}
+        queue: deque[Class] = deque()
+        for root in roots:
+            classes = self.find_root(root)
+            if not classes:
+                logger.warning(f"Root class {root} was not found.")
+            for cls in classes:
+                if id(cls) not in reachable:
+                    reachable[id(cls)] = cls
+                    queue.append(cls)
+
+        while queue:
+            cls = queue.popleft()
+            for name in self.symbols.iter_references(cls):
+                target = self.resolve(name, module=cls.module)
+                if (target is not None) and (id(target) not in reachable):
+                    reachable[id(target)] = target
+                    queue.append(target)
+
+        logger.info(
+            f"{len(reachable)} classes are reachable from {', '.join(roots)}, "
+            f"parsed {len(self.parsed)} of {len(self.filepaths)} files."
+        )
+
+        modules = []
+        for filepath in sorted(self.parsed):
+            module = self.parsed[filepath]
+            classes = [cls for cls in module.classes if id(cls) in reachable]
+            if classes:
+                modules.append(
+                    Module(
+                        filepath=filepath,
+                        classes=classes,
+                        imports=module.imports,
+                        name=module.name,
+                        diagnostics=module.diagnostics,
+                    )
+                )
+        return modules
@@ -0,0 +1,167 @@
+import io
+import json
+import logging
+import os
+import socket
+import time
+
+from py_model.cache import ParseCache
+from py_model.client import ServerUnavailableError, send_request
+from py_model.defaults import DEFAULT_IDLE_TIMEOUT
+from py_model.discovery import FileDiscovery
+from py_model.processing import prepare_output_files, write_outputs
+from py_model.watch import Watcher
+from py_model.writing import TextWriter
+
+logger = logging.getLogger(__name__)
+
+# seconds a client may take to send its request
+REQUEST_TIMEOUT = 10.0
+
+
+def normalize_paths(paths: list[str] | None) -> list[str] | None:
+    """Absolute paths, such that the paths of a client match the ones of the server regardless of the working dir."""
+    if paths is None:
+        return None
+    return sorted(os.path.abspath(path) for path in paths)
+
+
+class Server:
+    """Keeps the parsed model in memory and writes the output requested by `py-model --connect` clients.
+
+    The model is built once on start. Every request then only parses the files whose fingerprint changed since the
+    previous request in a single batch using jobs processes, see Watcher.update. The server listens on a Unix socket and
+    shuts down once no request arrived for idle_timeout seconds.
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        dirs: list[str] | None = None,
+        files: list[str] | None = None,
+        cache: ParseCache | None = None,
+        discovery: FileDiscovery | None = None,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        jobs: int = 1,
+    ) -> None:
+        self.socket_path = socket_path
+        self.dirs = normalize_paths(dirs)
+        self.files = normalize_paths(files)
+        self.cache = cache
+        self.idle_timeout = idle_timeout
+        self.watcher = Watcher(dirs=self.dirs, files=self.files, cache=cache, discovery=discovery, jobs=jobs)
+        self.requests = 0
+
+    def bind(self) -> socket.socket:
+        """Listen on the socket, a socket file left behind by a crashed server is replaced."""
+        if not hasattr(socket, "AF_UNIX"):
+            raise RuntimeError("py-model serve requires Unix sockets, which are not supported on this platform.")
+
+        if os.path.exists(self.socket_path):
+            try:
+                send_request(self.socket_path, {"command": "ping"}, timeout=REQUEST_TIMEOUT)
+            except (ServerUnavailableError, OSError):
+                os.remove(self.socket_path)
+            else:
+                raise RuntimeError(f"A server already listens on {self.socket_path}.")
+
+        server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server_socket.bind(self.socket_path)
+        # only the user may generate output through the server
+        os.chmod(self.socket_path, 0o600)
+        server_socket.listen()
+        return server_socket
+
+    def generate(self, request: dict) -> dict:
+        if (request.get("dirs") is not None) and (normalize_paths(request["dirs"]) != self.dirs):
+            raise ValueError(f"The server serves the directories {self.dirs}, not {request['dirs']}.")
+        if (request.get("files") is not None) and (normalize_paths(request["files"]) != self.files):
+            raise ValueError(f"The server serves the files {self.files}, not {request['files']}.")
+
+        start = time.perf_counter()
+        output_files = request.get("output", [])
+        prepare_output_files(output_files, cache_directory=None if self.cache is None else self.cache.directory)
+        changed = self.watcher.update(self.watcher.scan())
+        class_instances = self.watcher.get_classes()
+
+        response = {"ok": True, "changed": changed, "classes": len(class_instances)}
+        if output_files:
+            write_outputs(
+                class_instances,
+                output_files=output_files,
+                parallel=request.get("parallel_output", False),
+                symbols=self.watcher.symbols,
+            )
+        else:
+            # the client prints the output
+            stream = io.StringIO()
+            TextWriter().write(blocks=class_instances, stream=stream)
+            response["text"] = stream.getvalue()
+
+        response["seconds"] = time.perf_counter() - start
+        logger.info(f"Answered request {self.requests} in {response['seconds']:.3f}s.")
+        return response
+
+    def handle(self, request: dict) -> dict:
+        """Answer a request, errors are sent to the client instead of stopping the server."""
+        command = request.get("command", "generate")
+        try:
+            if command == "ping":
+                return {"ok": True}
+            if command == "stop":
+                return {"ok": True, "requests": self.requests}
+            if command == "generate":
+                return self.generate(request)
+            raise ValueError(f"Unknown command {command}.")
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            logger.error(f"Request {self.requests} failed: {error}")
+            return {"ok": False, "error": f"{type(error).__name__}: {error}"}
+
+    def serve_connection(self, connection: socket.socket) -> bool:
+        """Answer the request of a client, returns whether the server should keep running."""
+        connection.settimeout(REQUEST_TIMEOUT)
+        with connection.makefile("rb") as stream:
+            line = stream.readline()
+        if not line:
+            return True
+
+        self.requests += 1
+        try:
+            request = json.loads(line)
+        except ValueError as error:
+            request, response = {}, {"ok": False, "error": f"Invalid request: {error}"}
+        else:
+            response = self.handle(request)
+
+        try:
+            connection.sendall(json.dumps(response).encode() + b"\n")
+        except OSError as error:
+            logger.warning(f"Could not answer request {self.requests}: {error}")
+        return request.get("command") != "stop"
+
+    def run(self) -> None:
+        """Build the model and answer requests until stopped, interrupted or idle for idle_timeout seconds."""
+        start = time.perf_counter()
+        self.watcher.update(self.watcher.scan())
+        logger.info(f"Parsed {len(self.watcher.fingerprints)} files in {time.perf_counter() - start:.3f}s.")
+
+        server_socket = self.bind()
+        server_socket.settimeout(self.idle_timeout)
+        logger.info(f"Listening on {self.socket_path}, stopping after {self.idle_timeout}s without requests.")
+        try:
+            while True:
+                try:
+                    connection, _ = server_socket.accept()
+                except TimeoutError:
+                    logger.info("Stopping the server, no requests within the idle timeout.")
+                    break
+                with connection:
+                    if not self.serve_connection(connection):
+                        logger.info("Stopping the server on request.")
+                        break
+        except KeyboardInterrupt:
+            logger.info("Stopped the server.")
+        finally:
+            server_socket.close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+import re
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+from py_model.cache import CACHE_FORMAT_VERSION, ParseCache, get_version
+from py_model.git import get_changed_files, get_toplevel, resolve_ref
+from py_model.processing import parse_modules
+
+if TYPE_CHECKING:
+    from py_model.parsing import Module
+
+logger = logging.getLogger(__name__)
+
+
+# snapshots of older commits are removed, such that e.g. a cache directory restored by CI jobs does not grow forever
+MAX_SNAPSHOTS = 8
+SNAPSHOT_PATTERN = re.compile(r"model\.[0-9a-f]+\.snapshot")
+
+
+class Snapshot:
+    """Parsed modules of the tree at a commit.
+
+    Modules are keyed by their path relative to the root of the repository, such that a snapshot can be reused in
+    another checkout (e.g. restored from the cache of a CI job). Every commit has a snapshot file of its own, hence
+    runs since different refs (e.g. main and the previous commit of a branch) do not replace the snapshots of each
+    other.
+    """
+
+    def __init__(self, commit: str, modules: dict[str, Module]) -> None:
+        self.commit = commit
+        self.modules = modules
+
+    @staticmethod
+    def get_path(directory: str, commit: str) -> str:
+        return os.path.join(directory, f"model.{commit}.snapshot")
+
+    @classmethod
+    def load(cls, directory: str, commit: str) -> Snapshot | None:
+        """Load the snapshot of commit, returns None if it does not exist or was written by another py-model version."""
+        path = cls.get_path(directory, commit)
+        try:
+            with open(path, "rb") as file:
+                version, modules = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.info(f"Ignoring unreadable snapshot {path}.")
+            return None
+
+        if version != (get_version(), CACHE_FORMAT_VERSION):
+            logger.info(f"Ignoring snapshot {path} of another py-model version.")
+            return None
+        return cls(commit=commit, modules=modules)
+
+    def save(self, directory: str) -> None:
+        """Save the snapshot, only the MAX_SNAPSHOTS most recently saved snapshots within directory are kept."""
+        os.makedirs(directory, exist_ok=True)
+        path = self.get_path(directory, self.commit)
+        # write to a temporary file first so concurrent runs never read a half written snapshot
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            pickle.dump(((get_version(), CACHE_FORMAT_VERSION), self.modules), file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        prune_snapshots(directory, keep=MAX_SNAPSHOTS)
+
+
+def prune_snapshots(directory: str, keep: int) -> None:
+    """Remove all but the keep most recently saved snapshots within directory."""
+    snapshots = [entry for entry in os.scandir(directory) if SNAPSHOT_PATTERN.fullmatch(entry.name)]
+    # newest first
+    snapshots.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in snapshots[keep:]:
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            # removed by a concurrent run
+            pass
+
+
+def parse_modules_since(
+    filepaths: Iterable[str], ref: str, snapshot_dir: str, jobs: int = 1, cache: ParseCache | None = None
+) -> list[Module]:
+    """Parse only the files changed since ref and take all others from the snapshot taken at ref.
+
+    The changed files are listed by the local git repository of the working directory. Without a snapshot of ref all
+    files are parsed. The merged modules are saved as the snapshot of the current commit, which is the base of runs
+    since it. Nothing is saved if a parsed file has uncommitted changes, such a model is not the tree of any commit.
+
+    Args:
+        filepaths (Iterable[str]): paths of all model files, files missing in it (e.g. deleted ones) are dropped
+        ref (str): git ref the snapshot was taken at, e.g. main or HEAD~1
+        snapshot_dir (str): directory of the snapshots, read before and written after parsing
+        jobs (int, optional): number of processes used to parse the changed files. Defaults to 1.
+        cache (ParseCache | None, optional): cache of the parsed files. Defaults to None.
+
+    Returns:
+        list[Module]: modules of all files in the order of the sorted file paths, see parse_modules
+    """
+    filepaths = sorted(filepaths)
+    toplevel = os.path.realpath(get_toplevel())
+    real_paths = {filepath: os.path.realpath(filepath) for filepath in filepaths}
+    keys = {filepath: os.path.relpath(real_path, toplevel) for filepath, real_path in real_paths.items()}
+    commit = resolve_ref(ref)
+
+    snapshot = Snapshot.load(snapshot_dir, commit)
+    if snapshot is None:
+        logger.info(f"No snapshot of {ref} ({commit[:12]}) found in {snapshot_dir}, parsing all files.")
+        stale = filepaths
+    else:
+        changed = get_changed_files(ref)
+        stale = [
+            filepath
+            for filepath in filepaths
+            if (real_paths[filepath] in changed) or (keys[filepath] not in snapshot.modules)
+        ]
+        logger.info(f"{len(changed)} files changed since {ref}, parsing {len(stale)} of {len(filepaths)} files.")
+
+    parsed = {module.filepath: module for module in parse_modules(stale, jobs=jobs, cache=cache)}
+    modules = []
+    for filepath in filepaths:
+        module = parsed.get(filepath)
+        if module is None:
+            module = snapshot.modules[keys[filepath]]
+            module.filepath = filepath
+        modules.append(module)
+
+    # the result only equals the tree at HEAD if none of the parsed files has uncommitted changes
+    uncommitted = get_changed_files("HEAD")
+    if any(real_path in uncommitted for real_path in real_paths.values()):
+        logger.info("Not saving a snapshot, some of the files have uncommitted changes.")
+    else:
+        snapshot = Snapshot(commit=resolve_ref("HEAD"), modules={keys[module.filepath]: module for module in modules})
+        snapshot.save(snapshot_dir)
+
+    return modules
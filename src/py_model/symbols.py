@@ -0,0 +1,185 @@
+import logging
+from collections import Counter
+from collections.abc import Iterable, Iterator
+
+from py_model.parsing import Class, Import, Module
+from py_model.parsing.type_hints import TypeHint
+
+logger = logging.getLogger(__name__)
+
+# maximum number of re-exports (e.g. `from .person import Person` in an __init__.py) followed while resolving
+MAX_REEXPORTS = 10
+
+# number of unresolved names listed in the summary
+SUMMARY_LENGTH = 20
+
+
+class SymbolTable:
+    """Project wide index of all parsed classes by their module qualified name, e.g. `models.person.Person`.
+
+    Names are resolved as they are written in a module: classes of the module itself, import aliases
+    (`import x as y`, `from a import B as C`, relative and star imports) and re-exports of other modules are taken
+    into account. Names that are still not found fall back to a class with the same name, as long as it is unique in
+    the project. Every resolution is memoized, hence repeated lookups take constant time.
+    """
+
+    def __init__(self, modules: Iterable[Module]) -> None:
+        self.classes: dict[str, Class] = {}
+        self.classes_by_name: dict[str, list[Class]] = {}
+        self.modules: dict[str, Module] = {}
+        self.aliases: dict[str, dict[str, str]] = {}  # module -> alias -> qualified name
+        self.star_imports: dict[str, list[str]] = {}  # module -> modules imported with *
+        self._resolved: dict[tuple[str | None, str], Class | None] = {}
+        self.unresolved: Counter[str] = Counter()
+
+        for module in modules:
+            self.add_module(module)
+
+    @classmethod
+    def from_classes(cls, classes: Iterable[Class], imports: dict[str, list[Import]] | None = None) -> "SymbolTable":
+        """Symbol table of classes without their parsed modules (e.g. read from an IR file).
+
+        Names are resolved through the imports of their module if given (see py_model.ir), within the module of a
+        class, by their module qualified name or as a unique class name.
+        """
+        imports = imports or {}
+        modules: dict[str | None, list[Class]] = {name: [] for name in imports}
+        for class_instance in classes:
+            modules.setdefault(class_instance.module, []).append(class_instance)
+        return cls(
+            Module(filepath="", classes=module_classes, imports=imports.get(name or "", []), name=name)
+            for name, module_classes in modules.items()
+        )
+
+    def add_module(self, module: Module) -> None:
+        """Add the classes and imports of a module, modules can also be added after names were resolved.
+
+        Raises a ValueError if another file defining classes has the same module name, e.g. a/models.py and
+        b/models.py outside of packages. Their classes would be merged into one module.
+        """
+        other = self.modules.get(module.name)
+        if (other is not None) and (other.filepath != module.filepath) and other.classes and module.classes:
+            raise ValueError(
+                f"{other.filepath} and {module.filepath} have the same module name {module.name}, make their "
+                "directories packages (add an __init__.py) or leave one of them out."
+            )
+        self.modules[module.name] = module
+        # a new module may define a name that could not be resolved before, or make a unique name ambiguous
+        self._resolved.clear()
+
+        for cls in module.classes:
+            self.classes[cls.full_name] = cls
+            self.classes_by_name.setdefault(cls.name, []).append(cls)
+
+        aliases = self.aliases.setdefault(module.name, {})
+        for imported in module.imports:
+            target = imported.get_target(importing_package=module.package)
+            if imported.alias == "*":
+                self.star_imports.setdefault(module.name, []).append(target.removesuffix(".*"))
+            else:
+                aliases[imported.alias] = target
+
+    def resolve(self, name: str, module: str | None) -> Class | None:
+        """Resolve a (dotted) name as written in module, returns None if it is not a class of the project."""
+        key = (module, name)
+        try:
+            return self._resolved[key]
+        except KeyError:
+            resolved = self._resolve(name=name, module=module)
+            self._resolved[key] = resolved
+            return resolved
+
+    def _resolve(self, name: str, module: str | None) -> Class | None:
+        head, _, rest = name.partition(".")
+
+        candidates = [f"{module}.{name}" if module else name]
+        aliases = self.aliases.get(module or "", {})
+        if head in aliases:
+            candidates.append(aliases[head] + (f".{rest}" if rest else ""))
+        if rest:
+            # absolute dotted name, e.g. models.person.Person
+            candidates.append(name)
+        for star_module in self.star_imports.get(module or "", []):
+            candidates.append(f"{star_module}.{name}")
+
+        for candidate in candidates:
+            if (cls := self._lookup(candidate)) is not None:
+                return cls
+
+        # fall back to the class name if it is unique within the project
+        matches = self.classes_by_name.get(name.rpartition(".")[2], [])
+        if len(matches) == 1:
+            return matches[0]
+        return None
+
+    def _lookup(self, qualified_name: str, depth: int = 0) -> Class | None:
+        if (cls := self.classes.get(qualified_name)) is not None:
+            return cls
+        if depth >= MAX_REEXPORTS:
+            return None
+
+        # follow re-exports: a name imported into a module can be imported from that module again
+        parts = qualified_name.split(".")
+        for index in range(len(parts) - 1, 0, -1):
+            module = ".".join(parts[:index])
+            if (module in self.aliases) and (parts[index] in self.aliases[module]):
+                target = ".".join([self.aliases[module][parts[index]], *parts[index + 1 :]])
+                return self._lookup(target, depth=depth + 1)
+        return None
+
+    def is_external(self, name: str, module: str | None) -> bool:
+        """Whether a name is imported from a module that is not part of the project, e.g. `from enum import Enum`."""
+        head = name.partition(".")[0]
+        target = self.aliases.get(module or "", {}).get(head)
+        if target is None:
+            return False
+
+        target_module = target.rpartition(".")[0] or target
+        return not any(
+            (known == target_module) or known.startswith(f"{target_module}.") or target_module.startswith(f"{known}.")
+            for known in self.modules
+        )
+
+    def get_bases(self, cls: Class) -> list[Class]:
+        """The classes of the project cls inherits from."""
+        bases = [self.resolve(name=base, module=cls.module) for base in cls.inherits_from]
+        return [base for base in bases if base is not None]
+
+    def get_referenced_classes(self, type_hint: TypeHint, module: str | None) -> list[Class]:
+        """The classes of the project a type hint refers to, e.g. the class of A for `list[A] | None`."""
+        classes = [self.resolve(name=custom.name, module=module) for custom in type_hint.iter_custom_classes()]
+        return [cls for cls in classes if cls is not None]
+
+    def iter_references(self, cls: Class) -> Iterator[str]:
+        """All names cls refers to: its bases and the custom classes of attributes, parameters and return types."""
+        yield from cls.inherits_from
+
+        type_hints = [attribute.dtype for attribute in cls.attributes]
+        for func in cls.functions:
+            type_hints.extend(parameter.dtype for parameter in func.parameters)
+            type_hints.append(func.return_type)
+
+        for type_hint in type_hints:
+            for custom in type_hint.iter_custom_classes():
+                yield custom.name
+
+    def resolve_all(self) -> None:
+        """Resolve the references of all classes and collect the names that could not be resolved."""
+        self.unresolved.clear()
+        for module in self.modules.values():
+            for cls in module.classes:
+                for name in self.iter_references(cls):
+                    if (self.resolve(name=name, module=cls.module) is None) and not self.is_external(
+                        name=name, module=cls.module
+                    ):
+                        self.unresolved[name] += 1
+
+    def report_unresolved(self) -> None:
+        """Log a single summary of all names that could not be resolved."""
+        if not self.unresolved:
+            return
+
+        names = ", ".join(f"{name} ({count}x)" for name, count in self.unresolved.most_common(SUMMARY_LENGTH))
+        if len(self.unresolved) > SUMMARY_LENGTH:
+            names += ", ..."
+        logger.warning(f"Could not resolve {len(self.unresolved)} names to classes of the project: {names}")
@@ -1,8 +1,9 @@
 import ast
+import logging
 import os
 
+from py_model.diagnostics import CUSTOM_CLASS, report
 from py_model.errors import MissingImplementationError
-from py_model.logging import get_logger
 from py_model.parsing.type_hints import (
     Boolean,
     CustomClass,
@@ -19,7 +20,19 @@ from py_model.parsing.type_hints import (
     Union,
 )
 
-logger = get_logger(__name__)
+logger = logging.getLogger(__name__)
+
+# type hints are interned, hence calling these returns the one shared instance
+MATCHING: dict[str, type[TypeHint]] = {
+    "None": NoneType,
+    "bool": Boolean,
+    "int": Integer,
+    "float": Float,
+    "str": String,
+    "tuple": Tuple,
+    "set": Set,
+    "dict": Dict,
+}
 
 
 def vulture_ignore(obj):
@@ -41,6 +54,18 @@ def indicate_access_level(name: str) -> str:
         return "+" + name
 
 
+def escape_dot_id(text: str) -> str:
+    """Quote a DOT identifier, e.g. a dotted class name."""
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def escape_dot_record(text: str) -> str:
+    """Escape the characters with a special meaning within the label of a DOT record node."""
+    for character in '\\{}|<>"':
+        text = text.replace(character, "\\" + character)
+    return text
+
+
 def determine_is_dataclass(class_def: ast.ClassDef) -> bool:
     """Determine if a class is a dataclass."""
     is_dataclass = False
@@ -52,6 +77,16 @@ def determine_is_dataclass(class_def: ast.ClassDef) -> bool:
     return is_dataclass
 
 
+def get_dotted_name(node: ast.expr) -> str | None:
+    """Get the name of a (dotted) name expression like `Base` or `models.Base`, None for other expressions."""
+    if isinstance(node, ast.Name):
+        return node.id
+    elif isinstance(node, ast.Attribute):
+        if value := get_dotted_name(node.value):
+            return f"{value}.{node.attr}"
+    return None
+
+
 def handle_type_annotation(annotation) -> TypeHint:
     if annotation is None:
         # no return type specified: function():
@@ -61,22 +96,16 @@ def handle_type_annotation(annotation) -> TypeHint:
         return NoneType()
     elif isinstance(annotation, ast.Name):
         # Datatype was specified, e.g.: function() -> str:
-        MATCHING = {
-            "None": NoneType(),
-            "bool": Boolean(),
-            "int": Integer(),
-            "float": Float(),
-            "str": String(),
-            "tuple": Tuple(),
-            "set": Set(),
-            "dict": Dict(),
-        }
         try:
-            return MATCHING[annotation.id]
+            return MATCHING[annotation.id]()
         except KeyError:
             # if not in matching, it is a custom class
-            logger.warning(f"Setting a type hint: {annotation.id} must be a class")
+            report(CUSTOM_CLASS, "Setting a type hint: %s must be a class", annotation.id, node=annotation)
             return CustomClass(name=annotation.id)
+    elif isinstance(annotation, ast.Attribute) and (name := get_dotted_name(annotation)):
+        # custom class of another module, e.g.: function() -> models.Person:
+        report(CUSTOM_CLASS, "Setting a type hint: %s must be a class", name, node=annotation)
+        return CustomClass(name=name)
     elif isinstance(annotation, ast.Subscript):
         # nested datatype like list or tuple, e.g.: function() -> list[str]:
         value = annotation.value  # obtain value (tuple or list)
@@ -0,0 +1,178 @@
+import logging
+import os
+import threading
+import time
+
+from py_model.cache import ParseCache
+from py_model.defaults import DEFAULT_MAX_WARNINGS
+from py_model.diagnostics import Diagnostics
+from py_model.discovery import FileDiscovery
+from py_model.errors import MissingImplementationError
+from py_model.navigation import get_filepath_set
+from py_model.parsing import Class, Module
+from py_model.processing import parse_modules, write_outputs
+from py_model.symbols import SymbolTable
+
+logger = logging.getLogger(__name__)
+
+# modification time and size of a file, a change of either one triggers parsing the file again
+Fingerprint = tuple[int, int]
+
+# errors of a file saved in the middle of an edit, e.g. invalid syntax, an unsupported annotation or a bad encoding
+PARSE_ERRORS = (SyntaxError, ValueError, UnicodeDecodeError, MissingImplementationError)
+
+
+class Watcher:
+    """Keeps the parsed model in memory and regenerates the output whenever a watched file changes.
+
+    The watched files are polled every interval seconds. After a change was detected, the watcher waits until no file
+    changed for debounce seconds, such that a burst of saves results in a single regeneration. Every update reports the
+    warnings of the parsed files and resolves the whole model again, like a single run does.
+    """
+
+    def __init__(
+        self,
+        dirs: list[str] | None = None,
+        files: list[str] | None = None,
+        output_files: list[str] | None = None,
+        cache: ParseCache | None = None,
+        discovery: FileDiscovery | None = None,
+        interval: float = 0.5,
+        debounce: float = 0.2,
+        parallel_output: bool = False,
+        max_warnings: int = DEFAULT_MAX_WARNINGS,
+        jobs: int = 1,
+    ) -> None:
+        self.dirs = dirs
+        self.files = files
+        self.output_files = output_files or []
+        self.cache = cache
+        self.discovery = discovery
+        self.interval = interval
+        self.debounce = debounce
+        self.parallel_output = parallel_output
+        self.max_warnings = max_warnings
+        self.jobs = jobs
+
+        self.fingerprints: dict[str, Fingerprint] = {}
+        self.modules: dict[str, Module] = {}
+        self.symbols = SymbolTable([])
+
+    def scan(self) -> dict[str, Fingerprint]:
+        """Get the fingerprints of all currently watched files."""
+        try:
+            filepaths = get_filepath_set(dirs=self.dirs, files=self.files, discovery=self.discovery)
+        except (ValueError, FileNotFoundError) as error:
+            # files may be deleted or moved while watching
+            logger.warning(f"No files to watch: {error}")
+            return {}
+
+        fingerprints = {}
+        for filepath in filepaths:
+            try:
+                stat = os.stat(filepath)
+            except FileNotFoundError:
+                continue
+            fingerprints[filepath] = (stat.st_mtime_ns, stat.st_size)
+        return fingerprints
+
+    def update(self, fingerprints: dict[str, Fingerprint]) -> bool:
+        """Parse the files whose fingerprint changed and drop deleted ones, returns whether the model changed."""
+        changed = [path for path, fingerprint in fingerprints.items() if self.fingerprints.get(path) != fingerprint]
+        deleted = [path for path in self.modules if path not in fingerprints]
+
+        for filepath in deleted:
+            self.modules.pop(filepath, None)
+
+        # only the warnings of the parsed files are reported, the ones of unchanged files were reported before
+        diagnostics = Diagnostics()
+        for filepath, module in self.parse(changed).items():
+            self.modules[filepath] = module
+            diagnostics.extend(module.diagnostics)
+
+        if changed or deleted:
+            logger.info(f"Parsed {len(changed)} changed files, removed {len(deleted)} deleted files.")
+            diagnostics.report(max_warnings=self.max_warnings)
+            # if the model can not be resolved (e.g. two files with the same module name), the files stay changed
+            self.resolve()
+        self.fingerprints = fingerprints
+        return bool(changed or deleted)
+
+    def parse(self, filepaths: list[str]) -> dict[str, Module]:
+        """Parse the files in a single batch, such that the cache is evicted once and all jobs are used.
+
+        If a file can not be parsed, the batch is split in halves until the failing files are found. Failing files are
+        left out, hence the last valid model of such a file is kept.
+        """
+        if not filepaths:
+            return {}
+        filepaths = sorted(filepaths)
+        try:
+            modules = parse_modules(filepaths, jobs=self.jobs, cache=self.cache)
+        except PARSE_ERRORS as error:
+            if len(filepaths) == 1:
+                logger.error(f"Could not parse {filepaths[0]}: {error}")
+                return {}
+            middle = len(filepaths) // 2
+            return {**self.parse(filepaths[:middle]), **self.parse(filepaths[middle:])}
+        return {module.filepath: module for module in modules}
+
+    def resolve(self) -> None:
+        """Link base classes and type hints to the parsed classes, names may refer to classes of any watched file."""
+        self.symbols = SymbolTable(self.modules[filepath] for filepath in sorted(self.modules))
+        self.symbols.resolve_all()
+        self.symbols.report_unresolved()
+
+    def get_classes(self) -> list[Class]:
+        """Classes of all watched files in the order of the sorted file paths."""
+        class_instances = []
+        for filepath in sorted(self.modules):
+            class_instances.extend(self.modules[filepath].classes)
+        return class_instances
+
+    def write(self) -> None:
+        write_outputs(
+            self.get_classes(), output_files=self.output_files, parallel=self.parallel_output, symbols=self.symbols
+        )
+
+    def wait_for_change(self, stop_event: threading.Event) -> dict[str, Fingerprint] | None:
+        """Poll until a change was detected and the files settled, returns None if stopped before."""
+        fingerprints = self.fingerprints
+        while fingerprints == self.fingerprints:
+            if stop_event.wait(self.interval):
+                return None
+            fingerprints = self.scan()
+
+        # debounce: wait until no further changes happen
+        while True:
+            if stop_event.wait(self.debounce):
+                return None
+            latest = self.scan()
+            if latest == fingerprints:
+                return fingerprints
+            fingerprints = latest
+
+    def run(self, stop_event: threading.Event | None = None) -> None:
+        """Build the model, write the output and regenerate it on every change until stopped (or interrupted)."""
+        if stop_event is None:
+            stop_event = threading.Event()
+
+        self.update(self.scan())
+        self.write()
+        logger.info(f"Watching {len(self.fingerprints)} files for changes, press Ctrl+C to stop.")
+
+        try:
+            while (fingerprints := self.wait_for_change(stop_event)) is not None:
+                start = time.perf_counter()
+                try:
+                    if not self.update(fingerprints):
+                        continue
+                except ValueError as error:
+                    logger.error(f"Not regenerating the output: {error}")
+                    # wait for the next change instead of retrying right away, it resolves all files again
+                    self.fingerprints = fingerprints
+                    continue
+                self.write()
+                logger.info(f"Regenerated output in {time.perf_counter() - start:.3f}s.")
+        except KeyboardInterrupt:
+            logger.info("Stopped watching.")
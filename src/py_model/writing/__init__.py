@@ -1 +1,3 @@
 from .supported_types import SupportedTypes as SupportedTypes
+from .writer import TextWriter as TextWriter
+from .writer import Writer as Writer
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from collections.abc import Iterable, Iterator
+from html import escape
+from typing import TYPE_CHECKING, TextIO
+
+from py_model.symbols import SymbolTable
+
+from ..writer import replace_on_success
+from .graph_writer import GraphWriter
+from .layout import Layout, Point, layout_graph
+
+if TYPE_CHECKING:
+    from py_model.parsing import BuildingBlock, Class
+
+logger = logging.getLogger(__name__)
+
+# metrics of the monospace font, such that the size of a box follows from the number of characters
+FONT_SIZE = 12
+CHARACTER_WIDTH = 7.3
+LINE_HEIGHT = 16.0
+PADDING = 8.0
+MARGIN = 20.0
+
+LAYOUT_CACHE_DIR = "layouts"
+MAX_CACHED_LAYOUTS = 32
+# bump whenever layout_graph places the same graph differently, such that cached layouts are not reused
+LAYOUT_VERSION = 2
+
+# command line rasterizers, tried in this order if cairosvg is not installed
+RASTERIZERS = {
+    "rsvg-convert": lambda svg, png: ["rsvg-convert", "--output", png, svg],
+    "inkscape": lambda svg, png: ["inkscape", svg, "--export-filename", png],
+    "magick": lambda svg, png: ["magick", svg, png],
+}
+
+
+class LayoutCache:
+    """On-disk cache of layouts by the hash of the graph, regenerating a diagram of an unchanged graph skips the layout.
+
+    Only the MAX_CACHED_LAYOUTS most recently used layouts are kept.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    @staticmethod
+    def get_key(sizes: list[Point], edges: list[tuple[int, int]]) -> str:
+        return hashlib.sha256(json.dumps([LAYOUT_VERSION, sizes, edges]).encode()).hexdigest()
+
+    def get(self, key: str) -> Layout | None:
+        path = os.path.join(self.directory, f"{key}.json")
+        try:
+            with open(path) as file:
+                layout = Layout.from_dict(json.load(file))
+        except (OSError, ValueError, KeyError):
+            return None
+
+        # mark entry as recently used
+        os.utime(path)
+        return layout
+
+    def put(self, key: str, layout: Layout) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{key}.json")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(layout.to_dict(), file)
+        os.replace(tmp_path, path)
+
+        entries = sorted(
+            (entry for entry in os.scandir(self.directory) if entry.name.endswith(".json")),
+            key=lambda entry: entry.stat().st_mtime,
+        )
+        for entry in entries[: max(0, len(entries) - MAX_CACHED_LAYOUTS)]:
+            os.remove(entry.path)
+
+
+def get_lines(cls: Class) -> list[str]:
+    """Text of a class box: the name, then the attributes and the functions."""
+    header = f"«dataclass» {cls.name}" if cls.is_dataclass else cls.name
+    return [header, *(str(attribute) for attribute in cls.attributes), *(str(func) for func in cls.functions)]
+
+
+def get_size(lines: list[str], sections: int) -> Point:
+    width = max(len(line) for line in lines) * CHARACTER_WIDTH + 2 * PADDING
+    height = len(lines) * LINE_HEIGHT + sections * PADDING + PADDING
+    return width, height
+
+
+def get_inheritance_edges(classes: list[Class], symbols: SymbolTable) -> list[tuple[int, int]]:
+    """Edges from every class to its bases among the given classes, bases are resolved by the symbol table."""
+    positions = {id(cls): position for position, cls in enumerate(classes)}
+
+    edges = []
+    for position, cls in enumerate(classes):
+        for base in symbols.get_bases(cls):
+            if (base is not cls) and ((target := positions.get(id(base))) is not None):
+                edges.append((position, target))
+    return edges
+
+
+class SvgWriter(GraphWriter):
+    """Class diagram of the inheritance hierarchy, laid out in layers with the bases on top."""
+
+    def get_layout(self, sizes: list[Point], edges: list[tuple[int, int]]) -> Layout:
+        cache = LayoutCache(os.path.join(self.cache_directory, LAYOUT_CACHE_DIR)) if self.cache_directory else None
+        key = LayoutCache.get_key(sizes, edges)
+        if (cache is not None) and ((layout := cache.get(key)) is not None):
+            logger.info("Reusing the cached layout of the diagram.")
+            return layout
+
+        layout = layout_graph(sizes, edges)
+        if cache is not None:
+            cache.put(key, layout)
+        return layout
+
+    def render(self, block: BuildingBlock) -> Iterator[str]:
+        """Diagram of the block on its own, write lays out the diagram of all blocks as a whole."""
+        return self.iter_diagram([block])
+
+    def write(self, blocks: Iterable[BuildingBlock], stream: TextIO, symbols: SymbolTable | None = None) -> None:
+        stream.writelines(self.iter_diagram(blocks, symbols=symbols))
+
+    def iter_diagram(self, blocks: Iterable[BuildingBlock], symbols: SymbolTable | None = None) -> Iterator[str]:
+        # the layout needs the whole graph, hence all classes are collected first
+        classes = list(blocks)
+        lines = [get_lines(cls) for cls in classes]
+        sizes = [get_size(class_lines, sections=2 if len(class_lines) > 1 else 1) for class_lines in lines]
+        edges = get_inheritance_edges(classes, symbols=symbols or SymbolTable.from_classes(classes))
+        layout = self.get_layout(sizes, edges)
+
+        yield from self.iter_svg(lines, sizes, layout)
+
+    def iter_svg(self, lines: list[list[str]], sizes: list[Point], layout: Layout) -> Iterator[str]:
+        width, height = layout.width + 2 * MARGIN, layout.height + 2 * MARGIN
+        yield (
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" height="{height:.0f}" '
+            f'viewBox="{-MARGIN:.0f} {-MARGIN:.0f} {width:.0f} {height:.0f}" '
+            f'font-family="monospace" font-size="{FONT_SIZE}">\n'
+        )
+        yield (
+            '<defs><marker id="inherits" viewBox="0 0 12 12" refX="12" refY="6" markerWidth="12" markerHeight="12" '
+            'orient="auto"><path d="M0,0 L12,6 L0,12 z" fill="white" stroke="black"/></marker></defs>\n'
+        )
+        yield f'<rect x="{-MARGIN:.0f}" y="{-MARGIN:.0f}" width="{width:.0f}" height="{height:.0f}" fill="white"/>\n'
+
+        for route in layout.routes:
+            points = " ".join(f"{x:.1f},{y:.1f}" for x, y in route)
+            yield f'<polyline points="{points}" fill="none" stroke="black" marker-end="url(#inherits)"/>\n'
+
+        for class_lines, (box_width, box_height), (x, y) in zip(lines, sizes, layout.positions):
+            yield "<g>\n"
+            yield (
+                f'<rect x="{x:.1f}" y="{y:.1f}" width="{box_width:.1f}" height="{box_height:.1f}" '
+                'fill="#fffbe6" stroke="black"/>\n'
+            )
+            text_y = y + PADDING + LINE_HEIGHT - 4
+            yield (
+                f'<text x="{x + box_width / 2:.1f}" y="{text_y:.1f}" text-anchor="middle" font-weight="bold">'
+                f"{escape(class_lines[0])}</text>\n"
+            )
+            if len(class_lines) > 1:
+                separator_y = y + PADDING + LINE_HEIGHT + PADDING / 2
+                yield (
+                    f'<line x1="{x:.1f}" y1="{separator_y:.1f}" x2="{x + box_width:.1f}" y2="{separator_y:.1f}" '
+                    'stroke="black"/>\n'
+                )
+                for line in class_lines[1:]:
+                    text_y += LINE_HEIGHT
+                    yield f'<text x="{x + PADDING:.1f}" y="{text_y + PADDING:.1f}">{escape(line)}</text>\n'
+            yield "</g>\n"
+
+        yield "</svg>\n"
+
+
+def get_rasterizer() -> str | None:
+    """Name of the available SVG rasterizer, cairosvg is preferred over the command line tools."""
+    try:
+        import cairosvg  # noqa: F401, pylint: disable=import-outside-toplevel,unused-import
+    except ImportError:
+        pass
+    else:
+        return "cairosvg"
+
+    for name in RASTERIZERS:
+        if shutil.which(name):
+            return name
+    return None
+
+
+def check_rasterizer() -> str:
+    rasterizer = get_rasterizer()
+    if rasterizer is None:
+        raise RuntimeError(
+            f"PNG output requires cairosvg or one of {', '.join(RASTERIZERS)}, write an .svg file instead."
+        )
+    return rasterizer
+
+
+def rasterize(svg_path: str, png_path: str) -> None:
+    rasterizer = check_rasterizer()
+    if rasterizer == "cairosvg":
+        import cairosvg  # pylint: disable=import-outside-toplevel
+
+        cairosvg.svg2png(url=svg_path, write_to=png_path)
+    else:
+        subprocess.run(RASTERIZERS[rasterizer](svg_path, png_path), check=True, capture_output=True)
+
+
+class PngWriter(SvgWriter):
+    """Class diagram as PNG, the SVG diagram is converted by the first available rasterizer."""
+
+    binary = True
+
+    def check(self) -> None:
+        check_rasterizer()
+
+    def write_file(self, blocks: Iterable[BuildingBlock], file_path: str, symbols: SymbolTable | None = None) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            svg_path = os.path.join(directory, "diagram.svg")
+            with open(svg_path, "w") as file:
+                SvgWriter.write(self, blocks=blocks, stream=file, symbols=symbols)
+            # the rasterizers derive the format from the extension, hence the final file is copied from the directory
+            png_path = os.path.join(directory, "diagram.png")
+            rasterize(svg_path, png_path)
+            with replace_on_success(file_path) as tmp_path:
+                shutil.copyfile(png_path, tmp_path)
+
+    def render(self, block: BuildingBlock) -> Iterator[str]:
+        raise ValueError("PNG diagrams can only be written to a file.")
+
+    def write(self, blocks: Iterable[BuildingBlock], stream: TextIO, symbols: SymbolTable | None = None) -> None:
+        raise ValueError("PNG diagrams can only be written to a file.")
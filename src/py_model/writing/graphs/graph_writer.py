@@ -1,13 +1,93 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING, TextIO
+
+from py_model.symbols import SymbolTable
+from py_model.utils import escape_dot_id
+
 from ..writer import Writer
 
+if TYPE_CHECKING:
+    from py_model.parsing import BuildingBlock, Class
+
+INHERITANCE = "inheritance"
+COMPOSITION = "composition"
+
+EDGE_ATTRIBUTES = {
+    INHERITANCE: "[arrowhead=empty]",
+    # drawn from the owner to the part, the diamond sits at the owner
+    COMPOSITION: "[dir=back, arrowtail=diamond]",
+}
+
 
 class GraphWriter(Writer):
-    post_text: str = ""  # Holds the arrows to be added to the end of the text
+    """Graphs are written as nodes first, the footer holds everything to be added at the end (like arrows).
+
+    Edges are resolved by the symbol table of the parsed modules, which knows their imports. Without one, a table of
+    the classes of the graph is used, see SymbolTable.from_classes.
+    """
+
 
-    def write(self, file_path: str):
-        with open(file_path, "w") as file:
-            file.write(self.text + self.post_text)
+def iter_edge_references(cls: Class) -> Iterator[tuple[str, str]]:
+    """Names cls has an edge to with the kind of the edge: its bases and the custom classes of its attributes."""
+    for base in cls.inherits_from:
+        yield base, INHERITANCE
+    for attribute in cls.attributes:
+        for custom in attribute.dtype.iter_custom_classes():
+            yield custom.name, COMPOSITION
 
 
 class DotWriter(GraphWriter):
-    pass
+    """Graphviz digraph with a record node per class and a cluster per module.
+
+    Nodes are streamed as they are rendered, the edges are resolved once all nodes are known.
+    """
+
+    def header(self) -> Iterable[str]:
+        yield "digraph models {\n"
+        yield "rankdir=BT;\n"
+        yield 'node [shape=record, fontname="monospace", fontsize=10];\n'
+
+    def render(self, block: BuildingBlock) -> Iterator[str]:
+        return block.iter_dot()
+
+    def write(self, blocks: Iterable[BuildingBlock], stream: TextIO, symbols: SymbolTable | None = None) -> None:
+        classes: list[Class] = []
+
+        stream.writelines(self.header())
+        cluster, module = 0, None
+        for cls in blocks:
+            # classes are ordered by file, hence a module change closes the cluster of the previous module
+            if cls.module != module:
+                if module is not None:
+                    stream.write("}\n")
+                module = cls.module
+                if module is not None:
+                    stream.write(f'subgraph "cluster_{cluster}" {{\nlabel={escape_dot_id(module)};\n')
+                    cluster += 1
+            stream.writelines(self.render(cls))
+            classes.append(cls)
+        if module is not None:
+            stream.write("}\n")
+
+        stream.writelines(self.iter_edges(classes, symbols=symbols or SymbolTable.from_classes(classes)))
+        stream.writelines(self.footer())
+
+    def footer(self) -> Iterable[str]:
+        yield "}\n"
+
+    @staticmethod
+    def iter_edges(classes: list[Class], symbols: SymbolTable) -> Iterator[str]:
+        """Edges to the referenced classes of the graph, each pair of classes is connected once per kind of edge."""
+        nodes = {id(cls) for cls in classes}
+        seen: set[tuple[int, int, str]] = set()
+        for cls in classes:
+            for name, kind in iter_edge_references(cls):
+                target = symbols.resolve(name, module=cls.module)
+                if (target is None) or (target is cls) or (id(target) not in nodes):
+                    continue
+                if (key := (id(cls), id(target), kind)) in seen:
+                    continue
+                seen.add(key)
+                yield f"{escape_dot_id(cls.full_name)} -> {escape_dot_id(target.full_name)} {EDGE_ATTRIBUTES[kind]};\n"
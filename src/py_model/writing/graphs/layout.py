@@ -0,0 +1,322 @@
+"""Layered (Sugiyama style) layout of directed acyclic graphs, e.g. inheritance hierarchies.
+
+The layout runs in the usual phases: the nodes are assigned to layers (bases above the classes inheriting from them),
+edges spanning several layers are split by dummy nodes, the order within the layers is improved by barycenter sweeps
+to reduce edge crossings and finally every node is placed close to the barycenter of its neighbours. Connected
+components are laid out separately and packed into rows, such that large forests stay readable.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+
+# distances between nodes in pixels
+HORIZONTAL_GAP = 30.0
+VERTICAL_GAP = 50.0
+COMPONENT_GAP = 60.0
+# width of the nodes routing long edges
+DUMMY_WIDTH = 10.0
+
+ORDERING_SWEEPS = 8
+PLACEMENT_SWEEPS = 8
+
+Point = tuple[float, float]
+
+
+@dataclass
+class Layout:
+    """Top left corners of the nodes and the points of the edges (from the source to the target)."""
+
+    positions: list[Point]
+    routes: list[list[Point]]
+    width: float
+    height: float
+
+    def to_dict(self) -> dict:
+        return {"positions": self.positions, "routes": self.routes, "width": self.width, "height": self.height}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Layout:
+        return cls(
+            positions=[tuple(position) for position in data["positions"]],
+            routes=[[tuple(point) for point in route] for route in data["routes"]],
+            width=data["width"],
+            height=data["height"],
+        )
+
+
+@dataclass
+class _Component:
+    """A connected part of the graph, nodes are indices of the whole graph, dummy nodes are appended to them."""
+
+    nodes: list[int]
+    layers: list[list[int]] = field(default_factory=list)
+    routes: dict[int, list[int]] = field(default_factory=dict)  # edge index -> nodes the edge passes through
+    positions: dict[int, Point] = field(default_factory=dict)
+    layer_heights: dict[int, float] = field(default_factory=dict)  # dummy node -> height of its layer
+    width: float = 0.0
+    height: float = 0.0
+
+
+def get_components(number_of_nodes: int, edges: list[tuple[int, int]]) -> list[list[int]]:
+    """Connected components (ignoring the direction of the edges), ordered by their first node."""
+    parents = list(range(number_of_nodes))
+
+    def find(node: int) -> int:
+        while parents[node] != node:
+            parents[node] = parents[parents[node]]
+            node = parents[node]
+        return node
+
+    for source, target in edges:
+        root_source, root_target = find(source), find(target)
+        if root_source != root_target:
+            parents[max(root_source, root_target)] = min(root_source, root_target)
+
+    components: dict[int, list[int]] = {}
+    for node in range(number_of_nodes):
+        components.setdefault(find(node), []).append(node)
+    return list(components.values())
+
+
+def assign_layers(nodes: list[int], edges: list[tuple[int, int]]) -> dict[int, int]:
+    """Longest path layering: targets of edges are placed above their sources, sources of no edge on top.
+
+    Edges closing a cycle (which valid inheritance never has) are ignored.
+    """
+    incoming: dict[int, list[int]] = {node: [] for node in nodes}
+    outgoing: dict[int, list[int]] = {node: [] for node in nodes}
+    for source, target in edges:
+        if source != target:
+            # the target (e.g. the base) has to be above the source
+            incoming[source].append(target)
+            outgoing[target].append(source)
+
+    remaining = {node: len(incoming[node]) for node in nodes}
+    layers: dict[int, int] = {}
+    ready = [node for node in nodes if remaining[node] == 0]
+    while len(layers) < len(nodes):
+        if not ready:
+            # break a cycle at its first node
+            ready = [min(node for node in nodes if node not in layers)]
+        while ready:
+            node = ready.pop()
+            layers[node] = max((layers[above] + 1 for above in incoming[node] if above in layers), default=0)
+            for below in outgoing[node]:
+                remaining[below] -= 1
+                if (remaining[below] == 0) and (below not in layers):
+                    ready.append(below)
+    return layers
+
+
+def count_crossings(upper: list[int], lower: list[int], neighbours: dict[int, list[int]]) -> int:
+    """Number of crossing edges between two adjacent layers, counted as inversions with a Fenwick tree."""
+    positions = {node: position for position, node in enumerate(lower)}
+    ends = [positions[neighbour] for node in upper for neighbour in sorted(neighbours[node], key=positions.get)]
+
+    tree = [0] * (len(lower) + 1)
+    crossings = 0
+    for count, end in enumerate(ends):
+        # edges seen so far ending right of this one cross it
+        index, smaller_or_equal = end + 1, 0
+        while index > 0:
+            smaller_or_equal += tree[index]
+            index -= index & -index
+        crossings += count - smaller_or_equal
+        index = end + 1
+        while index <= len(lower):
+            tree[index] += 1
+            index += index & -index
+    return crossings
+
+
+def _sort_by_barycenter(layer: list[int], neighbours: dict[int, list[int]], positions: dict[int, int]) -> list[int]:
+    keys = {}
+    for position, node in enumerate(layer):
+        adjacent = neighbours[node]
+        # nodes without neighbours keep their position
+        keys[node] = sum(positions[other] for other in adjacent) / len(adjacent) if adjacent else position
+    return sorted(layer, key=keys.__getitem__)
+
+
+def order_layers(layers: list[list[int]], up: dict[int, list[int]], down: dict[int, list[int]]) -> list[list[int]]:
+    """Reduce crossings with alternating downward and upward barycenter sweeps, the best ordering is kept."""
+
+    def total_crossings(ordering: list[list[int]]) -> int:
+        return sum(count_crossings(ordering[i], ordering[i + 1], down) for i in range(len(ordering) - 1))
+
+    best, best_crossings = [list(layer) for layer in layers], total_crossings(layers)
+    current = [list(layer) for layer in layers]
+    for _ in range(ORDERING_SWEEPS):
+        if best_crossings == 0:
+            break
+        for index in range(1, len(current)):
+            positions = {node: position for position, node in enumerate(current[index - 1])}
+            current[index] = _sort_by_barycenter(current[index], up, positions)
+        for index in range(len(current) - 2, -1, -1):
+            positions = {node: position for position, node in enumerate(current[index + 1])}
+            current[index] = _sort_by_barycenter(current[index], down, positions)
+
+        crossings = total_crossings(current)
+        if crossings < best_crossings:
+            best, best_crossings = [list(layer) for layer in current], crossings
+    return best
+
+
+def place_layer(desired: list[float], gaps: list[float]) -> list[float]:
+    """Centers as close as possible to the desired ones, where neighbours i and i + 1 are at least gaps[i] apart.
+
+    Pushing the nodes to the right and to the left gives two feasible placements, their mean is feasible as well and
+    does not favour either side.
+    """
+    rightwards = list(desired)
+    for i in range(1, len(rightwards)):
+        rightwards[i] = max(rightwards[i], rightwards[i - 1] + gaps[i - 1])
+    leftwards = list(desired)
+    for i in range(len(leftwards) - 2, -1, -1):
+        leftwards[i] = min(leftwards[i], leftwards[i + 1] - gaps[i])
+    return [(right + left) / 2 for right, left in zip(rightwards, leftwards)]
+
+
+def assign_coordinates(
+    layers: list[list[int]], widths: dict[int, float], up: dict[int, list[int]], down: dict[int, list[int]]
+) -> dict[int, float]:
+    """Horizontal centers of the nodes, every node is pulled towards the barycenter of its neighbours."""
+    centers: dict[int, float] = {}
+    gaps = []
+    for layer in layers:
+        layer_gaps = [(widths[left] + widths[right]) / 2 + HORIZONTAL_GAP for left, right in zip(layer, layer[1:])]
+        gaps.append(layer_gaps)
+        x = 0.0
+        for node, gap in zip(layer, [0.0, *layer_gaps]):
+            x += gap
+            centers[node] = x
+
+    for sweep in range(PLACEMENT_SWEEPS):
+        downwards = sweep % 2 == 0
+        indices = range(1, len(layers)) if downwards else range(len(layers) - 2, -1, -1)
+        neighbours = up if downwards else down
+        for index in indices:
+            desired = []
+            for node in layers[index]:
+                adjacent = neighbours[node]
+                desired.append(sum(centers[other] for other in adjacent) / len(adjacent) if adjacent else centers[node])
+            for node, center in zip(layers[index], place_layer(desired, gaps[index])):
+                centers[node] = center
+    return centers
+
+
+def _layout_component(
+    component: _Component, sizes: list[Point], edges: list[tuple[int, int]], edge_indices: list[int], first_dummy: int
+) -> int:
+    """Lay out a component, its dummy nodes are numbered from first_dummy on. Returns the next unused dummy index."""
+    layer_of = assign_layers(component.nodes, [edges[index] for index in edge_indices])
+
+    widths = {node: sizes[node][0] for node in component.nodes}
+    heights = {node: sizes[node][1] for node in component.nodes}
+    up: dict[int, list[int]] = {node: [] for node in component.nodes}
+    down: dict[int, list[int]] = {node: [] for node in component.nodes}
+
+    # split edges spanning several layers with dummy nodes, dummies get indices after the real nodes, which are unique
+    # across all components since their positions end up in one mapping
+    next_dummy = first_dummy
+    for index in edge_indices:
+        source, target = edges[index]
+        if layer_of[source] <= layer_of[target]:
+            # edge closing a cycle or a self reference, drawn as a straight line
+            component.routes[index] = [source, target]
+            continue
+
+        route = [source]
+        for layer in range(layer_of[source] - 1, layer_of[target], -1):
+            dummy = next_dummy
+            next_dummy += 1
+            layer_of[dummy] = layer
+            widths[dummy], heights[dummy] = DUMMY_WIDTH, 0.0
+            up[dummy], down[dummy] = [], []
+            route.append(dummy)
+        route.append(target)
+        component.routes[index] = route
+
+        for lower, upper in zip(route, route[1:]):
+            up[lower].append(upper)
+            down[upper].append(lower)
+
+    layers: list[list[int]] = [[] for _ in range(max(layer_of.values()) + 1)]
+    for node in sorted(layer_of):
+        layers[layer_of[node]].append(node)
+
+    component.layers = order_layers(layers, up=up, down=down)
+    centers = assign_coordinates(component.layers, widths=widths, up=up, down=down)
+
+    left = min(centers[node] - widths[node] / 2 for node in centers)
+    y = 0.0
+    for layer in component.layers:
+        layer_height = max(heights[node] for node in layer)
+        for node in layer:
+            # nodes are aligned at the bottom of the layer, such that the edges to the bases start at the same height
+            component.positions[node] = (centers[node] - widths[node] / 2 - left, y + layer_height - heights[node])
+            if node >= len(sizes):
+                # edges pass a layer vertically at their dummy node
+                component.positions[node] = (centers[node] - left, y)
+                component.layer_heights[node] = layer_height
+        y += layer_height + VERTICAL_GAP
+    component.width = max(centers[node] + widths[node] / 2 for node in centers) - left
+    component.height = y - VERTICAL_GAP
+    return next_dummy
+
+
+def layout_graph(sizes: list[Point], edges: list[tuple[int, int]]) -> Layout:
+    """Lay out a directed graph with the targets of the edges above their sources.
+
+    Args:
+        sizes (list[Point]): width and height of every node
+        edges (list[tuple[int, int]]): edges as (source, target) node indices, e.g. (class, base)
+
+    Returns:
+        Layout: positions of the nodes and the routes of the edges in the order they were given
+    """
+    components = [_Component(nodes=nodes) for nodes in get_components(len(sizes), edges)]
+    component_of = {node: index for index, component in enumerate(components) for node in component.nodes}
+    edge_indices: list[list[int]] = [[] for _ in components]
+    for index, (source, _) in enumerate(edges):
+        edge_indices[component_of[source]].append(index)
+
+    next_dummy = len(sizes)
+    for component, indices in zip(components, edge_indices):
+        next_dummy = _layout_component(
+            component, sizes=sizes, edges=edges, edge_indices=indices, first_dummy=next_dummy
+        )
+
+    # pack the components into rows of roughly the width of a square picture
+    area = sum((component.width + COMPONENT_GAP) * (component.height + COMPONENT_GAP) for component in components)
+    row_width = max([math.sqrt(area)] + [component.width for component in components])
+
+    positions: list[Point] = [(0.0, 0.0)] * len(sizes)
+    all_positions: dict[int, Point] = {}
+    x = y = row_height = width = 0.0
+    for component in components:
+        if (x > 0) and (x + component.width > row_width):
+            x, y, row_height = 0.0, y + row_height + COMPONENT_GAP, 0.0
+        for node, (node_x, node_y) in component.positions.items():
+            all_positions[node] = (x + node_x, y + node_y)
+        width = max(width, x + component.width)
+        row_height = max(row_height, component.height)
+        x += component.width + COMPONENT_GAP
+
+    for node in range(len(sizes)):
+        positions[node] = all_positions[node]
+
+    routes: list[list[Point]] = []
+    for index, (source, target) in enumerate(edges):
+        component = components[component_of[source]]
+        points = [(positions[source][0] + sizes[source][0] / 2, positions[source][1])]
+        for dummy in component.routes[index][1:-1]:
+            dummy_x, dummy_y = all_positions[dummy]
+            points.append((dummy_x, dummy_y + component.layer_heights[dummy]))
+            points.append((dummy_x, dummy_y))
+        points.append((positions[target][0] + sizes[target][0] / 2, positions[target][1] + sizes[target][1]))
+        routes.append(points)
+
+    return Layout(positions=positions, routes=routes, width=width, height=y + row_height)
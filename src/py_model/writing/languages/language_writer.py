@@ -1,9 +1,31 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING
+
 from ..writer import Writer
 
+if TYPE_CHECKING:
+    from py_model.parsing import BuildingBlock
+
 
 class LanguageWriter(Writer):
     pass
 
 
 class TypeScriptWriter(LanguageWriter):
-    pass
+    supports_split = True
+    supports_stream = True
+
+    def render(self, block: BuildingBlock) -> Iterator[str]:
+        return block.iter_typescript()
+
+    def render_module(self, block: BuildingBlock) -> Iterator[str]:
+        return block.iter_typescript(export=True)
+
+    def render_imports(self, imports: dict[str, list[tuple[str, str]]]) -> Iterable[str]:
+        for path, names in imports.items():
+            specifiers = ", ".join(name if name == alias else f"{name} as {alias}" for name, alias in names)
+            yield f'import type {{ {specifiers} }} from "{path}";\n'
+        if imports:
+            yield "\n"
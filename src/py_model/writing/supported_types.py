@@ -1,9 +1,39 @@
+from __future__ import annotations
+
+import os
 from enum import Enum
+from functools import cache
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .writer import Writer
+
 
-from .graphs.graph_writer import DotWriter
-from .languages.language_writer import TypeScriptWriter
+@cache
+def load_writer(path: str) -> Writer:
+    """Import and instantiate the writer of a dotted path once, e.g. `py_model.writing.graphs.graph_writer.DotWriter`."""
+    module, _, name = path.rpartition(".")
+    return getattr(import_module(module), name)()
 
 
 class SupportedTypes(Enum):
-    ts = TypeScriptWriter()
-    dot = DotWriter()
+    """Supported output types by file extension, the writer of a type is only imported once it is used."""
+
+    ts = "py_model.writing.languages.language_writer.TypeScriptWriter"
+    dot = "py_model.writing.graphs.graph_writer.DotWriter"
+    svg = "py_model.writing.graphs.diagram_writer.SvgWriter"
+    png = "py_model.writing.graphs.diagram_writer.PngWriter"
+
+    @property
+    def writer(self) -> Writer:
+        return load_writer(self.value)
+
+    @classmethod
+    def from_path(cls, file_path: str) -> SupportedTypes:
+        """Get the supported type from the extension of a file path."""
+        _, ext = os.path.splitext(file_path)
+        try:
+            return cls[ext.removeprefix(".")]
+        except KeyError as error:
+            raise ValueError(f"Unsupported output file type: {ext}") from error
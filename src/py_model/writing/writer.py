@@ -1,10 +1,103 @@
-from dataclasses import dataclass
+from __future__ import annotations
 
+import io
+import os
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager, suppress
+from typing import TYPE_CHECKING, TextIO
 
-@dataclass
-class Writer:
-    text: str = ""
+if TYPE_CHECKING:
+    from py_model.parsing import BuildingBlock
+    from py_model.symbols import SymbolTable
 
-    def write(self, file_path: str):
-        with open(file_path, "w") as file:
-            file.write(self.text)
+# larger than the default buffer, such that the many small chunks result in few system calls
+BUFFER_SIZE = 1024 * 1024
+
+
+@contextmanager
+def replace_on_success(file_path: str) -> Iterator[str]:
+    """Path of a temporary file next to file_path, which replaces file_path once the block finished without errors.
+
+    On errors the temporary file is removed, hence an existing file_path is kept instead of being left truncated.
+    """
+    tmp_path = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        yield tmp_path
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, file_path)
+
+
+class Writer(ABC):
+    """Streams the chunks of building blocks into a text stream, without building the whole output in memory."""
+
+    # writers that can reuse work of earlier runs (e.g. diagram layouts) store it within this directory
+    cache_directory: str | None = None
+    # whether the output is binary, such that it can only be written to a file with write_file
+    binary: bool = False
+    # whether the writer can write one file per module, see write_module
+    supports_split: bool = False
+    # whether every block is rendered on its own, such that blocks can be written as they are parsed (--stream)
+    supports_stream: bool = False
+
+    def check(self) -> None:
+        """Raise an error if the writer can not be used, called before parsing such that it fails early."""
+
+    def header(self) -> Iterable[str]:
+        return ()
+
+    def footer(self) -> Iterable[str]:
+        return ()
+
+    @abstractmethod
+    def render(self, block: BuildingBlock) -> Iterator[str]:
+        """Chunks of a single block."""
+
+    def write(self, blocks: Iterable[BuildingBlock], stream: TextIO, symbols: SymbolTable | None = None) -> None:
+        """Write the blocks, symbols resolves the names the blocks refer to for writers that draw references."""
+        stream.writelines(self.header())
+        for block in blocks:
+            stream.writelines(self.render(block))
+        stream.writelines(self.footer())
+
+    def render_imports(self, imports: dict[str, list[tuple[str, str]]]) -> Iterable[str]:
+        """Chunks importing the classes of other modules, see write_module. Formats without imports write none."""
+        return ()
+
+    def render_module(self, block: BuildingBlock) -> Iterator[str]:
+        """Chunks of a block within a file of a split output, the same as render unless it needs e.g. exports."""
+        return self.render(block)
+
+    def write_module(
+        self, blocks: Iterable[BuildingBlock], imports: dict[str, list[tuple[str, str]]], stream: TextIO
+    ) -> None:
+        """Write the blocks of a single module of a split output.
+
+        The imports map the path of every imported file, relative to the written file and without its extension, to
+        the imported names together with the names they are used by.
+        """
+        stream.writelines(self.render_imports(imports))
+        for block in blocks:
+            stream.writelines(self.render_module(block))
+
+    def write_file(self, blocks: Iterable[BuildingBlock], file_path: str, symbols: SymbolTable | None = None) -> None:
+        with replace_on_success(file_path) as tmp_path, open(tmp_path, "w", buffering=BUFFER_SIZE) as file:
+            self.write(blocks=blocks, stream=file, symbols=symbols)
+
+    def get_string(self, blocks: Iterable[BuildingBlock], symbols: SymbolTable | None = None) -> str:
+        stream = io.StringIO()
+        self.write(blocks=blocks, stream=stream, symbols=symbols)
+        return stream.getvalue()
+
+
+class TextWriter(Writer):
+    """Plain text representation of the building blocks, used when printing to stdout."""
+
+    supports_stream = True
+
+    def render(self, block: BuildingBlock) -> Iterator[str]:
+        yield str(block)
+        yield "\n"
@@ -0,0 +1,15 @@
+import pytest
+
+from py_model.defaults import DEFAULT_CACHE_DIR
+from py_model.parser import parser, serve_parser
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path):
+    """Keep the parse cache of tests calling main out of the working directory."""
+    directory = str(tmp_path / DEFAULT_CACHE_DIR)
+    for argument_parser in (parser, serve_parser):
+        argument_parser.set_defaults(cache_dir=directory)
+    yield directory
+    for argument_parser in (parser, serve_parser):
+        argument_parser.set_defaults(cache_dir=DEFAULT_CACHE_DIR)
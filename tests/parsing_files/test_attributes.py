@@ -1,5 +1,7 @@
 import ast
 
+import pytest
+
 from py_model.parsing import Attribute, Attributes
 from py_model.parsing.type_hints import String, Undefined
 
@@ -61,3 +63,19 @@ def test_adding_attribute():
     # we excpet only one attribute
     assert len(attributes.attributes) == 1
     assert attributes.attributes[0] == attribute_with_th
+
+
+def test_lookup_keeps_insertion_order():
+    attributes = Attributes(attributes=[Attribute(name=f"attr_{index}", dtype=Undefined()) for index in range(100)])
+
+    assert len(attributes) == 100
+    assert "attr_42" in attributes
+    assert attributes.get("attr_42") is attributes.attributes[42]
+    assert [attr.name for attr in attributes][:3] == ["attr_0", "attr_1", "attr_2"]
+
+
+def test_conflicting_type_hints():
+    attributes = Attributes(attributes=[Attribute(name="name", dtype=String())])
+
+    with pytest.raises(ValueError):
+        attributes.add_attribute(new_attr=Attribute(name="name", dtype=Undefined()))
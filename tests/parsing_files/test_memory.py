@@ -0,0 +1,41 @@
+import gc
+import tracemalloc
+
+from py_model.processing import parse_files
+
+CLASSES_PER_FILE = 100
+FILES = 100
+
+# peak memory allowed for parsing and building 10k classes, including the ast of the file parsed at that moment
+PEAK_BUDGET = 32 * 1024 * 1024
+
+
+def generate_source(file_index: int) -> str:
+    classes = []
+    for class_index in range(CLASSES_PER_FILE):
+        name = f"Model{file_index}_{class_index}"
+        classes.append(
+            f"@dataclass\nclass {name}:\n"
+            "    name: str\n    tags: list[str]\n    scores: dict[str, float]\n    parent: str | None\n\n"
+            "    def greet(self, other: str, times: int) -> str:\n        return self.name\n"
+        )
+    return "from dataclasses import dataclass\n\n\n" + "\n\n".join(classes)
+
+
+def test_memory_per_10k_classes(tmp_path):
+    filepaths = []
+    for file_index in range(FILES):
+        filepath = tmp_path / f"models_{file_index}.py"
+        filepath.write_text(generate_source(file_index))
+        filepaths.append(str(filepath))
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        class_instances = parse_files(filepaths)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(class_instances) == 10_000
+    assert peak < PEAK_BUDGET, f"10k classes: retained {retained / 1024**2:.1f} MiB, peak {peak / 1024**2:.1f} MiB"
@@ -0,0 +1,86 @@
+from py_model.processing import parse_file
+
+nested_source = """
+import sys
+
+
+class Outer:
+    class Inner:
+        class Innermost:
+            pass
+
+    def method(self) -> None:
+        class Local:
+            pass
+
+
+if sys.version_info >= (3, 11):
+    class Conditional:
+        pass
+
+
+def factory():
+    class Created:
+        pass
+"""
+
+
+def test_nested_classes_are_built_once(tmp_path):
+    filepath = tmp_path / "nested.py"
+    filepath.write_text(nested_source)
+
+    classes = parse_file(str(filepath))
+
+    assert [cls.qualname for cls in classes] == [
+        "Outer",
+        "Outer.method.<locals>.Local",
+        "Outer.Inner",
+        "Outer.Inner.Innermost",
+        "Conditional",
+        "factory.<locals>.Created",
+    ]
+    assert [cls.name for cls in classes] == ["Outer", "Local", "Inner", "Innermost", "Conditional", "Created"]
+
+    # the nested classes are the very same objects referenced by their enclosing class
+    outer = classes[0]
+    assert outer.classes[0] is classes[2]
+    assert outer.functions[0].classes[0] is classes[1]
+
+
+async_source = """
+class Service:
+    async def make(self):
+        class Made:
+            class Inner:
+                pass
+
+        async with lock:
+            class Locked:
+                pass
+
+        async for item in items:
+            class Iterated:
+                pass
+
+
+async def create():
+    class Created:
+        pass
+"""
+
+
+def test_classes_within_async_code(tmp_path):
+    filepath = tmp_path / "service.py"
+    filepath.write_text(async_source)
+
+    classes = parse_file(str(filepath))
+
+    assert [cls.qualname for cls in classes] == [
+        "Service",
+        "Service.make.<locals>.Made",
+        "Service.make.<locals>.Made.Inner",
+        "Service.make.<locals>.Locked",
+        "Service.make.<locals>.Iterated",
+        "create.<locals>.Created",
+    ]
+    assert [func.name for func in classes[0].functions] == ["make"]
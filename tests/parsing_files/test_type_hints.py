@@ -0,0 +1,48 @@
+import ast
+import pickle
+
+import pytest
+
+from py_model.parsing.type_hints import CustomClass, Dict, Integer, List, String, Union
+from py_model.utils import handle_type_annotation
+from py_model.writing import SupportedTypes
+
+
+def annotation(source: str) -> ast.expr:
+    return ast.parse(source, mode="eval").body
+
+
+def test_identical_annotations_are_interned():
+    first = handle_type_annotation(annotation("dict[str, list[int]]"))
+    second = handle_type_annotation(annotation("dict[str, list[int]]"))
+
+    assert first is second
+    assert first is Dict([String(), List([Integer()])])
+    assert handle_type_annotation(annotation("Person")) is CustomClass(name="Person")
+
+
+def test_structural_equality():
+    assert List([String()]) == List([String()])
+    assert List([String()]) != List([Integer()])
+    assert Union([String(), Integer()]) != Union([Integer(), String()])
+    assert len({List([String()]), List([String()]), List([Integer()])}) == 2
+
+
+def test_type_hints_are_immutable():
+    with pytest.raises(AttributeError):
+        String().name = "text"
+    with pytest.raises(AttributeError):
+        List([String()]).dtype = Integer()
+
+
+def test_unpickled_type_hints_are_interned():
+    type_hint = Dict([String(), List([Integer()])])
+
+    assert pickle.loads(pickle.dumps(type_hint)) is type_hint
+
+
+def test_rendering_is_memoized():
+    type_hint = List([Dict([String(), Integer()])])
+
+    assert type_hint.get_string(supported_type=SupportedTypes.ts) == "Array<Map<string, number>>"
+    assert type_hint._renderings[SupportedTypes.ts] == "Array<Map<string, number>>"
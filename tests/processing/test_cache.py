@@ -0,0 +1,85 @@
+import os
+
+import pytest
+
+from py_model import processing
+from py_model.__main__ import main
+from py_model.cache import ParseCache
+from py_model.processing import parse_files
+
+model_source = """
+from dataclasses import dataclass
+
+
+@dataclass
+class Person:
+    name: str
+"""
+
+
+@pytest.fixture
+def model_file(tmp_path):
+    filepath = tmp_path / "models.py"
+    filepath.write_text(model_source)
+    return str(filepath)
+
+
+def test_unchanged_file_is_not_parsed(tmp_path, model_file, monkeypatch):
+    cache = ParseCache(directory=str(tmp_path / "cache"))
+    expected = parse_files([model_file], cache=cache)
+    assert cache.misses == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cached file must not be parsed")
+
+    monkeypatch.setattr(processing, "parse_source", fail)
+    assert parse_files([model_file], cache=cache) == expected
+    assert cache.hits == 1
+
+
+def test_changed_file_is_parsed(tmp_path, model_file):
+    cache = ParseCache(directory=str(tmp_path / "cache"))
+    parse_files([model_file], cache=cache)
+
+    with open(model_file, "a") as file:
+        file.write("\n\nclass Company:\n    pass\n")
+
+    classes = parse_files([model_file], cache=cache)
+    assert [cls.name for cls in classes] == ["Person", "Company"]
+    assert cache.misses == 2
+
+
+def test_eviction_keeps_recently_used(tmp_path):
+    cache = ParseCache(directory=str(tmp_path / "cache"))
+    for key in ["old", "new"]:
+        cache.put(key, [])
+    entry_size = os.path.getsize(os.path.join(cache.directory, "new.pickle"))
+
+    # make sure 'old' is the least recently used entry
+    os.utime(os.path.join(cache.directory, "old.pickle"), (0, 0))
+
+    cache.max_size = entry_size
+    cache.evict()
+
+    assert cache.get("old") is None
+    assert cache.get("new") == []
+
+
+def test_clear_cache_cli(tmp_path, model_file):
+    cache_dir = tmp_path / "cache"
+    main(["--files", model_file, "--cache-dir", str(cache_dir), "--output", str(tmp_path / "models.ts")])
+    assert len(os.listdir(cache_dir)) == 1
+
+    (cache_dir / f"model.{'0' * 40}.snapshot").write_text("snapshot")
+    main(["--clear-cache", "--cache-dir", str(cache_dir)])
+    assert os.listdir(cache_dir) == [f"model.{'0' * 40}.snapshot"]
+
+
+def test_clear_cache_keeps_other_files(tmp_path, model_file, monkeypatch):
+    # e.g. the working directory given as cache directory
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "important.txt").write_text("keep")
+    (tmp_path / "data.pickle").write_bytes(b"keep")
+    main(["--files", model_file, "--cache-dir", ".", "--output", str(tmp_path / "models.ts")])
+    main(["--clear-cache", "--cache-dir", "."])
+    assert sorted(os.listdir(tmp_path)) == ["data.pickle", "important.txt", "models.py", "models.ts"]
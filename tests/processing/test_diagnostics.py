@@ -0,0 +1,60 @@
+import json
+import logging
+
+from py_model.__main__ import main
+from py_model.diagnostics import CUSTOM_CLASS, MISSING_INIT
+
+model_source = """
+from dataclasses import dataclass
+
+
+@dataclass
+class Order:
+    customer: Customer
+    seller: Customer
+    items: list[Item]
+
+
+class Customer:
+    pass
+"""
+
+
+def run(tmp_path, *args):
+    main(["--dirs", str(tmp_path / "models"), "--output", str(tmp_path / "models.dot"), *args])
+
+
+def test_warnings_are_deduplicated(tmp_path, caplog):
+    (tmp_path / "models").mkdir()
+    for index in range(3):
+        (tmp_path / "models" / f"models_{index}.py").write_text(model_source)
+    warnings_file = tmp_path / "warnings.json"
+
+    with caplog.at_level(logging.WARNING):
+        run(tmp_path, "--no-cache", "--max-warnings", "1", "--warnings-json", str(warnings_file))
+
+    warnings = json.loads(warnings_file.read_text())
+    assert [(warning["category"], warning["message"], warning["count"]) for warning in warnings] == [
+        (CUSTOM_CLASS, "Setting a type hint: Customer must be a class", 6),
+        (CUSTOM_CLASS, "Setting a type hint: Item must be a class", 3),
+        (MISSING_INIT, "Class Customer does not have an __init__ method.", 3),
+    ]
+    assert warnings[1]["locations"][0].endswith("models_0.py:9")
+
+    messages = [record.getMessage() for record in caplog.records if record.name == "py_model.diagnostics"]
+    assert messages == [
+        f"Setting a type hint: Customer must be a class (6x) [{CUSTOM_CLASS}] first at " + warnings[0]["locations"][0],
+        "... and 2 more distinct warnings.",
+        f"12 warnings ({CUSTOM_CLASS}: 9, {MISSING_INIT}: 3).",
+    ]
+
+
+def test_cached_files_report_warnings(tmp_path):
+    (tmp_path / "models").mkdir()
+    (tmp_path / "models" / "models.py").write_text(model_source)
+    cache_dir = str(tmp_path / "cache")
+
+    for name in ["first.json", "second.json"]:
+        run(tmp_path, "--cache-dir", cache_dir, "--warnings-json", str(tmp_path / name))
+
+    assert json.loads((tmp_path / "second.json").read_text()) == json.loads((tmp_path / "first.json").read_text())
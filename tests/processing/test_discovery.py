@@ -0,0 +1,69 @@
+import os
+
+from py_model.discovery import FileDiscovery
+from py_model.navigation import get_filepath_set
+
+
+def create_tree(root, paths):
+    for path in paths:
+        filepath = root / path
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        filepath.write_text("class Model:\n    pass\n" if path.endswith(".py") else "")
+
+
+def relative(root, filepaths):
+    return sorted(os.path.relpath(filepath, root) for filepath in filepaths)
+
+
+def test_default_pruning_and_gitignore(tmp_path):
+    create_tree(
+        tmp_path,
+        [
+            "models/person.py",
+            "models/person_pb2.py",
+            "models/keep_pb2.py",
+            "models/generated/company.py",
+            "models/README.md",
+            ".venv/lib/site.py",
+            "node_modules/package/setup.py",
+            "models/__pycache__/cached.py",
+        ],
+    )
+    (tmp_path / ".gitignore").write_text("# generated code\ngenerated/\n*_pb2.py\n!keep_pb2.py\n")
+
+    discovery = FileDiscovery()
+    filepaths = get_filepath_set(dirs=[str(tmp_path)], discovery=discovery)
+
+    assert relative(tmp_path, filepaths) == ["models/keep_pb2.py", "models/person.py"]
+    assert discovery.stats.pruned_directories == 4
+    assert discovery.stats.ignored_files == 1
+
+    # without ignore rules everything is found
+    filepaths = get_filepath_set(dirs=[str(tmp_path)], discovery=FileDiscovery(use_ignore_files=False))
+    assert len(filepaths) == 7
+
+
+def test_anchored_gitignore_pattern(tmp_path):
+    create_tree(tmp_path, ["src/models.py", "models.py", "src/nested/src/models.py"])
+    (tmp_path / ".gitignore").write_text("/src/models.py\n")
+
+    filepaths = get_filepath_set(dirs=[str(tmp_path)])
+
+    assert relative(tmp_path, filepaths) == ["models.py", "src/nested/src/models.py"]
+
+
+def test_include_exclude_and_prefilter(tmp_path):
+    create_tree(tmp_path, ["app/models.py", "app/migrations/0001.py", "app/tests/test_models.py", "app/helpers.py"])
+    (tmp_path / "app" / "helpers.py").write_text("def help():\n    pass\n")
+
+    discovery = FileDiscovery(exclude=["migrations", "test_*.py"], prefilter=True)
+    filepaths = get_filepath_set(dirs=[str(tmp_path)], discovery=discovery)
+
+    assert relative(tmp_path, filepaths) == ["app/models.py"]
+    assert discovery.stats.pruned_directories == 1
+    assert discovery.stats.excluded_files == 1
+    assert discovery.stats.prefiltered_files == 1
+
+    discovery = FileDiscovery(include=["*/tests/*"])
+    filepaths = get_filepath_set(dirs=[str(tmp_path)], discovery=discovery)
+    assert relative(tmp_path, filepaths) == ["app/tests/test_models.py"]
@@ -0,0 +1,121 @@
+import os
+
+import pytest
+
+from py_model.__main__ import main
+from py_model.import_graph import find_reachable_files, iter_imported_modules, scan_imports
+from py_model.navigation import get_filepath_set
+
+scanned_source = b'''
+"""Models of the app.
+
+import statements in docstrings are no imports
+"""
+import os, sys as system
+from typing import (
+    TYPE_CHECKING,
+    Any,
+)
+from . import \\
+    base
+
+if TYPE_CHECKING:
+    from ..core.base import Base
+
+
+class Model:
+    pass
+'''
+
+tree = {
+    "src/app/__init__.py": "",
+    "src/app/models/__init__.py": "from .user import User\n",
+    "src/app/models/user.py": """
+from dataclasses import dataclass
+
+import app.util.helpers
+from ..core.base import Base
+
+
+@dataclass
+class User(Base):
+    name: str
+""",
+    "src/app/core/__init__.py": "",
+    "src/app/core/base.py": """
+class Base:
+    def __init__(self):
+        self.id: int = 0
+""",
+    "src/app/util/__init__.py": "",
+    "src/app/util/helpers.py": "import json\n",
+    "src/app/unused.py": "class Unused:\n    pass\n",
+    "src/tests/test_user.py": "from app.models import User\n\n\nclass TestUser:\n    pass\n",
+    "src/scripts/migrate.py": "import app\n",
+}
+
+
+@pytest.fixture
+def source_root(tmp_path):
+    for path, source in tree.items():
+        os.makedirs(tmp_path / os.path.dirname(path), exist_ok=True)
+        (tmp_path / path).write_text(source)
+    return tmp_path / "src"
+
+
+def test_scan_imports():
+    imports = [
+        (type(node).__name__, getattr(node, "module", None), node.level if hasattr(node, "level") else 0)
+        for node in scan_imports(scanned_source)
+    ]
+    assert imports == [
+        ("Import", None, 0),
+        ("ImportFrom", "typing", 0),
+        ("ImportFrom", None, 1),
+        ("ImportFrom", "core.base", 2),
+    ]
+
+
+def test_iter_imported_modules():
+    (node,) = scan_imports(b"from ..core.base import Base, helpers")
+    assert list(iter_imported_modules(node, package="app.models")) == [
+        "app",
+        "app.core",
+        "app.core.base",
+        "app.core.base.Base",
+        "app",
+        "app.core",
+        "app.core.base",
+        "app.core.base.helpers",
+        "app",
+        "app.core",
+        "app.core.base",
+    ]
+
+
+def test_find_reachable_files(source_root):
+    filepaths = get_filepath_set(dirs=[str(source_root)])
+    reachable = find_reachable_files(["app.models"], filepaths=filepaths, roots=[str(source_root)])
+    assert sorted(os.path.relpath(path, source_root) for path in reachable) == [
+        "app/__init__.py",
+        "app/core/__init__.py",
+        "app/core/base.py",
+        "app/models/__init__.py",
+        "app/models/user.py",
+        "app/util/__init__.py",
+        "app/util/helpers.py",
+    ]
+
+    with pytest.raises(ValueError, match="Entry module app.missing was not found"):
+        find_reachable_files(["app.missing"], filepaths=filepaths, roots=[str(source_root)])
+
+
+def test_entry_option(source_root, tmp_path, caplog):
+    output = tmp_path / "models.dot"
+    main(["--dirs", str(source_root), "--entry", "app.models", "--no-cache", "-v", "-o", str(output)])
+
+    assert "Skipped 3 of 10 files not imported by the entry modules, parsing 7." in caplog.text
+    content = output.read_text()
+    assert '"app.models.user.User" -> "app.core.base.Base"' in content
+    assert "Unused" not in content
+    assert "TestUser" not in content
@@ -0,0 +1,175 @@
+import io
+import json
+
+import pytest
+
+from py_model.__main__ import main
+from py_model.ir import IR_VERSION, IrWriter, decode_type_hint, encode_type_hint, iter_ir
+from py_model.parsing import Class
+from py_model.parsing.type_hints import (
+    Boolean,
+    CustomClass,
+    Dict,
+    Float,
+    Integer,
+    List,
+    NoneType,
+    Set,
+    String,
+    Tuple,
+    Undefined,
+    Union,
+)
+from py_model.processing import parse_file
+
+model_source = """
+from dataclasses import dataclass
+
+from models import base
+
+
+@dataclass
+class Person(base.Model):
+    name: str
+    friends: list[Person]
+
+    def greet(self, other: Person, times: int) -> str:
+        return "hi"
+
+    @dataclass
+    class Address:
+        street: str | None
+"""
+
+
+@pytest.mark.parametrize(
+    "type_hint",
+    [
+        Undefined(),
+        NoneType(),
+        Boolean(),
+        Integer(),
+        Float(),
+        String(),
+        CustomClass("models.Person"),
+        List(),
+        List(String()),
+        Set(CustomClass("Person")),
+        Dict([String(), List(Integer())]),
+        Tuple([Integer(), Float(), Boolean()]),
+        Union([Dict([String(), Integer()]), NoneType()]),
+    ],
+)
+def test_type_hint_round_trip(type_hint):
+    encoded = json.loads(json.dumps(encode_type_hint(type_hint)))
+    # type hints are interned, hence decoding results in the very same instance
+    assert decode_type_hint(encoded) is type_hint
+
+
+def test_class_round_trip(tmp_path):
+    filepath = tmp_path / "models.py"
+    filepath.write_text(model_source)
+    classes = parse_file(str(filepath))
+    for cls in classes:
+        cls.module = "models.person"
+
+    stream = io.StringIO(IrWriter().get_string(classes))
+    loaded = list(iter_ir(stream))
+
+    assert [cls.qualname for cls in loaded] == ["Person", "Person.Address"]
+    for original, cls in zip(classes, loaded):
+        assert isinstance(cls, Class)
+        assert cls.module == "models.person"
+        assert cls.inherits_from == original.inherits_from
+        assert cls.attributes == original.attributes
+        assert [str(func) for func in cls.functions] == [str(func) for func in original.functions]
+
+
+def test_ir_is_read_lazily():
+    lines = [json.dumps({"format": "py-model-ir", "version": IR_VERSION}), "{not json"]
+    classes = iter_ir(io.StringIO("\n".join(lines)))
+    # the invalid line is only decoded once its class is requested
+    with pytest.raises(ValueError):
+        next(classes)
+
+
+def test_ir_version_check():
+    with pytest.raises(ValueError, match="not a py-model IR"):
+        list(iter_ir(io.StringIO('{"name": "Person"}\n')))
+    with pytest.raises(ValueError, match="not supported"):
+        list(iter_ir(io.StringIO(json.dumps({"format": "py-model-ir", "version": IR_VERSION + 1}))))
+
+
+def test_emit_and_generate_from_ir(tmp_path):
+    (tmp_path / "models.py").write_text(model_source)
+    ir_file = tmp_path / "models.jsonl"
+    main(["--dirs", str(tmp_path), "--no-cache", "--emit-ir", str(ir_file), "--output", str(tmp_path / "parsed.dot")])
+    main(["--from-ir", str(ir_file), "--output", str(tmp_path / "loaded.dot")])
+
+    assert (tmp_path / "loaded.dot").read_text() == (tmp_path / "parsed.dot").read_text()
+
+
+aliased_files = {
+    "shop/__init__.py": "from .people import Person\n",
+    "shop/people.py": """
+from dataclasses import dataclass
+
+
+@dataclass
+class Person:
+    name: str
+""",
+    "shop/staff.py": """
+from dataclasses import dataclass
+
+from shop import Person as Human
+from .roles import *
+
+
+@dataclass
+class Employee(Human):
+    manager: Human
+    role: Role
+""",
+    "shop/roles.py": """
+from dataclasses import dataclass
+
+
+@dataclass
+class Role:
+    name: str
+""",
+}
+
+
+def test_from_ir_resolves_imports(tmp_path):
+    for name, source in aliased_files.items():
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text(source)
+    # another Person, such that Human can only be resolved through the import
+    (tmp_path / "shop" / "guests.py").write_text(aliased_files["shop/people.py"])
+
+    ir_file = tmp_path / "models.jsonl"
+    parsed = [str(tmp_path / "parsed.dot"), str(tmp_path / "parsed.svg")]
+    main(["--dirs", str(tmp_path / "shop"), "--no-cache", "--emit-ir", str(ir_file), "--output", *parsed])
+    lines = [json.loads(line) for line in ir_file.read_text().splitlines()]
+    assert lines[0]["version"] == 2
+    staff = next(line for line in lines if line.get("module") == "shop.staff" and "imports" in line)
+    assert staff["imports"]["Human"] == "shop.Person"
+    assert staff["star_imports"] == ["shop.roles"]
+
+    loaded = [str(tmp_path / "loaded.dot"), str(tmp_path / "loaded.svg")]
+    main(["--from-ir", str(ir_file), "--output", loaded[0]])
+    content = (tmp_path / "loaded.dot").read_text()
+    assert content == (tmp_path / "parsed.dot").read_text()
+    assert '"shop.staff.Employee" -> "shop.people.Person" [arrowhead=empty];' in content
+    assert '"shop.staff.Employee" -> "shop.roles.Role" [dir=back, arrowtail=diamond];' in content
+
+    main(["--from-ir", str(ir_file), "--output", *loaded])
+    assert (tmp_path / "loaded.svg").read_text() == (tmp_path / "parsed.svg").read_text()
+
+
+@pytest.mark.parametrize("option", [["--root", "Person"], ["--entry", "models"], ["--since", "HEAD"], ["--watch"]])
+def test_from_ir_incompatible_options(tmp_path, option):
+    with pytest.raises(ValueError, match="--from-ir can not be combined"):
+        main(["--from-ir", str(tmp_path / "models.jsonl"), *option])
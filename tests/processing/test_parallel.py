@@ -0,0 +1,63 @@
+import os
+import threading
+
+from py_model import navigation
+from py_model.__main__ import main
+from py_model.navigation import iter_sources
+from py_model.processing import parse_files, parse_modules
+
+model_dir = os.path.join(os.path.dirname(__file__), "..", "..", "example_models", "model_set_1")
+filepaths = [os.path.join(model_dir, filename) for filename in os.listdir(model_dir) if filename.endswith(".py")]
+
+
+def test_parallel_matches_serial():
+    serial = parse_files(filepaths, jobs=1)
+    parallel = parse_files(filepaths, jobs=2)
+
+    assert [cls.name for cls in serial] == ["Company", "Employee", "Person"]
+    assert parallel == serial
+
+
+def test_cli_jobs(tmp_path):
+    output_serial = tmp_path / "serial.dot"
+    output_parallel = tmp_path / "parallel.dot"
+
+    main(["--dirs", model_dir, "--output", str(output_serial), "--no-cache"])
+    main(["--dirs", model_dir, "--output", str(output_parallel), "--jobs", "0", "--no-cache"])
+
+    assert output_parallel.read_text() == output_serial.read_text()
+
+
+def test_read_ahead_matches_serial():
+    serial = parse_modules(filepaths, read_threads=0)
+    read_ahead = parse_modules(filepaths, read_threads=3, read_ahead=1)
+    assert [module.classes for module in read_ahead] == [module.classes for module in serial]
+
+
+def test_read_ahead_is_bounded(tmp_path, monkeypatch):
+    paths = []
+    for index in range(10):
+        path = tmp_path / f"model_{index}.py"
+        path.write_bytes(f"# coding: latin-1\nclass Model{index}: pass\n".encode())
+        paths.append(str(path))
+
+    started = []
+    lock = threading.Lock()
+    read_source = navigation.read_source
+
+    def read_and_record(filepath):
+        with lock:
+            started.append(filepath)
+        return read_source(filepath)
+
+    monkeypatch.setattr(navigation, "read_source", read_and_record)
+    sources = iter_sources(paths, threads=2, read_ahead=3)
+
+    filepath, source = next(sources)
+    assert filepath == paths[0]
+    assert source.startswith(b"# coding: latin-1")
+    # the first file and at most three files read ahead of it
+    assert len(started) <= 4
+
+    assert [filepath for filepath, _ in sources] == paths[1:]
+    assert sorted(started) == sorted(paths)
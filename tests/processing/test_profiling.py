@@ -0,0 +1,44 @@
+import json
+import os
+import pstats
+
+from py_model.__main__ import main
+
+model_dir = os.path.join(os.path.dirname(__file__), "..", "..", "example_models", "model_set_1")
+
+
+def test_profile_report(tmp_path):
+    report_file = tmp_path / "profile.json"
+    stats_file = tmp_path / "profile.stats"
+
+    main(
+        [
+            "--dirs",
+            model_dir,
+            "--output",
+            str(tmp_path / "models.dot"),
+            "--no-cache",
+            "--profile",
+            str(report_file),
+            "--profile-top",
+            "2",
+            "--profile-stats",
+            str(stats_file),
+        ]
+    )
+
+    report = json.loads(report_file.read_text())
+    assert list(report["phases"]) == ["discovery", "parsing", "resolving", "emission"]
+    for measurement in report["phases"].values():
+        assert measurement["wall"] >= 0 and measurement["cpu"] >= 0 and measurement["peak_memory"] > 0
+
+    assert sorted(os.path.basename(measurement["path"]) for measurement in report["files"]) == [
+        "company.py",
+        "employee.py",
+        "person.py",
+    ]
+    assert set(report["steps"]) == {"read", "parse", "build"}
+    assert len(report["slowest_files"]) == 2
+    assert report["slowest_files"][0]["wall"] >= report["slowest_files"][1]["wall"]
+
+    assert pstats.Stats(str(stats_file)).total_calls > 0
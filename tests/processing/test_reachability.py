@@ -0,0 +1,124 @@
+import pytest
+
+from py_model import reachability
+from py_model.__main__ import main
+from py_model.reachability import ReachableModels, index_class_names
+
+sources = {
+    "__init__.py": "from .person import Person\n",
+    "base.py": """
+class Base:
+    def __init__(self):
+        self.id: int = 0
+""",
+    "person.py": """
+from dataclasses import dataclass
+
+from .base import Base
+from . import address
+
+
+@dataclass
+class Person(Base):
+    name: str
+    address: address.Address
+""",
+    "address.py": """
+from dataclasses import dataclass
+
+
+@dataclass
+class Address:
+    street: str
+""",
+    "shipping.py": """
+from dataclasses import dataclass
+
+
+@dataclass
+class Address:
+    port: str
+""",
+    "api.py": """
+from dataclasses import dataclass
+
+from models import Person as Customer
+from .status import Status
+
+
+@dataclass
+class Response:
+    data: list[Customer]
+
+    def get_status(self) -> Status:
+        return Status()
+""",
+    "status.py": """
+class Status:
+    def __init__(self):
+        self.code: int = 200
+""",
+    "unrelated.py": """
+class Noise:
+    def __init__(self):
+        self.level: int = 0
+""",
+}
+
+
+@pytest.fixture
+def package(tmp_path):
+    package = tmp_path / "models"
+    package.mkdir()
+    for name, source in sources.items():
+        (package / name).write_text(source)
+    return package
+
+
+@pytest.fixture
+def parsed_files(monkeypatch):
+    """Names of all files parsed through the reachability module."""
+    parsed = []
+    parse_modules = reachability.parse_modules
+
+    def parse_and_record(filepaths, **kwargs):
+        parsed.extend(filepath.rpartition("/")[2] for filepath in filepaths)
+        return parse_modules(filepaths, **kwargs)
+
+    monkeypatch.setattr(reachability, "parse_modules", parse_and_record)
+    return parsed
+
+
+def test_index_class_names(package):
+    index = index_class_names([str(package / "address.py"), str(package / "shipping.py"), str(package / "api.py")])
+    assert {name: sorted(path.rpartition("/")[2] for path in paths) for name, paths in index.items()} == {
+        "Address": ["address.py", "shipping.py"],
+        "Response": ["api.py"],
+    }
+
+
+def test_select_reachable_classes(package, parsed_files):
+    filepaths = [str(path) for path in package.iterdir()]
+    modules = ReachableModels(filepaths).select(roots=["Response"])
+
+    assert [cls.full_name for module in modules for cls in module.classes] == [
+        "models.address.Address",
+        "models.api.Response",
+        "models.base.Base",
+        "models.person.Person",
+        "models.status.Status",
+    ]
+    # the other Address is parsed as it may have been the one referred to, unrelated files are not parsed at all
+    assert "shipping.py" in parsed_files
+    assert "unrelated.py" not in parsed_files
+
+
+def test_root_option(package, tmp_path, caplog):
+    output = tmp_path / "models.dot"
+    main(
+        ["--dirs", str(package), "--no-cache", "--root", "models.status.Status", "--root", "Missing", "-o", str(output)]
+    )
+
+    assert '"models.status.Status"' in output.read_text()
+    assert "Response" not in output.read_text()
+    assert "Root class Missing was not found." in caplog.text
@@ -0,0 +1,117 @@
+import os
+import threading
+import time
+
+import pytest
+
+from py_model import watch
+from py_model.__main__ import main
+from py_model.client import ServerError, ServerUnavailableError, send_request
+from py_model.serve import Server
+
+model_source = """
+from dataclasses import dataclass
+
+
+@dataclass
+class Person:
+    name: str
+"""
+
+
+@pytest.fixture
+def model_file(tmp_path):
+    filepath = tmp_path / "models.py"
+    filepath.write_text(model_source)
+    return filepath
+
+
+@pytest.fixture
+def server(tmp_path, model_file):
+    server = Server(socket_path=str(tmp_path / "py_model.sock"), files=[str(model_file)], idle_timeout=10)
+    thread = threading.Thread(target=server.run)
+    thread.start()
+
+    deadline = time.monotonic() + 5
+    while not os.path.exists(server.socket_path) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    yield server
+
+    if thread.is_alive():
+        send_request(server.socket_path, {"command": "stop"})
+    thread.join()
+
+
+def test_server_parses_only_on_change(server, model_file, tmp_path):
+    output_file = tmp_path / "models.ts"
+    response = send_request(server.socket_path, {"output": [str(output_file)]})
+    assert not response["changed"]
+    assert "interface Person" in output_file.read_text()
+
+    model_file.write_text(model_source + "    age: int\n")
+    response = send_request(server.socket_path, {"output": [str(output_file)]})
+    assert response["changed"]
+    assert "age: number" in output_file.read_text()
+
+
+def test_server_reports_errors(server, tmp_path):
+    with pytest.raises(ServerError, match="ValueError"):
+        send_request(server.socket_path, {"output": [str(tmp_path / "models.unknown")]})
+    with pytest.raises(ServerError, match="serves the files"):
+        send_request(server.socket_path, {"files": [str(tmp_path / "other.py")]})
+
+    # the server keeps running after an error
+    assert send_request(server.socket_path, {"command": "ping"})["ok"]
+
+
+def test_server_stops_when_idle(tmp_path, model_file):
+    server = Server(socket_path=str(tmp_path / "py_model.sock"), files=[str(model_file)], idle_timeout=0.1)
+    server.run()
+    assert not os.path.exists(server.socket_path)
+    with pytest.raises(ServerUnavailableError):
+        send_request(server.socket_path, {"command": "ping"})
+
+
+def test_connect(server, model_file, capsys):
+    main(["--files", str(model_file), "--connect", server.socket_path])
+    assert "Person" in capsys.readouterr().out
+    assert server.requests == 1
+
+
+def test_connect_without_server(tmp_path, model_file):
+    output_file = tmp_path / "models.ts"
+    main(["--files", str(model_file), "--connect", str(tmp_path / "missing.sock"), "--output", str(output_file)])
+    assert "interface Person" in output_file.read_text()
+
+
+@pytest.mark.parametrize(
+    "option",
+    [
+        ["--root", "Person"],
+        ["--split-output", "out"],
+        ["--emit-ir", "models.jsonl"],
+        ["--stream"],
+        ["--include", "*"],
+        ["--jobs", "2"],
+    ],
+)
+def test_connect_rejects_options_the_server_ignores(server, model_file, option, capsys):
+    with pytest.raises(SystemExit):
+        main(["--files", str(model_file), "--connect", server.socket_path, *option])
+    assert f"{option[0]} not supported with --connect" in capsys.readouterr().err
+    assert server.requests == 0
+
+
+def test_serve_parses_in_one_batch_with_jobs(tmp_path, model_file, monkeypatch):
+    calls = []
+
+    def parse_modules(filepaths, jobs, cache):
+        calls.append((len(filepaths), jobs))
+        return original(filepaths, jobs=1, cache=cache)
+
+    original = watch.parse_modules
+    monkeypatch.setattr(watch, "parse_modules", parse_modules)
+    (tmp_path / "other.py").write_text(model_source.replace("Person", "Company"))
+    socket_path = str(tmp_path / "py_model.sock")
+    main(["serve", "--dirs", str(tmp_path), "--socket", socket_path, "--idle-timeout", "0.1", "--jobs", "2"])
+    assert calls == [(2, 2)]
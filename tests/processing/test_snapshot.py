@@ -0,0 +1,129 @@
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from py_model import snapshot
+from py_model.__main__ import main
+from py_model.git import GitError, get_changed_files, resolve_ref
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+model_source = """
+from dataclasses import dataclass
+
+
+@dataclass
+class Person:
+    name: str
+"""
+
+
+def git(*args, cwd):
+    subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args], cwd=cwd, check=True)
+
+
+@pytest.fixture
+def repository(tmp_path, monkeypatch):
+    (tmp_path / "models").mkdir()
+    (tmp_path / "models" / "person.py").write_text(model_source)
+    (tmp_path / "models" / "company.py").write_text(model_source.replace("Person", "Company"))
+    (tmp_path / "README.md").write_text("models")
+    git("init", "--quiet", cwd=tmp_path)
+    git("add", ".", cwd=tmp_path)
+    git("commit", "--quiet", "-m", "models", cwd=tmp_path)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def parsed_files(monkeypatch):
+    """Names of the files parsed by every call of parse_modules_since."""
+    calls = []
+    parse_modules = snapshot.parse_modules
+
+    def parse_and_record(filepaths, **kwargs):
+        calls.append(sorted(filepath.rpartition("/")[2] for filepath in filepaths))
+        return parse_modules(filepaths, **kwargs)
+
+    monkeypatch.setattr(snapshot, "parse_modules", parse_and_record)
+    return calls
+
+
+def test_changed_files(repository):
+    assert get_changed_files("HEAD") == set()
+    (repository / "models" / "company.py").write_text(model_source)
+    (repository / "models" / "new.py").write_text(model_source)
+    (repository / "models" / "person.py").unlink()
+    (repository / "README.md").write_text("changed")
+    assert {path.rpartition("/")[2] for path in get_changed_files("HEAD")} == {"company.py", "new.py", "person.py"}
+
+    with pytest.raises(GitError, match="Unknown git ref"):
+        resolve_ref("does-not-exist")
+
+
+def test_since_parses_only_changed_files(repository, parsed_files):
+    args = ["--dirs", "models", "--since", "HEAD", "--no-cache", "--output", "models.ts"]
+
+    # the first run has no snapshot yet
+    main(args)
+    assert parsed_files[-1] == ["company.py", "person.py"]
+    base = resolve_ref("HEAD")
+
+    (repository / "models" / "company.py").write_text(model_source.replace("Person", "Employer"))
+    git("commit", "--quiet", "-am", "rename", cwd=repository)
+    (repository / "models" / "person.py").unlink()
+    (repository / "models" / "team.py").write_text(model_source.replace("Person", "Team"))
+
+    main([*args[:3], base, *args[4:]])
+    assert parsed_files[-1] == ["company.py", "team.py"]
+    output = (repository / "models.ts").read_text()
+    assert "interface Employer" in output
+    assert "interface Team" in output
+    assert "interface Person" not in output
+
+
+def test_since_with_uncommitted_changes(repository, parsed_files):
+    args = ["--dirs", "models", "--since", "HEAD", "--no-cache", "--output", "models.ts"]
+    (repository / "models" / "person.py").write_text(model_source + "    age: int\n")
+    main(args)
+    main(args)
+
+    # the model with uncommitted changes is not saved as snapshot, hence the second run has to parse all files again
+    assert parsed_files == [["company.py", "person.py"], ["company.py", "person.py"]]
+    assert "age: number" in (repository / "models.ts").read_text()
+
+
+def test_since_keeps_a_snapshot_per_commit(repository, parsed_files):
+    args = ["--dirs", "models", "--no-cache", "--output", "models.ts"]
+    base = resolve_ref("HEAD")
+    main([*args, "--since", base])
+
+    (repository / "models" / "company.py").write_text(model_source.replace("Person", "Employer"))
+    git("commit", "--quiet", "-am", "rename", cwd=repository)
+    # saves the snapshot of the new commit next to the one of base
+    main([*args, "--since", base])
+    (repository / "models" / "person.py").write_text(model_source + "    age: int\n")
+    # neither of the snapshots is replaced by the model with uncommitted changes
+    main([*args, "--since", base])
+    main([*args, "--since", "HEAD"])
+
+    assert parsed_files == [["company.py", "person.py"], ["company.py"], ["company.py", "person.py"], ["person.py"]]
+    snapshots = sorted(path.name for path in (repository / ".py_model_cache").iterdir())
+    assert snapshots == sorted(f"model.{commit}.snapshot" for commit in (base, resolve_ref("HEAD")))
+
+
+def test_prune_snapshots(tmp_path):
+    for index, commit in enumerate(["a" * 40, "b" * 40, "c" * 40]):
+        path = tmp_path / f"model.{commit}.snapshot"
+        path.write_text("snapshot")
+        os.utime(path, (index, index))
+    (tmp_path / "other.txt").write_text("other")
+
+    snapshot.prune_snapshots(str(tmp_path), keep=2)
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        f"model.{'b' * 40}.snapshot",
+        f"model.{'c' * 40}.snapshot",
+        "other.txt",
+    ]
@@ -0,0 +1,62 @@
+import logging
+import subprocess
+import sys
+
+# slow to import and only needed by some options, hence imported where they are used
+HEAVY_MODULES = ["concurrent.futures", "multiprocessing", "subprocess"]
+
+
+def run_python(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+
+def test_help_imports_no_backends():
+    code = "\n".join(
+        [
+            "import sys",
+            "from py_model.__main__ import main",
+            "try:",
+            "    main(['--help'])",
+            "except SystemExit:",
+            "    pass",
+            "print(' '.join(sys.modules))",
+        ]
+    )
+    modules = run_python(code).stdout.split()
+
+    assert "py_model.parser" in modules
+    for module in ["py_model.parsing", "py_model.writing", "py_model.processing", "concurrent.futures.process"]:
+        assert module not in modules
+
+
+def test_import_has_no_side_effects():
+    code = "\n".join(
+        [
+            "import logging, sys",
+            "hook = sys.excepthook",
+            "import py_model.processing, py_model.watch, py_model.writing",
+            "root = logging.getLogger()",
+            "print(root.level, len(root.handlers), sys.excepthook is hook)",
+        ]
+    )
+    assert run_python(code).stdout.split() == [str(logging.WARNING), "0", "True"]
+
+
+def test_import_loads_no_heavy_modules():
+    code = "\n".join(
+        [
+            "import sys",
+            "startup = set(sys.modules)",
+            "import py_model.__main__",
+            "cli = set(sys.modules)",
+            "import py_model.processing, py_model.watch, py_model.writing",
+            "print(' '.join(cli - startup), '|', ' '.join(set(sys.modules) - startup))",
+        ]
+    )
+    # modules imported by the interpreter itself (e.g. by site) are not counted
+    cli, processing = (part.split() for part in run_python(code).stdout.split("|"))
+
+    for module in ["ast", "json", "py_model.parsing", "py_model.processing", *HEAVY_MODULES]:
+        assert module not in cli
+    for module in HEAVY_MODULES:
+        assert module not in processing
@@ -0,0 +1,81 @@
+import pytest
+
+from py_model.__main__ import main
+from py_model.processing import iter_modules, parse_modules, prepare_stream_outputs, stream_outputs
+
+model_source = """
+from dataclasses import dataclass
+
+
+@dataclass
+class {name}:
+    name: str
+    tags: list[str]
+
+    @dataclass
+    class Address:
+        street: str | None
+"""
+
+
+@pytest.fixture
+def filepaths(tmp_path):
+    paths = []
+    for index in range(5):
+        path = tmp_path / "models" / f"model_{index}.py"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(model_source.format(name=f"Model{index}"))
+        paths.append(str(path))
+    return paths
+
+
+def test_iter_modules_matches_parse_modules(filepaths):
+    streamed = list(iter_modules(reversed(filepaths)))
+    parsed = parse_modules(filepaths)
+    assert [module.filepath for module in streamed] == [module.filepath for module in parsed]
+    assert [module.name for module in streamed] == [module.name for module in parsed]
+    assert [str(cls) for module in streamed for cls in module.classes] == [
+        str(cls) for module in parsed for cls in module.classes
+    ]
+
+
+def test_iter_modules_is_lazy(filepaths):
+    modules = iter_modules(filepaths, read_threads=0)
+    first = next(modules)
+    assert first.filepath == filepaths[0]
+    modules.close()
+
+
+def test_stream_outputs_iterates_once(filepaths, tmp_path):
+    classes = (cls for module in iter_modules(filepaths) for cls in module.classes)
+    count = stream_outputs(classes, output_files=[str(tmp_path / "model.ts"), str(tmp_path / "copy.ts")])
+    assert count == 10
+    assert (tmp_path / "model.ts").read_text().count("interface") == 10
+    assert (tmp_path / "copy.ts").read_text() == (tmp_path / "model.ts").read_text()
+
+
+def test_stream_rejects_outputs_needing_all_classes(tmp_path):
+    prepare_stream_outputs([str(tmp_path / "model.ts"), str(tmp_path / "copy.ts")])
+    prepare_stream_outputs([])
+    with pytest.raises(ValueError, match="can not be streamed"):
+        prepare_stream_outputs([str(tmp_path / "model.dot")])
+
+
+def test_stream_matches_regular_output(filepaths, tmp_path):
+    directory = str(tmp_path / "models")
+    main(["--dirs", directory, "--no-cache", "--output", str(tmp_path / "regular.ts")])
+    main(["--dirs", directory, "--no-cache", "--stream", "--output", str(tmp_path / "streamed.ts")])
+    assert (tmp_path / "streamed.ts").read_text() == (tmp_path / "regular.ts").read_text()
+
+
+def test_stream_with_cache(filepaths, tmp_path):
+    directory = str(tmp_path / "models")
+    arguments = ["--dirs", directory, "--cache-dir", str(tmp_path / "cache"), "--stream"]
+    main([*arguments, "--output", str(tmp_path / "first.ts")])
+    main([*arguments, "--output", str(tmp_path / "second.ts")])
+    assert (tmp_path / "second.ts").read_text() == (tmp_path / "first.ts").read_text()
+
+
+def test_stream_incompatible_options(filepaths, tmp_path):
+    with pytest.raises(ValueError, match="--stream can not be combined"):
+        main(["--dirs", str(tmp_path / "models"), "--no-cache", "--stream", "--root", "Model0"])
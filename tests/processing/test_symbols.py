@@ -0,0 +1,115 @@
+import logging
+
+import pytest
+
+from py_model.navigation import get_package
+from py_model.processing import parse_modules
+from py_model.symbols import SymbolTable
+
+project = {
+    "shop/__init__.py": "from .people import Person\n",
+    "shop/people.py": """
+from dataclasses import dataclass
+
+
+@dataclass
+class Person:
+    name: str
+""",
+    "shop/staff.py": """
+import shop.people as people
+from shop import Person as Human
+from enum import Enum
+from dataclasses import dataclass
+
+
+@dataclass
+class Employee(Human):
+    boss: people.Person
+
+
+class Role(Enum):
+    ADMIN = 1
+""",
+    "shop/orders/order.py": """
+from ..people import Person
+from ..staff import *
+from dataclasses import dataclass
+
+
+@dataclass
+class Order:
+    customer: Person
+    seller: Employee
+    supplier: Supplier
+""",
+}
+
+
+@pytest.fixture
+def symbols(tmp_path):
+    for name, source in project.items():
+        filepath = tmp_path / name
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        filepath.write_text(source)
+    (tmp_path / "shop" / "orders" / "__init__.py").write_text("")
+
+    modules = parse_modules([str(path) for path in tmp_path.rglob("*.py")])
+    return SymbolTable(modules)
+
+
+def test_module_qualified_names(symbols):
+    assert set(symbols.classes) == {
+        "shop.people.Person",
+        "shop.staff.Employee",
+        "shop.staff.Role",
+        "shop.orders.order.Order",
+    }
+
+
+def test_aliases_and_reexports(symbols):
+    person = symbols.classes["shop.people.Person"]
+    employee = symbols.classes["shop.staff.Employee"]
+
+    # from shop import Person as Human, Person is re-exported by shop/__init__.py
+    assert symbols.get_bases(employee) == [person]
+    # import shop.people as people
+    assert symbols.get_referenced_classes(employee.attributes.get("boss").dtype, module=employee.module) == [person]
+
+
+def test_relative_and_star_imports(symbols):
+    order = symbols.classes["shop.orders.order.Order"]
+    assert symbols.resolve("Person", module=order.module) is symbols.classes["shop.people.Person"]
+    assert symbols.resolve("Employee", module=order.module) is symbols.classes["shop.staff.Employee"]
+
+
+def test_unresolved_summary(symbols, caplog):
+    symbols.resolve_all()
+
+    # Enum is imported from outside of the project and not reported
+    assert dict(symbols.unresolved) == {"Supplier": 1}
+
+    with caplog.at_level(logging.WARNING):
+        symbols.report_unresolved()
+    assert len(caplog.records) == 1
+    assert "Supplier (1x)" in caplog.records[0].getMessage()
+
+
+def test_duplicate_module_names(tmp_path):
+    for directory in ["a", "b"]:
+        (tmp_path / directory).mkdir()
+        (tmp_path / directory / "models.py").write_text(project["shop/people.py"])
+    # modules without classes (e.g. conftest.py files) may share a name
+    (tmp_path / "a" / "conftest.py").write_text("")
+    (tmp_path / "b" / "conftest.py").write_text("")
+
+    modules = parse_modules([str(path) for path in tmp_path.rglob("*.py")])
+    with pytest.raises(ValueError, match="have the same module name models"):
+        SymbolTable(modules)
+
+    # as packages, the modules are a.models and b.models
+    (tmp_path / "a" / "__init__.py").write_text("")
+    (tmp_path / "b" / "__init__.py").write_text("")
+    get_package.cache_clear()
+    modules = parse_modules([str(path) for path in tmp_path.rglob("*.py")])
+    assert set(SymbolTable(modules).classes) == {"a.models.Person", "b.models.Person"}
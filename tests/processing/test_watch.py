@@ -0,0 +1,161 @@
+import logging
+import threading
+import time
+
+import pytest
+
+from py_model import watch
+from py_model.__main__ import main
+from py_model.watch import Watcher
+
+model_source = """
+from dataclasses import dataclass
+
+
+@dataclass
+class Person:
+    name: str
+"""
+
+
+def test_update_parses_only_changed_files(tmp_path):
+    (tmp_path / "person.py").write_text(model_source)
+    (tmp_path / "company.py").write_text(model_source.replace("Person", "Company"))
+
+    watcher = Watcher(dirs=[str(tmp_path)])
+    assert watcher.update(watcher.scan())
+    person_models = watcher.modules[str(tmp_path / "person.py")].classes
+
+    # nothing changed
+    assert not watcher.update(watcher.scan())
+
+    (tmp_path / "company.py").write_text(model_source.replace("Person", "Employer"))
+    (tmp_path / "person.py").unlink()
+    (tmp_path / "person_2.py").write_text(model_source)
+    assert watcher.update(watcher.scan())
+
+    assert str(tmp_path / "person.py") not in watcher.modules
+    assert [cls.name for cls in watcher.modules[str(tmp_path / "person_2.py")].classes] == [
+        cls.name for cls in person_models
+    ]
+    assert [cls.name for cls in watcher.modules[str(tmp_path / "company.py")].classes] == ["Employer"]
+
+
+def test_update_reports_warnings_and_resolves(tmp_path, caplog):
+    (tmp_path / "person.py").write_text(model_source)
+    (tmp_path / "employee.py").write_text(
+        "from person import Person as Human\n\n\nclass Employee(Human, Missing):\n    pass\n"
+    )
+
+    watcher = Watcher(dirs=[str(tmp_path)])
+    with caplog.at_level(logging.WARNING):
+        watcher.update(watcher.scan())
+    assert "Class Employee does not have an __init__ method." in caplog.text
+    assert "Could not resolve 1 names" in caplog.text
+    (employee,) = watcher.modules[str(tmp_path / "employee.py")].classes
+    assert watcher.symbols.resolve("Human", module=employee.module) is watcher.get_classes()[-1]
+
+    # unchanged files are not reported again, the model is still resolved
+    caplog.clear()
+    (tmp_path / "person.py").write_text(model_source + "    age: int\n")
+    with caplog.at_level(logging.WARNING):
+        watcher.update(watcher.scan())
+    assert "__init__" not in caplog.text
+    assert "Could not resolve 1 names" in caplog.text
+
+
+def test_update_parses_changed_files_in_one_batch(tmp_path, monkeypatch):
+    for index in range(5):
+        (tmp_path / f"person_{index}.py").write_text(model_source)
+
+    calls = []
+    parse_modules = watch.parse_modules
+    monkeypatch.setattr(
+        watch,
+        "parse_modules",
+        lambda filepaths, **kwargs: calls.append(filepaths) or parse_modules(filepaths, **kwargs),
+    )
+
+    watcher = Watcher(dirs=[str(tmp_path)])
+    watcher.update(watcher.scan())
+    assert len(calls) == 1
+    assert len(watcher.get_classes()) == 5
+
+
+@pytest.mark.parametrize(
+    "broken_source",
+    [
+        "class Person:\n    name: str =\n",  # SyntaxError
+        b"# -*- coding: ascii -*-\nclass Person:\n    name: str = '\xe4'\n",  # bad encoding
+        model_source.replace("name: str", "name: lambda: 1"),  # unsupported annotation
+    ],
+)
+def test_update_keeps_last_valid_model(tmp_path, broken_source, caplog):
+    for name in ["person.py", "company.py", "shop.py"]:
+        (tmp_path / name).write_text(model_source.replace("Person", name.removesuffix(".py").title()))
+
+    watcher = Watcher(dirs=[str(tmp_path)])
+    watcher.update(watcher.scan())
+    assert [cls.name for cls in watcher.get_classes()] == ["Company", "Person", "Shop"]
+
+    if isinstance(broken_source, bytes):
+        (tmp_path / "person.py").write_bytes(broken_source)
+    else:
+        (tmp_path / "person.py").write_text(broken_source)
+    (tmp_path / "shop.py").write_text(model_source.replace("Person", "Store"))
+    assert watcher.update(watcher.scan())
+
+    assert f"Could not parse {tmp_path / 'person.py'}" in caplog.text
+    assert [cls.name for cls in watcher.get_classes()] == ["Company", "Person", "Store"]
+
+
+def test_update_with_duplicate_module_names(tmp_path):
+    for directory in ["a", "b"]:
+        (tmp_path / directory).mkdir()
+    (tmp_path / "a" / "models.py").write_text(model_source)
+    watcher = Watcher(dirs=[str(tmp_path)])
+    watcher.update(watcher.scan())
+
+    (tmp_path / "b" / "models.py").write_text(model_source.replace("Person", "Company"))
+    for _ in range(2):
+        # the files stay changed until the model can be resolved
+        with pytest.raises(ValueError, match="same module name models"):
+            watcher.update(watcher.scan())
+
+    (tmp_path / "b" / "models.py").rename(tmp_path / "b" / "company.py")
+    assert watcher.update(watcher.scan())
+    assert set(watcher.symbols.classes) == {"models.Person", "company.Company"}
+
+
+def test_watch_regenerates_output(tmp_path):
+    model_file = tmp_path / "models.py"
+    model_file.write_text(model_source)
+    output_file = tmp_path / "models.ts"
+
+    watcher = Watcher(files=[str(model_file)], output_files=[str(output_file)], interval=0.01, debounce=0.01)
+    stop_event = threading.Event()
+    thread = threading.Thread(target=watcher.run, args=(stop_event,))
+    thread.start()
+
+    try:
+        deadline = time.monotonic() + 5
+        while not output_file.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert "interface Person" in output_file.read_text()
+
+        model_file.write_text(model_source + "    age: int\n")
+        while "age" not in output_file.read_text() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert "age: number" in output_file.read_text()
+    finally:
+        stop_event.set()
+        thread.join()
+
+
+@pytest.mark.parametrize(
+    "option",
+    [["--root", "Person"], ["--entry", "models"], ["--since", "HEAD"], ["--split-output", "out"], ["--emit-ir", "ir"]],
+)
+def test_watch_incompatible_options(tmp_path, option):
+    with pytest.raises(ValueError, match="--watch can not be combined"):
+        main(["--dirs", str(tmp_path), "--watch", *option])
@@ -0,0 +1,136 @@
+import itertools
+import sys
+import xml.dom.minidom
+
+import pytest
+
+from py_model.__main__ import main
+from py_model.writing.graphs import diagram_writer
+from py_model.writing.graphs.layout import count_crossings, layout_graph, order_layers
+
+model_source = """
+from dataclasses import dataclass
+
+
+@dataclass
+class Animal:
+    name: str
+
+
+class Dog(Animal):
+    def bark(self) -> str:
+        return "<wuff>"
+
+
+class Cat(Animal):
+    pass
+
+
+class Puppy(Dog):
+    pass
+
+
+class Hybrid(Puppy, Animal):
+    pass
+
+
+class Plant:
+    pass
+"""
+
+
+@pytest.fixture
+def model_file(tmp_path):
+    filepath = tmp_path / "models.py"
+    filepath.write_text(model_source)
+    return str(filepath)
+
+
+def test_count_crossings():
+    down = {0: [3], 1: [2], 2: [], 3: []}
+    assert count_crossings([0, 1], [2, 3], down) == 1
+    assert count_crossings([0, 1], [3, 2], down) == 0
+
+
+def test_order_layers_removes_crossings():
+    up = {0: [], 1: [], 2: [1], 3: [0]}
+    down = {0: [3], 1: [2], 2: [], 3: []}
+    layers = order_layers([[0, 1], [2, 3]], up=up, down=down)
+    assert count_crossings(layers[0], layers[1], down) == 0
+
+
+def test_layout():
+    sizes = [(100.0, 40.0), (60.0, 30.0), (80.0, 50.0), (120.0, 40.0), (50.0, 20.0)]
+    # 1, 2 and 3 inherit from 0, 3 also from 1, 4 is not connected
+    edges = [(1, 0), (2, 0), (3, 1), (3, 0)]
+    layout = layout_graph(sizes, edges)
+
+    boxes = [(x, y, x + width, y + height) for (x, y), (width, height) in zip(layout.positions, sizes)]
+    for first, second in itertools.combinations(boxes, 2):
+        assert (first[2] <= second[0]) or (second[2] <= first[0]) or (first[3] <= second[1]) or (second[3] <= first[1])
+
+    for (source, target), route in zip(edges, layout.routes):
+        # bases are above, edges go from the top of the class to the bottom of the base
+        assert boxes[target][3] < boxes[source][1]
+        assert route[0] == (boxes[source][0] + sizes[source][0] / 2, boxes[source][1])
+        assert route[-1] == (boxes[target][0] + sizes[target][0] / 2, boxes[target][3])
+    # the edge from 3 to 0 spans two layers and passes the middle one vertically
+    assert len(layout.routes[3]) == 4
+
+    assert layout_graph(sizes, edges) == layout
+
+
+def test_layout_of_several_components_with_long_edges():
+    sizes = [(100.0, 40.0)] * 6
+    # two components, each with an edge spanning two layers
+    edges = [(0, 1), (1, 2), (0, 2), (3, 4), (4, 5), (3, 5)]
+    layout = layout_graph(sizes, edges)
+
+    for (source, target), route in zip(edges, layout.routes):
+        # every point of a route lies within the bounding box of its own component
+        component = range(3) if source < 3 else range(3, 6)
+        left = min(layout.positions[node][0] for node in component)
+        right = max(layout.positions[node][0] + sizes[node][0] for node in component)
+        top = min(layout.positions[node][1] for node in component)
+        bottom = max(layout.positions[node][1] + sizes[node][1] for node in component)
+        assert all((left <= x <= right) and (top <= y <= bottom) for x, y in route)
+    # the long edges pass the middle layer of their own component
+    assert len(layout.routes[2]) == len(layout.routes[5]) == 4
+
+
+def test_svg(tmp_path, model_file, monkeypatch):
+    output_file = tmp_path / "models.svg"
+    main(["--files", model_file, "--output", str(output_file), "--cache-dir", str(tmp_path / "cache")])
+
+    document = xml.dom.minidom.parse(str(output_file))
+    assert len(document.getElementsByTagName("rect")) == 1 + 6  # background and classes
+    assert len(document.getElementsByTagName("polyline")) == 5
+    texts = [text.firstChild.data for text in document.getElementsByTagName("text")]
+    assert "«dataclass» Animal" in texts
+    assert "+bark() -> string" in texts
+
+    # the layout of the unchanged hierarchy is taken from the cache
+    monkeypatch.setattr(diagram_writer, "layout_graph", lambda *args: pytest.fail("laid out again"))
+    cached_file = tmp_path / "cached.svg"
+    main(["--files", model_file, "--output", str(cached_file), "--cache-dir", str(tmp_path / "cache")])
+    assert cached_file.read_text() == output_file.read_text()
+
+
+def test_png_without_rasterizer_fails_early(tmp_path, model_file, monkeypatch):
+    monkeypatch.setitem(sys.modules, "cairosvg", None)
+    monkeypatch.setattr(diagram_writer.shutil, "which", lambda name: None)
+
+    with pytest.raises(RuntimeError):
+        main(["--files", model_file, "--output", str(tmp_path / "models.svg"), str(tmp_path / "models.png")])
+    assert not (tmp_path / "models.svg").exists()
+
+
+def test_png_with_rasterizer(tmp_path, model_file, monkeypatch):
+    # a fake rasterizer, which copies the SVG
+    copy = [sys.executable, "-c", "import shutil, sys; shutil.copy(sys.argv[1], sys.argv[2])"]
+    monkeypatch.setitem(sys.modules, "cairosvg", None)
+    monkeypatch.setattr(diagram_writer, "RASTERIZERS", {"copy": lambda svg, png: [*copy, svg, png]})
+    monkeypatch.setattr(diagram_writer.shutil, "which", lambda name: name)
+
+    main(["--files", model_file, "--output", str(tmp_path / "models.svg"), str(tmp_path / "models.png"), "--no-cache"])
+    assert (tmp_path / "models.png").read_text() == (tmp_path / "models.svg").read_text()
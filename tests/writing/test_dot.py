@@ -0,0 +1,127 @@
+import shutil
+import subprocess
+
+import pytest
+
+from py_model.__main__ import main
+
+model_files = {
+    "animals.py": """
+from dataclasses import dataclass
+
+
+@dataclass
+class Owner:
+    name: str
+
+
+@dataclass
+class Animal:
+    name: str
+    owner: Owner | None
+    tags: dict[str, list[str]]
+
+
+class Dog(Animal):
+    def bark(self, times: int) -> str:
+        return "<wuff>"
+""",
+    "plants.py": """
+from dataclasses import dataclass
+
+from animals import Animal
+
+
+@dataclass
+class Garden:
+    animals: list[Animal]
+    visitors: set[Animal]
+""",
+}
+
+
+@pytest.fixture
+def dot_file(tmp_path):
+    for name, source in model_files.items():
+        (tmp_path / name).write_text(source)
+    output = tmp_path / "models.dot"
+    main(["--dirs", str(tmp_path), "--output", str(output), "--no-cache"])
+    return output
+
+
+def test_dot_structure(dot_file):
+    content = dot_file.read_text()
+    assert content.startswith("digraph models {\n")
+    assert content.endswith("}\n")
+    assert content.count("{") == content.count("}")
+
+    # one cluster per module, the edges follow after the clusters
+    assert content.count('subgraph "cluster_') == 2
+    assert content.index('label="plants"') > content.index('label="animals"')
+    assert content.index(" -> ") > content.rindex("subgraph")
+
+
+def test_dot_record_labels(dot_file):
+    content = dot_file.read_text()
+    assert '"animals.Owner" [label="{«dataclass» Owner|+name: string\\l|}"];' in content
+    assert '"animals.Dog" [label="{Dog||+bark(times: int) -\\> string\\l}"];' in content
+    # the union bar would split the record into fields if it was not escaped
+    assert "+owner: Owner \\| None\\l" in content
+
+
+def test_dot_edges(dot_file):
+    content = dot_file.read_text()
+    assert '"animals.Dog" -> "animals.Animal" [arrowhead=empty];' in content
+    assert '"animals.Animal" -> "animals.Owner" [dir=back, arrowtail=diamond];' in content
+    # several attributes of the same class result in a single edge
+    assert content.count('"plants.Garden" -> "animals.Animal"') == 1
+
+
+@pytest.mark.skipif(shutil.which("dot") is None, reason="graphviz is not installed")
+def test_dot_is_valid(dot_file):
+    subprocess.run(["dot", "-Tsvg", str(dot_file)], check=True, capture_output=True)
+
+
+aliased_files = {
+    "shop/__init__.py": "",
+    "shop/people.py": """
+from dataclasses import dataclass
+
+
+@dataclass
+class Person:
+    name: str
+""",
+    "shop/staff.py": """
+from dataclasses import dataclass
+
+from shop.people import Person as Human
+
+
+@dataclass
+class Employee(Human):
+    manager: Human
+""",
+}
+
+
+def test_edges_of_aliased_imports(tmp_path):
+    for name, source in aliased_files.items():
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text(source)
+    main(
+        [
+            "--dirs",
+            str(tmp_path / "shop"),
+            "-o",
+            str(tmp_path / "models.dot"),
+            str(tmp_path / "models.svg"),
+            "--no-cache",
+        ]
+    )
+
+    # the base and the attribute type are written as Human, which is resolved through the import
+    content = (tmp_path / "models.dot").read_text()
+    assert '"shop.staff.Employee" -> "shop.people.Person" [arrowhead=empty];' in content
+    assert '"shop.staff.Employee" -> "shop.people.Person" [dir=back, arrowtail=diamond];' in content
+    assert (tmp_path / "models.svg").read_text().count("<polyline") == 1
@@ -0,0 +1,71 @@
+import pytest
+
+from py_model import processing
+from py_model.__main__ import main
+from py_model.writing.languages.language_writer import TypeScriptWriter
+
+model_source = """
+from dataclasses import dataclass
+
+
+@dataclass
+class Person:
+    name: str
+    age: int
+
+
+class Developer(Person):
+    def __init__(self, languages: list[str]):
+        self.languages: list[str] = languages
+"""
+
+
+@pytest.fixture
+def model_file(tmp_path):
+    filepath = tmp_path / "models.py"
+    filepath.write_text(model_source)
+    return str(filepath)
+
+
+@pytest.mark.parametrize("parallel", [[], ["--parallel-output"]])
+def test_multiple_outputs_from_one_parse(tmp_path, model_file, monkeypatch, parallel):
+    single_ts, single_dot = tmp_path / "single.ts", tmp_path / "single.dot"
+    main(["--files", model_file, "--output", str(single_ts), "--no-cache"])
+    main(["--files", model_file, "--output", str(single_dot), "--no-cache"])
+
+    calls = []
+    parse_source = processing.parse_source
+    monkeypatch.setattr(
+        processing, "parse_source", lambda *args, **kwargs: calls.append(args) or parse_source(*args, **kwargs)
+    )
+
+    both_ts, both_dot = tmp_path / "both.ts", tmp_path / "both.dot"
+    main(["--files", model_file, "--output", str(both_ts), str(both_dot), "--no-cache", *parallel])
+
+    assert len(calls) == 1
+    assert both_ts.read_text() == single_ts.read_text()
+    assert both_dot.read_text() == single_dot.read_text()
+
+
+def test_unsupported_output_fails_before_parsing(tmp_path, model_file, monkeypatch):
+    monkeypatch.setattr(processing, "parse_source", lambda *args, **kwargs: pytest.fail("parsed"))
+
+    with pytest.raises(ValueError):
+        main(["--files", model_file, "--output", str(tmp_path / "models.ts"), str(tmp_path / "models.txt")])
+    assert not (tmp_path / "models.ts").exists()
+
+
+def test_failed_write_keeps_previous_output(tmp_path, model_file, monkeypatch):
+    output_file = tmp_path / "models.ts"
+    main(["--files", model_file, "--output", str(output_file), "--no-cache"])
+    previous = output_file.read_text()
+
+    def render(block):
+        yield "interface"
+        raise RuntimeError("render failed")
+
+    monkeypatch.setattr(TypeScriptWriter, "render", lambda self, block: render(block))
+    with pytest.raises(RuntimeError):
+        main(["--files", model_file, "--output", str(output_file), "--no-cache"])
+    assert output_file.read_text() == previous
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["models.py", "models.ts"]
@@ -0,0 +1,94 @@
+import os
+
+import pytest
+
+from py_model.__main__ import main
+
+person_source = """
+from dataclasses import dataclass
+
+
+@dataclass
+class Person:
+    name: str
+"""
+
+company_source = """
+from dataclasses import dataclass
+
+from .person import Person as Employee
+from .shared.address import Address
+
+
+@dataclass
+class Company:
+    ceo: Employee
+    address: Address | None
+"""
+
+address_source = """
+from dataclasses import dataclass
+
+
+@dataclass
+class Address:
+    street: str
+"""
+
+
+@pytest.fixture
+def package(tmp_path):
+    package = tmp_path / "models"
+    (package / "shared").mkdir(parents=True)
+    (package / "__init__.py").write_text("")
+    (package / "shared" / "__init__.py").write_text("")
+    (package / "person.py").write_text(person_source)
+    (package / "company.py").write_text(company_source)
+    (package / "shared" / "address.py").write_text(address_source)
+    return package
+
+
+def run(package, output):
+    main(["--dirs", str(package), "--no-cache", "--split-output", str(output)])
+
+
+def get_mtimes(output):
+    return {path.relative_to(output).as_posix(): path.stat().st_mtime_ns for path in output.rglob("*.ts")}
+
+
+def test_split_output(package, tmp_path):
+    output = tmp_path / "generated"
+    run(package, output)
+
+    assert set(get_mtimes(output)) == {"models/person.ts", "models/company.ts", "models/shared/address.ts"}
+    assert (output / "models" / "person.ts").read_text().startswith("export interface Person ")
+    company = (output / "models" / "company.ts").read_text()
+    assert company.startswith(
+        'import type { Person as Employee } from "./person";\n'
+        'import type { Address } from "./shared/address";\n\n'
+        "export interface Company "
+    )
+    assert "ceo: Employee;" in company
+
+
+def test_split_output_skips_unchanged_files(package, tmp_path):
+    output = tmp_path / "generated"
+    run(package, output)
+    for path in output.rglob("*.ts"):
+        os.utime(path, ns=(0, 0))
+
+    (package / "company.py").write_text(company_source + "    size: int\n")
+    run(package, output)
+    mtimes = get_mtimes(output)
+    assert mtimes["models/person.ts"] == mtimes["models/shared/address.ts"] == 0
+    assert mtimes["models/company.ts"] != 0
+
+    # files of deleted modules are removed
+    (package / "shared" / "address.py").unlink()
+    run(package, output)
+    assert set(get_mtimes(output)) == {"models/person.ts", "models/company.ts"}
+
+
+def test_split_output_unsupported_type(package, tmp_path):
+    with pytest.raises(ValueError, match="can not be split"):
+        main(["--dirs", str(package), "--split-output", str(tmp_path / "out"), "--split-type", "svg"])
@@ -0,0 +1,61 @@
+import io
+
+import pytest
+
+from py_model.parsing import Attribute, Attributes, Class, Function
+from py_model.parsing.type_hints import Integer, List, String
+from py_model.writing import SupportedTypes, TextWriter, Writer
+
+person = Class(
+    name="Person",
+    is_dataclass=True,
+    inherits_from=[],
+    attributes=Attributes(attributes=[Attribute(name="name", dtype=String())]),
+)
+developer = Class(
+    name="Developer",
+    is_dataclass=False,
+    inherits_from=["Person"],
+    attributes=Attributes(attributes=[Attribute(name="languages", dtype=List([String()]))]),
+    functions=[Function(name="brag", parameters=[], return_type=Integer())],
+)
+
+
+def test_typescript_chunks():
+    expected = "interface Developer extends Person { \nlanguages: Array<string>; \nbrag(): number; \n}\n"
+
+    assert developer.typescript() == expected
+    assert "".join(developer.iter_typescript()) == expected
+    assert developer.get_string(supported_type=SupportedTypes.ts) == expected
+
+
+def test_writer_streams_all_blocks():
+    stream = io.StringIO()
+    SupportedTypes.ts.writer.write(blocks=iter([person, developer]), stream=stream)
+
+    assert stream.getvalue() == person.typescript() + developer.typescript()
+
+
+def test_text_writer():
+    assert TextWriter().get_string(blocks=[person, developer]) == f"{person}\n{developer}\n"
+
+
+def test_writers_implement_render():
+    class IncompleteWriter(Writer):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteWriter()
+
+    # writers of whole diagrams render a block as a diagram of its own
+    assert "Person" in person.get_string(supported_type=SupportedTypes.svg)
+    with pytest.raises(ValueError):
+        person.get_string(supported_type=SupportedTypes.png)
+
+
+def test_supported_type_from_path():
+    assert SupportedTypes.from_path("models.ts") is SupportedTypes.ts
+    assert SupportedTypes.from_path("out/models.dot") is SupportedTypes.dot
+
+    with pytest.raises(ValueError):
+        SupportedTypes.from_path("models.java")